@@ -7,6 +7,12 @@ while ! nc -z manga-postgres 5432; do
 done
 echo "PostgreSQL is ready!"
 
+# Воркер (python worker.py) запускается командой контейнера, миграции делает основное приложение
+if [ "$#" -gt 0 ]; then
+  echo "Starting: $*"
+  exec "$@"
+fi
+
 # Запускаем миграции
 echo "Running migrations..."
 alembic upgrade head
@@ -1,13 +1,21 @@
 import asyncio
 
-import aiohttp
-
 from sqlalchemy.ext.asyncio import create_async_engine
 from loguru import logger
 
 from src.core import config
 from src.core.entities.schemas import ProxySchema
-from src.core.manager import MangaManager, SpiderManager, AlertManager, AuthManager
+from src.core.executor import ParseExecutor
+from src.core.manager import (
+    MangaManager,
+    SpiderManager,
+    AlertManager,
+    AuthManager,
+    RequestManager,
+    CheckpointManager,
+    JobManager,
+    CountCache,
+)
 
 from src.api import start_api
 
@@ -17,51 +25,67 @@ from src.core.service import FindService, HappyMangaService
 
 
 async def main():
-    async with aiohttp.ClientSession() as session:
-        engine = create_async_engine(config.database.db)
-
-        alert = AlertManager()
-        auth = AuthManager(
-            user_name=config.admin.username,
-            password=config.admin.password,
-            secret_key=config.admin.secret_key,
-        )
-        manager = MangaManager(engine)
-
-        proxy = [ProxySchema.create(x) for x in config.parsing.proxy]
-        spider = SpiderManager(
-            session,
-            alert,
-            manager=manager,
-            features=config.parsing.features,
-            proxy=proxy,
-            **config.request.model_dump(),
-        )
-        scheduler = SpiderScheduler(spider)
-
-        find = FindService(manager)
-        happy = HappyMangaService(manager)
-
-        try:
-            async with asyncio.TaskGroup() as tg:
-                tg.create_task(
-                    start_api(service=find, auth=auth, spider=spider, happy=happy)
-                )
-                tg.create_task(scheduler.start())
-
-        except* Exception as e:
-            logger.critical(
-                "Критическая ошибка в основном цикле программы", exc_info=True
+    engine = create_async_engine(config.database.db)
+
+    alert = AlertManager()
+    auth = AuthManager(
+        user_name=config.admin.username,
+        password=config.admin.password,
+        secret_key=config.admin.secret_key,
+    )
+    # Мангу записывают воркеры в других процессах, счётчики в памяти их записей не видят
+    counts = (
+        CountCache(engine, ttl=config.queue.count_ttl) if config.queue.enabled else None
+    )
+    manager = MangaManager(engine, counts=counts)
+    await manager.tags.load()
+    await manager.counts.load()
+    if not await manager.search.native():
+        await manager.search.load()
+    checkpoint = CheckpointManager(engine)
+    jobs = JobManager(engine) if config.queue.enabled else None
+    executor = ParseExecutor(config.parsing.executor, log_level=config.logging.level)
+
+    proxy = [ProxySchema.create(x) for x in config.parsing.proxy]
+    http = RequestManager.create(proxy=proxy, **config.request.model_dump())
+    spider = SpiderManager(
+        http,
+        alert,
+        manager=manager,
+        features=config.parsing.features,
+        pipeline=config.parsing.pipeline,
+        head_stop_after=config.parsing.head_stop_after,
+        shards=config.parsing.shards,
+        checkpoint=checkpoint,
+        executor=executor,
+        backend=config.parsing.backend,
+        jobs=jobs,
+    )
+    scheduler = SpiderScheduler(spider)
+
+    find = FindService(manager)
+    happy = HappyMangaService(manager)
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(
+                start_api(service=find, auth=auth, spider=spider, happy=happy)
             )
-            logger.critical(f"Детали: {e}", exc_info=True)
-            for task in asyncio.all_tasks():
-                if task is not asyncio.current_task() and not task.done():
-                    task.cancel()
+            tg.create_task(scheduler.start())
+
+    except* Exception as e:
+        logger.critical("Критическая ошибка в основном цикле программы", exc_info=True)
+        logger.critical(f"Детали: {e}", exc_info=True)
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task() and not task.done():
+                task.cancel()
 
-            raise
+        raise
 
-        finally:
-            await engine.dispose()
+    finally:
+        await http.close()
+        executor.shutdown()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
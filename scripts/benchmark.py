@@ -0,0 +1,55 @@
+"""Скорость разбора страниц движками bs4 и lxml (parsing.backend).
+
+Запуск из корня проекта: python scripts/benchmark.py [количество повторов]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from loguru import logger
+
+from src.spider.hitomi.parser import HitomiMangaParser, HitomiPageParser
+from src.spider.hmanga.parser import MangaParser as HmangaParser
+from src.spider.multi_manga.parser import MangaParser as MultiMangaParser
+from src.spider.nhentai.parser import NhentaiMangaParser
+
+TEMPLATES = [
+    (HmangaParser, "https://hmanga.my/", "test_templates/hamnga-1.html"),
+    (MultiMangaParser, "https://hmanga.my/", "test_templates/multi-manga-1.html"),
+    (NhentaiMangaParser, "https://nhentai.net/", "test_templates/nhentai-1.html"),
+    (HitomiMangaParser, "https://hitomi.si/", "test_templates/hitomi-1.html"),
+    (HitomiPageParser, "https://hitomi.si/", "test_templates/hitomi-page-1.html"),
+]
+ENGINES = [("bs4", "html.parser"), ("bs4", "lxml"), ("lxml", None)]
+
+
+def benchmark(repeat: int) -> None:
+    """Разбирает каждый шаблон repeat раз каждым движком и пишет в лог страниц в секунду
+
+    Args:
+        repeat (int): Сколько раз разбирается каждый шаблон
+    """
+    for parser_class, base_url, path in TEMPLATES:
+        with open(path, "rb") as f:
+            markup = f.read()
+
+        for backend, features in ENGINES:
+            parser = parser_class(base_url, features, backend=backend)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parser.parse(markup)
+            elapsed = time.perf_counter() - start
+
+            logger.info(
+                f"Скорость разбора (template={path}, size={len(markup) // 1024}KB, backend={backend}, features={features}, pages_per_sec={repeat / elapsed:.1f})"
+            )
+
+
+if __name__ == "__main__":
+    logger.remove()
+    logger.add(sys.stderr, level="INFO", format="{message}")
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -6,6 +6,7 @@ from slowapi import Limiter
 
 from ...core import __version__
 from ...core.service import FindService, HappyMangaService
+from ...core.service.manga import decode_cursor
 from ...core.entities.schemas import (
     ApiOutputManga,
     OutputMangaSchema,
@@ -26,6 +27,22 @@ def pagination(
     }
 
 
+def cursor_pagination(
+    common: dict = Depends(pagination),
+    cursor: str | None = Query(
+        None,
+        description="Курсор следующей страницы (next_cursor прошлого ответа), если указан, page не учитывается",
+    ),
+):
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+
+    return common | {"cursor": cursor}
+
+
 class Endpoints:
     """Эндпоинты для API манги."""
 
@@ -204,13 +221,14 @@ class Endpoints:
         )
 
     async def get_pages(
-        self, request: Request, common: dict = Depends(pagination)
+        self, request: Request, common: dict = Depends(cursor_pagination)
     ) -> MangaFindResultSchema:
         """Получить страницу.
 
         Args:
             page (int): Номер страницы
             per_page (int, optional): Количество манги на странице. По умолчанию None.
+            cursor (str, optional): Курсор следующей страницы. По умолчанию None.
 
         Returns:
             MangaFindResultSchema: Результат данных, с количеством страниц
@@ -218,7 +236,7 @@ class Endpoints:
         return await self.service.get_pages(**common)
 
     async def get_pages_by_genre(
-        self, request: Request, query: int, common: dict = Depends(pagination)
+        self, request: Request, query: int, common: dict = Depends(cursor_pagination)
     ) -> MangaFindResultSchema:
         """Ищет мангу по запросу
 
@@ -226,6 +244,7 @@ class Endpoints:
             query (int): ID жанра
             page (int): Номер страницы
             per_page (int, optional): Количество манги на странице. По умолчанию None.
+            cursor (str, optional): Курсор следующей страницы. По умолчанию None.
 
         Returns:
             MangaFindResultSchema: Результат поиска
@@ -233,7 +252,7 @@ class Endpoints:
         return await self.service.get_pages_by_genre(query, **common)
 
     async def get_pages_by_author(
-        self, request: Request, query: int, common: dict = Depends(pagination)
+        self, request: Request, query: int, common: dict = Depends(cursor_pagination)
     ) -> MangaFindResultSchema:
         """Ищет мангу по запросу
 
@@ -241,6 +260,7 @@ class Endpoints:
             query (int): ID автора
             page (int): Номер страницы
             per_page (int, optional): Количество манги на странице. По умолчанию None.
+            cursor (str, optional): Курсор следующей страницы. По умолчанию None.
 
         Returns:
             MangaFindResultSchema: Результат поиска
@@ -248,7 +268,7 @@ class Endpoints:
         return await self.service.get_pages_by_author(query, **common)
 
     async def get_pages_by_language(
-        self, request: Request, query: int, common: dict = Depends(pagination)
+        self, request: Request, query: int, common: dict = Depends(cursor_pagination)
     ) -> MangaFindResultSchema:
         """Ищет мангу по запросу
 
@@ -256,6 +276,7 @@ class Endpoints:
             query (int): ID языка
             page (int): Номер страницы
             per_page (int, optional): Количество манги на странице. По умолчанию None.
+            cursor (str, optional): Курсор следующей страницы. По умолчанию None.
 
         Returns:
             MangaFindResultSchema: Результат поиска
@@ -263,7 +284,7 @@ class Endpoints:
         return await self.service.get_pages_by_language(query, **common)
 
     async def get_pages_by_query(
-        self, request: Request, query: str, common: dict = Depends(pagination)
+        self, request: Request, query: str, common: dict = Depends(cursor_pagination)
     ) -> MangaFindResultSchema:
         """Ищет мангу по запросу
 
@@ -271,6 +292,7 @@ class Endpoints:
             query (str): Текстовый запрос часть названии манги
             page (int): Номер страницы
             per_page (int, optional): Количество манги на странице. По умолчанию None.
+            cursor (str, optional): Курсор следующей страницы. По умолчанию None.
 
         Returns:
             MangaFindResultSchema: Результат поиска
@@ -380,6 +402,7 @@ class Endpoints:
             "version": __version__,
             "service": "manga-day-api",
             "timestamp": datetime.now().isoformat(),
+            "tag_cache": self.service.manager.tags.stats,
         }
 
     @property
@@ -8,6 +8,7 @@ from loguru import logger
 
 from ...core.manager import SpiderManager, AuthManager
 from ...core.manager.spider import SpiderStatus
+from ...core.network import HostStats, PoolStats, ProxyStats
 from ..schemas.spider import (
     ParsingSignal,
     AuthStatus,
@@ -58,6 +59,27 @@ class SpiderEndpoints:
             methods=["GET"],
         )
 
+        self._api_router.add_api_route(
+            "/spider/hosts",
+            self.spider_hosts,
+            response_model=list[HostStats],
+            methods=["GET"],
+        )
+
+        self._api_router.add_api_route(
+            "/spider/proxies",
+            self.spider_proxies,
+            response_model=list[ProxyStats],
+            methods=["GET"],
+        )
+
+        self._api_router.add_api_route(
+            "/spider/pools",
+            self.spider_pools,
+            response_model=list[PoolStats],
+            methods=["GET"],
+        )
+
         self._api_router.add_api_route(
             "/alert",
             self.spider_alert,
@@ -101,7 +123,9 @@ class SpiderEndpoints:
                 else:
                     asyncio.create_task(
                         self.spider.starter.start_spider(
-                            spider=signal.spider, start_page=signal.page
+                            spider=signal.spider,
+                            start_page=signal.page,
+                            shards=signal.shards,
                         )
                     )
 
@@ -116,6 +140,17 @@ class SpiderEndpoints:
                         )
                     )
 
+            elif signal.signal == "head":
+                if signal.spider == "all":
+                    asyncio.create_task(self.spider.start_head_parsing())
+
+                else:
+                    asyncio.create_task(
+                        self.spider.starter.head_spider(
+                            spider=signal.spider, start_page=signal.page
+                        )
+                    )
+
             else:
                 if signal.spider == "all":
                     await self.spider.stop_all_spider()
@@ -192,6 +227,30 @@ class SpiderEndpoints:
         """
         return self.spider.status
 
+    async def spider_hosts(self) -> list[HostStats]:
+        """Возращает нагрузку по хостам: глубину очереди и время ожидания.
+
+        Returns:
+            list[HostStats]: Статистика по хостам.
+        """
+        return self.spider.host_stats
+
+    async def spider_proxies(self) -> list[ProxyStats]:
+        """Возращает здоровье прокси: задержку, долю удачных запросов и карантин.
+
+        Returns:
+            list[ProxyStats]: Статистика по прокси.
+        """
+        return self.spider.proxy_stats
+
+    async def spider_pools(self) -> list[PoolStats]:
+        """Возращает состояние пулов соединений: открытые, простаивающие и ожидающие соединения.
+
+        Returns:
+            list[PoolStats]: Статистика по пулам соединений.
+        """
+        return self.spider.pool_stats
+
     async def spider_alert(self, alert: GetAlertMessage) -> AlertSendResponse:
         if self.spider.alert is None:
             logger.error(
@@ -31,10 +31,11 @@ class ParsingSignal(BaseModel):
     Схема сигнала для парсинга
     """
 
-    signal: Literal["start", "stop", "update"]
+    signal: Literal["start", "stop", "update", "head"]
     spider: Literal["all"] | str
 
     page: int | None = Field(None)
+    shards: int = Field(1, ge=1)
     timeout: int = Field(10)
 
 
@@ -10,6 +10,12 @@ from yaml import full_load
 
 from dotenv import load_dotenv
 
+from .network import HostLimit, PACING, RECORD_MODE, ConnectorConfig
+from .executor import ExecutorConfig
+from .pipeline import PipelineConfig
+from .selector import BACKEND
+from .worker import QueueConfig
+
 __all__ = ["config"]
 
 load_dotenv("api.env")
@@ -54,8 +60,23 @@ class RequestConfig(BaseModel):
     use_random: bool = Field(True)
     maxsize: int = Field(100)
     ttl: float = Field(300)
+    cache_dir: str | None = Field(None)
+    disk_maxsize: int | None = Field(None)
     max_chance: int = Field(3)
     ban_proxy: bool = Field(True)
+    proxy_quarantine: float = Field(300)
+    proxy_max_quarantine: float = Field(3600)
+    rps: float | None = Field(None)
+    hosts: dict[str, HostLimit] = Field(default_factory=dict)
+    pacing: PACING | None = Field(None)
+    max_backoff: float = Field(60)
+    header_profiles: int = Field(16)
+    connector: ConnectorConfig = Field(default_factory=ConnectorConfig)
+    record_mode: RECORD_MODE = Field("off")
+    cassette: str = Field("var/cassette.sqlite3")
+    replay_latency: float = Field(0)
+    adaptive: bool = Field(True)
+    max_limit: int | None = Field(None)
 
 
 class ParserConfig(BaseModel):
@@ -63,6 +84,11 @@ class ParserConfig(BaseModel):
         "html.parser"
     )  # Рекомендуется использовать "lxml" для лучшей производительности, но он требует установки дополнительной библиотеки.
     proxy: list[str] = Field(default_factory=list)
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    head_stop_after: dict[str, int] = Field(default_factory=dict)
+    shards: dict[str, int] = Field(default_factory=dict)
+    executor: ExecutorConfig = Field(default_factory=ExecutorConfig)
+    backend: BACKEND = Field("bs4")
 
 
 class ApiConfig(BaseModel):
@@ -97,6 +123,7 @@ class DataBaseConfig(BaseModel):
 class UpdateConfig(BaseModel):
     start_time: str = Field(default="7:00 AM")
     zone: str = Field(default="Europe/Moscow")
+    head_interval: int | None = Field(default=60, ge=1)
 
 
 class BotConfig(BaseModel):
@@ -110,6 +137,7 @@ class Config(BaseModel):
     database: DataBaseConfig = Field(default_factory=DataBaseConfig)
     api: ApiConfig = Field(default_factory=ApiConfig)
     parsing: ParserConfig = Field(default_factory=ParserConfig)
+    queue: QueueConfig = Field(default_factory=QueueConfig)
     request: RequestConfig = Field(default_factory=RequestConfig)
     admin: AdminConfig = Field(default_factory=AdminConfig)
 
@@ -5,6 +5,7 @@ import pytz
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from .manager.spider import SpiderManager
 from . import config
@@ -16,9 +17,11 @@ class SpiderScheduler:
         manager: SpiderManager,
         start_time: str | None = None,
         zone: str | None = None,
+        head_interval: int | None = None,
     ):
         self.start_time = start_time or config.update.start_time
         self.zone = zone or config.update.zone
+        self.head_interval = head_interval or config.update.head_interval
         self.manager = manager
 
         self.scheduler = AsyncIOScheduler(timezone=pytz.timezone(self.zone))
@@ -31,6 +34,13 @@ class SpiderScheduler:
                 hour=hour, minute=minute, day=day, timezone=pytz.timezone(self.zone)
             ),
         )
+        if self.head_interval:
+            self.scheduler.add_job(
+                self.manager.start_head_parsing,
+                IntervalTrigger(minutes=self.head_interval),
+                max_instances=1,
+                coalesce=True,
+            )
 
         self.scheduler.start()
 
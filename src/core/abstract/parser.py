@@ -1,18 +1,53 @@
-from typing import Generic, Literal, Any, TypeVar, overload
+from functools import cache
+from typing import Callable, ClassVar, Generic, Literal, Any, TypeVar, overload
 from abc import ABC, abstractmethod
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup, _IncomingMarkup
+import lxml.html
+
+from bs4 import BeautifulSoup, UnicodeDammit, _IncomingMarkup
 from bs4.exceptions import FeatureNotFound
 from loguru import logger
+from lxml import etree
 
 from ..entities.schemas import MangaSchema, BaseManga
+from ..exc import ParserError
+from ..selector import BACKEND, Selector, compile_selector
 
 SITUATION = Literal["html", "json"]
 _T = TypeVar("_T")
 
 EXAMPLE_HTML = """<!DOCTYPE html><html><body><h1>Example</h1></body></html>"""
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+_P = TypeVar("_P", bound="BaseParser")
+
+
+@cache
+def check_features(features: str) -> None:
+    """Проверяет, что движок BeautifulSoup установлен
+
+    Результат запоминается: страница-пример разбирается один раз на каждый движок,
+    а не при создании каждого парсера.
+
+    Args:
+        features (str): Движок BeautifulSoup
+
+    Raises:
+        FeatureNotFound: Движок не установлен
+    """
+    BeautifulSoup(EXAMPLE_HTML, features)
+
+
+def any_backend(func: _F) -> _F:
+    """Отмечает _parse_html, написанный через селекторы парсера и функции get_text/get_attr.
+
+    Такой метод работает и с BeautifulSoup, и с деревом lxml. Без этой отметки
+    парсер всегда получает BeautifulSoup.
+    """
+    func.__backends__ = ("bs4", "lxml")
+    return func
+
 
 class BaseParser(Generic[_T], ABC):
     """Базовый парсер с поддержкой различных форматов."""
@@ -20,11 +55,39 @@ class BaseParser(Generic[_T], ABC):
     FEATURES: str = "html.parser"
     DEFAULT_SITUATION: SITUATION = "html"
 
+    DEFAULT_BACKEND: BACKEND = "bs4"
+    """Движок разбора HTML по умолчанию. lxml используется только если _parse_html отмечен any_backend"""
+
+    SELECTORS: ClassVar[dict[str, str]] = {}
+    """CSS-селекторы парсера (название: селектор), компилируются один раз при создании класса"""
+
+    selectors: ClassVar[dict[str, Selector]] = {}
+    """Скомпилированные селекторы"""
+
+    lxml_ready: ClassVar[bool] = False
+    """Может ли парсер работать с деревом lxml"""
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.selectors = {
+            name: compile_selector(css) for name, css in cls.SELECTORS.items()
+        }
+
+        backends = getattr(cls._parse_html, "__backends__", ("bs4",))
+        slow = [x.css for x in cls.selectors.values() if not x.fast]
+        if "lxml" in backends and slow:
+            logger.warning(
+                f"Парсер {cls.__name__} будет работать через bs4, селекторы не поддерживаются lxml (selectors={slow})"
+            )
+
+        cls.lxml_ready = "lxml" in backends and not slow
+
     def __init__(
         self,
         base_url: str,
         features: str | None = None,
         situation: SITUATION | None = None,
+        backend: BACKEND | None = None,
     ) -> None:
         """
         Инициализация парсера.
@@ -33,10 +96,15 @@ class BaseParser(Generic[_T], ABC):
             base_url: Базовый URL для разрешения относительных ссылок
             features: Парсер для BeautifulSoup (только для HTML)
             situation: Тип разметки по умолчанию
+            backend: Движок разбора HTML ('bs4' или 'lxml')
         """
         self.base_url = base_url
         self.features = features or self.FEATURES
         self.situation = situation or self.DEFAULT_SITUATION
+        self.backend = backend or self.DEFAULT_BACKEND
+
+        if self.backend not in BACKEND.__args__:
+            raise AttributeError(f"Неподдерживаемый движок разбора: {backend}")
 
         if not self.base_url:
             raise ValueError("base_url не может быть пустым")
@@ -48,7 +116,7 @@ class BaseParser(Generic[_T], ABC):
             raise AttributeError(f"Неподдерживаемый тип разметки: {situation}")
 
         try:
-            BeautifulSoup(EXAMPLE_HTML, self.features)
+            check_features(self.features)
         except FeatureNotFound:
             logger.error(
                 f"Невозможно загрузить парсер {self.__class__.__name__} так-как движок для парсинга {features} не загружен"
@@ -93,6 +161,9 @@ class BaseParser(Generic[_T], ABC):
             if isinstance(markup, BeautifulSoup):
                 return self._parse_html(markup)
 
+            if self.backend == "lxml" and self.lxml_ready:
+                return self._parse_html(self.build_tree(markup))
+
             return self._parse_html(self.build_soup(markup, features))
 
         elif situation == "json":
@@ -120,6 +191,40 @@ class BaseParser(Generic[_T], ABC):
     def build_soup(self, markup: _IncomingMarkup, features: str | None = None):
         return BeautifulSoup(markup, features or self.features)
 
+    def build_tree(self, markup: str | bytes) -> lxml.html.HtmlElement:
+        """Строит дерево lxml, кодировка байтов определяется так-же, как у BeautifulSoup"""
+        if isinstance(markup, bytes):
+            markup = UnicodeDammit(markup, is_html=True).unicode_markup
+
+        try:
+            return lxml.html.document_fromstring(markup)
+        except (etree.ParserError, ValueError) as error:
+            raise ParserError(f"Не удалось разобрать HTML: {error}") from error
+
+    def select(self, node: Any, name: str) -> list[Any]:
+        """Найти все элементы селектором парсера
+
+        Args:
+            node (Any): BeautifulSoup/Tag либо элемент lxml
+            name (str): Название селектора из SELECTORS
+
+        Returns:
+            list[Any]: Найденные элементы
+        """
+        return self.selectors[name].select(node)
+
+    def select_one(self, node: Any, name: str) -> Any | None:
+        """Найти первый элемент селектором парсера
+
+        Args:
+            node (Any): BeautifulSoup/Tag либо элемент lxml
+            name (str): Название селектора из SELECTORS
+
+        Returns:
+            Any | None: Элемент, либо None
+        """
+        return self.selectors[name].select_one(node)
+
 
 class BaseMangaParser(BaseParser[MangaSchema]):
     """Базовый класс для парсинга манги"""
@@ -127,3 +232,60 @@ class BaseMangaParser(BaseParser[MangaSchema]):
 
 class BasePageParser(BaseParser[list[BaseManga]]):
     """Базовый класс для парсинга страниц"""
+
+
+class ParserRegistry:
+    """
+    Реестр парсеров.
+
+    Парсер не хранит состояния между вызовами parse, поэтому на каждую комбинацию
+    (класс, base_url, features, backend) создаётся и проверяется один экземпляр,
+    который используют все загрузки всех пауков.
+    """
+
+    def __init__(self) -> None:
+        self._parsers: dict[
+            tuple[type[BaseParser], str, str | None, str | None], BaseParser
+        ] = {}
+
+    def get(
+        self,
+        parser: type[_P],
+        base_url: str,
+        features: str | None = None,
+        backend: BACKEND | None = None,
+    ) -> _P:
+        """
+        Возвращает парсер, при первом обращении создаёт его.
+
+        Args:
+            parser (type[_P]): Класс парсера
+            base_url (str): Базовый URL для разрешения относительных ссылок
+            features (str | None, optional): Парсер для BeautifulSoup. По умолчанию FEATURES парсера.
+            backend (BACKEND | None, optional): Движок разбора HTML. По умолчанию DEFAULT_BACKEND парсера.
+
+        Returns:
+            _P: Парсер
+
+        Raises:
+            FeatureNotFound: Движок BeautifulSoup не установлен
+        """
+        key = (parser, base_url, features, backend)
+        if key not in self._parsers:
+            self._parsers[key] = parser(base_url, features, backend=backend)
+            logger.debug(
+                f"Создан парсер (parser={parser.__name__}, base_url={base_url}, features={features}, backend={backend})"
+            )
+
+        return self._parsers[key]
+
+    def clear(self) -> None:
+        """Удаляет все парсеры из реестра"""
+        self._parsers.clear()
+
+    def __len__(self) -> int:
+        return len(self._parsers)
+
+
+parsers = ParserRegistry()
+"""Общий реестр парсеров"""
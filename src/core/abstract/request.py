@@ -1,24 +1,39 @@
 import asyncio
 import random
-from typing import TypedDict, TypeVar, Generic, Unpack
 
-from cachetools import TTLCache
+from collections import OrderedDict
+from hashlib import sha256
+from typing import Any, Mapping, Self, TypedDict, TypeVar, Generic, Unpack
+
+
 from loguru import logger
 
 from ..entities.schemas import ProxySchema
+from ..network import (
+    PACING,
+    BasePacing,
+    RECORD_MODE,
+    Cassette,
+    ConnectorConfig,
+    PoolStats,
+    HeaderPool,
+    HostLimit,
+    HostScheduler,
+    HostStats,
+    MB,
+    ProxyPool,
+    ProxyStats,
+    get_host,
+    CacheStats,
+    ResponseCache,
+    SingleFlight,
+    create_pacing,
+)
 
 
 _T = TypeVar("_T")
 
 
-class ProxyStatus(TypedDict):
-    status: bool
-    """Рабочий ли прокси"""
-
-    total: int
-    """Общее количество неудачных запросов"""
-
-
 class RequestItem(TypedDict):
     """Аргументы для запросов"""
 
@@ -29,7 +44,7 @@ class RequestItem(TypedDict):
     """Максимальное количество попыток."""
 
     sleep_time: int | None
-    """Время сна после запроса."""
+    """Задержка между запросами к одному хосту."""
 
     use_random: bool | None
     """Использовать ли рандом во время ожидания."""
@@ -38,7 +53,7 @@ class RequestItem(TypedDict):
     """Прокси"""
 
     maxsize: int | None
-    """Максимальный размер кэша."""
+    """Максимальный размер кэша в памяти (в МБ)."""
 
     ttl: float | None
     """Время жизни кэша."""
@@ -49,6 +64,51 @@ class RequestItem(TypedDict):
     ban_proxy: bool | None
     """Банить ли прокси, если он не отвечает"""
 
+    proxy_quarantine: float | None
+    """Время первого карантина для прокси (в секундах)"""
+
+    proxy_max_quarantine: float | None
+    """Максимальное время карантина для прокси (в секундах)"""
+
+    cache_dir: str | None
+    """Папка для кэша на диске, None - кэш только в памяти"""
+
+    disk_maxsize: int | None
+    """Максимальный размер кэша на диске (в МБ)."""
+
+    rps: float | None
+    """Бюджет запросов в секунду для одного хоста"""
+
+    hosts: dict[str, HostLimit] | None
+    """Лимиты для отдельных хостов"""
+
+    pacing: PACING | BasePacing | None
+    """Стратегия задержек: fixed, jitter, adaptive, либо готовый объект стратегии"""
+
+    max_backoff: float | None
+    """Максимальная задержка после неудачных запросов"""
+
+    header_profiles: int | None
+    """Количество профилей заголовков, которые создаются при запуске"""
+
+    connector: ConnectorConfig | dict[str, Any] | None
+    """Настройки пула соединений"""
+
+    record_mode: RECORD_MODE | None
+    """Режим записи ответов: off, record - записывать, replay - отдавать записанные ответы без сети"""
+
+    cassette: str | None
+    """Файл для записанных ответов"""
+
+    replay_latency: float | None
+    """Искусственная задержка в режиме replay (в секундах)"""
+
+    adaptive: bool | None
+    """Подстраивать ли лимит одновременных запросов к хосту (AIMD)"""
+
+    max_limit: int | None
+    """Потолок адаптивного лимита одновременных запросов к хосту"""
+
 
 class BaseRequestManager(Generic[_T]):
     """Менеджер для запросов."""
@@ -60,7 +120,10 @@ class BaseRequestManager(Generic[_T]):
     """Базовое значение, использование рандома при ожидании"""
 
     MAX_CONCURRENT: int = 5
-    """Базовое значение, количество запросов одновременно"""
+    """Базовое значение, количество запросов одновременно к одному хосту"""
+
+    RPS: float | None = None
+    """Базовое значение, количество запросов в секунду к одному хосту. None - без ограничения"""
 
     MAX_RETRIES: int = 5
     """Базовое значение, максимальное количество попыток."""
@@ -69,7 +132,7 @@ class BaseRequestManager(Generic[_T]):
     """Базовое значение, максимального количество шансов для прокси, по истечению которых прокси буден указан как не рабочий"""
 
     MAXSIZE: int = 128
-    """Базовое значение, максимального размера кэша."""
+    """Базовое значение, максимального размера кэша в памяти (в МБ)."""
 
     TTL: float = 300
     """Базовое значение, время жизни кэша."""
@@ -80,6 +143,36 @@ class BaseRequestManager(Generic[_T]):
     BAN_PROXY: bool = False
     """Базовое значение, если прокси не отвечает"""
 
+    MAX_BACKOFF: float = 60
+    """Базовое значение, максимальная задержка после неудачных запросов"""
+
+    HEADER_PROFILES: int = 16
+    """Базовое значение, количество профилей заголовков"""
+
+    RECORD_MODE: RECORD_MODE = "off"
+    """Базовое значение, режим записи ответов"""
+
+    CASSETTE: str = "var/cassette.sqlite3"
+    """Базовое значение, файл для записанных ответов"""
+
+    ADAPTIVE: bool = True
+    """Базовое значение, подстраивать ли лимит одновременных запросов к хосту"""
+
+    PROXY_QUARANTINE: float = 300
+    """Базовое значение, время первого карантина для прокси"""
+
+    PROXY_MAX_QUARANTINE: float = 3600
+    """Базовое значение, максимальное время карантина для прокси"""
+
+    VALIDATORS: dict[str, str] = {
+        "ETag": "If-None-Match",
+        "Last-Modified": "If-Modified-Since",
+    }
+    """Заголовки ответа, которые сохраняются в кэш, и соответствующие им заголовки условного запроса"""
+
+    UNCHANGED_SIZE: int = 1024
+    """Сколько последних URL, ответивших 304, помнит менеджер (см. is_unchanged)"""
+
     def __init__(self, session: _T, **kw: Unpack[RequestItem]):
         """Инициализация RequestManager
 
@@ -87,6 +180,8 @@ class BaseRequestManager(Generic[_T]):
             session (_T): Сессия для работы с запросами.
         """
         self.session = session
+        self.parent: BaseRequestManager[_T] | None = None
+        """Менеджер, от которого был создан этот менеджер (см. for_spider)"""
         self.max_concurrent = kw.get("max_concurrent") or self.MAX_CONCURRENT
         self.max_retries = kw.get("max_retries") or self.MAX_RETRIES
         self.sleep_time = kw.get("sleep_time") or self.SLEEP_TIME
@@ -94,15 +189,159 @@ class BaseRequestManager(Generic[_T]):
         self.max_chance = kw.get("max_chance") or self.MAX_CHANCE
         self._ban_proxy = kw.get("ban_proxy") or self.BAN_PROXY
 
-        self.semaphore = asyncio.Semaphore(self.max_concurrent)
-        self.proxy: dict[ProxySchema, ProxyStatus] = {
-            self.BASE_PROXY.model_validate(x.model_dump()): {"status": True, "total": 0}
-            for x in kw.get("proxy") or []
-        }
+        self.rps = kw.get("rps") or self.RPS
+        self.max_backoff = kw.get("max_backoff") or self.MAX_BACKOFF
+        self.adaptive = (
+            self.ADAPTIVE if kw.get("adaptive") is None else bool(kw.get("adaptive"))
+        )
+        self.max_limit = kw.get("max_limit") or self.max_concurrent * 4
 
-        self.cache = TTLCache(
-            maxsize=kw.get("maxsize") or self.MAXSIZE, ttl=kw.get("ttl") or self.TTL
+        self.pacing = create_pacing(
+            kw.get("pacing") or ("jitter" if self.use_random else "fixed"),
+            self.sleep_time,
+            self.max_backoff,
+        )
+        self.hosts = HostScheduler(
+            self.max_concurrent,
+            rps=self.rps,
+            limits=kw.get("hosts"),
+            pacing=self.pacing,
+            max_limit=self.max_limit if self.adaptive else None,
         )
+        self.proxy = ProxyPool(
+            [
+                self.BASE_PROXY.model_validate(x.model_dump())
+                for x in kw.get("proxy") or []
+            ],
+            max_chance=self.max_chance,
+            ban=self._ban_proxy,
+            quarantine=kw.get("proxy_quarantine") or self.PROXY_QUARANTINE,
+            max_quarantine=kw.get("proxy_max_quarantine") or self.PROXY_MAX_QUARANTINE,
+        )
+
+        disk_maxsize = kw.get("disk_maxsize")
+        self.cache = ResponseCache(
+            maxsize=(kw.get("maxsize") or self.MAXSIZE) * MB,
+            ttl=kw.get("ttl") or self.TTL,
+            directory=kw.get("cache_dir"),
+            disk_maxsize=disk_maxsize * MB if disk_maxsize else None,
+        )
+        self.flight: SingleFlight[Any] = SingleFlight()
+        self.profiles = HeaderPool(kw.get("header_profiles") or self.HEADER_PROFILES)
+
+        self.record_mode: RECORD_MODE = kw.get("record_mode") or self.RECORD_MODE
+        self.replay_latency = kw.get("replay_latency") or 0
+        self.cassette = (
+            Cassette(kw.get("cassette") or self.CASSETTE)
+            if self.record_mode != "off"
+            else None
+        )
+        if self.cassette is not None:
+            logger.info(
+                f"Включен режим записи ответов (mode={self.record_mode}, cassette={self.cassette.path})"
+            )
+        self.unchanged: OrderedDict[str, None] = OrderedDict()
+        """URL, которые при последнем запросе ответили 304 Not Modified, не больше UNCHANGED_SIZE"""
+
+    @staticmethod
+    def cache_key(method: str, url: str, type: str, kwargs: dict[str, Any]) -> str:
+        """Ключ логического запроса, вычисляется один раз на запрос, а не на каждую попытку.
+
+        Прокси и сгенерированные заголовки в ключ не входят, так-как не меняют ответ.
+
+        Args:
+            method (str): Метод запроса
+            url (str): URL запроса
+            type (str): Тип возвращаемых данных
+            kwargs (dict[str, Any]): Дополнительные параметры запроса
+
+        Returns:
+            str: Ключ запроса
+        """
+        options = sorted((key, repr(value)) for key, value in kwargs.items())
+        return sha256(f"{method.upper()}{url}{type}{options}".encode()).hexdigest()
+
+    @property
+    def root(self) -> "BaseRequestManager[_T]":
+        """Исходный менеджер, общий для всех пауков"""
+        return self.parent.root if self.parent is not None else self
+
+    def for_spider(self, name: str) -> Self:
+        """Менеджер запросов для паука. По умолчанию все пауки используют один менеджер
+
+        Args:
+            name (str): Название паука
+
+        Returns:
+            Self: Менеджер запросов
+        """
+        return self
+
+    @property
+    def pool_stats(self) -> list[PoolStats]:
+        """Открытые, простаивающие и ожидающие соединения по каждому пулу"""
+        return []
+
+    async def close(self) -> None:
+        """Закрыть файл записанных ответов"""
+        if self.cassette is not None:
+            self.cassette.close()
+
+    def get_validators(self, headers: Mapping[str, str]) -> dict[str, str]:
+        """Получить валидаторы (ETag, Last-Modified) из заголовков ответа
+
+        Args:
+            headers (Mapping[str, str]): Заголовки ответа
+
+        Returns:
+            dict[str, str]: Валидаторы, может быть пустым
+        """
+        return {name: headers[name] for name in self.VALIDATORS if headers.get(name)}
+
+    def conditional_headers(self, validators: dict[str, str]) -> dict[str, str]:
+        """Заголовки условного запроса (If-None-Match, If-Modified-Since)
+
+        Args:
+            validators (dict[str, str]): Валидаторы из кэша
+
+        Returns:
+            dict[str, str]: Заголовки запроса
+        """
+        return {
+            self.VALIDATORS[name]: value
+            for name, value in validators.items()
+            if name in self.VALIDATORS
+        }
+
+    def is_unchanged(self, url: str) -> bool:
+        """Не изменилась ли страница с прошлого запроса (сервер ответил 304)
+
+        Args:
+            url (str): URL страницы
+
+        Returns:
+            bool: True, если страница не изменилась
+        """
+        return url in self.unchanged
+
+    def set_unchanged(self, url: str, unchanged: bool) -> None:
+        """Запомнить, ответила ли страница 304 Not Modified
+
+        Хранятся только последние UNCHANGED_SIZE URL, поэтому память не растёт
+        за время жизни процесса.
+
+        Args:
+            url (str): URL страницы
+            unchanged (bool): True, если сервер ответил 304
+        """
+        if not unchanged:
+            self.unchanged.pop(url, None)
+            return
+
+        self.unchanged[url] = None
+        self.unchanged.move_to_end(url)
+        while len(self.unchanged) > self.UNCHANGED_SIZE:
+            self.unchanged.popitem(last=False)
 
     async def sleep(self, time: float | None = None):
         """Асинхронный сон, который учитывает использование рандома и базовое время сна
@@ -114,43 +353,104 @@ class BaseRequestManager(Generic[_T]):
             (time or self.sleep_time) * (random.uniform(0, 1) if self.use_random else 1)
         )
 
-    def get_proxy(self) -> ProxySchema | None:
-        """Получает рандомно прокси
+    async def backoff(self, url: str, attempt: int) -> None:
+        """Задержка после неудачной попытки, выполняется без занятого слота.
+
+        Если хост прислал Retry-After, ожидание выполняет планировщик хоста.
+
+        Args:
+            url (str): URL запроса
+            attempt (int): Номер неудачной попытки, начиная с 1.
+        """
+        limiter = self.hosts.get(url)
+        pacing = limiter.pacing or self.pacing
+        pacing.failure()
+        if not limiter.paused:
+            await asyncio.sleep(pacing.backoff(attempt))
+
+    def set_host_limit(
+        self,
+        url: str,
+        max_concurrent: int | None = None,
+        rps: float | None = None,
+        burst: int | None = None,
+    ) -> None:
+        """Указать лимиты для хоста. Лимиты из конфигурации имеют приоритет.
+
+        Args:
+            url (str): URL, либо хост
+            max_concurrent (int | None, optional): Максимальное количество одновременных запросов.
+            rps (float | None, optional): Запросов в секунду.
+            burst (int | None, optional): Сколько запросов можно сделать подряд без ожидания.
+        """
+        self.hosts.set_limit(
+            url, HostLimit(max_concurrent=max_concurrent, rps=rps, burst=burst)
+        )
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        """Попадания, промахи, вытеснения и объём кэша"""
+        return self.cache.stats
+
+    @property
+    def host_stats(self) -> list[HostStats]:
+        """Глубина очереди, время ожидания и нагрузка по каждому хосту"""
+        return self.hosts.stats
+
+    @property
+    def proxy_stats(self) -> list[ProxyStats]:
+        """Задержка, доля удачных запросов, скорость и карантин по каждому прокси"""
+        return self.proxy.stats
+
+    def get_proxy(self, url: str | None = None) -> ProxySchema | None:
+        """Выбирает прокси пропорционально здоровью, за хостом закрепляется один прокси
+
+        Args:
+            url (str | None, optional): URL запроса, для закрепления прокси за хостом.
 
         Returns:
             ProxySchema | None: Прокси или None, если прокси не найдено
         """
-        if not self.proxy:
-            return None
+        return self.proxy.choose(get_host(url) if url else None)
+
+    def good_response(
+        self,
+        proxy: ProxySchema,
+        latency: float,
+        size: int = 0,
+        url: str | None = None,
+    ) -> None:
+        """Удачный ответ через прокси, обновляет задержку и скорость прокси
+
+        Args:
+            proxy (ProxySchema): Схема прокси
+            latency (float): Время запроса (в секундах)
+            size (int, optional): Размер ответа (в байтах)
+            url (str | None, optional): URL запроса, прокси будет закреплён за хостом.
+        """
+        self.proxy.success(proxy, latency, size, get_host(url) if url else None)
 
-        work_proxy = list(filter(lambda x: self.proxy[x]["status"], self.proxy))
-        if not work_proxy:
-            logger.debug("Больше нет рабочих прокси")
-            return None
+    def wrong_response(self, proxy: ProxySchema, url: str | None = None) -> None:
+        """Неправильный ответ от прокси, по истечению максимального количество попыток прокси уходит в карантин
 
-        proxy = random.choice(work_proxy)
-        return proxy
+        Args:
+            proxy (ProxySchema): Схема прокси
+            url (str | None, optional): URL запроса, закрепление за хостом будет снято.
+        """
+        self.proxy.failure(proxy, get_host(url) if url else None)
 
-    def wrong_response(self, proxy: ProxySchema) -> None:
-        """Неправильный ответ от прокси, по истечению максимального количество попыток прокси будет заблокирован
+    def settle_proxy(self, proxy: ProxySchema) -> None:
+        """Запрос через прокси завершён, незавершённый пробный запрос будет повторён
 
         Args:
             proxy (ProxySchema): Схема прокси
         """
-        logger.debug(f"Ошибка у прокси (proxy={proxy.proxy})")
-        self.proxy[proxy]["total"] += 1
-        if self.proxy[proxy]["total"] >= self.max_chance:
-            self.ban_proxy(proxy)
+        self.proxy.settle(proxy)
 
     def ban_proxy(self, proxy: ProxySchema) -> None:
-        """Банит прокси и помечает его нерабочим
+        """Отправляет прокси в карантин, после карантина прокси будет проверен пробным запросом
 
         Args:
             proxy (ProxySchema): Схема прокси
         """
-        if self._ban_proxy:
-            self.proxy[proxy]["status"] = False
-        else:
-            logger.debug(
-                f"Прокси (proxy={proxy.proxy}) не отвечает, но бан отключен, поэтому он будет использоваться дальше."
-            )
+        self.proxy.ban(proxy)
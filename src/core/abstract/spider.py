@@ -1,18 +1,109 @@
 import asyncio
 
+from contextlib import aclosing
 from urllib.parse import urljoin
+from uuid import uuid4
 from abc import ABC, abstractmethod
-from typing import overload, AsyncGenerator, Awaitable, Optional, Any, Unpack
+from typing import (
+    overload,
+    AsyncGenerator,
+    Awaitable,
+    Optional,
+    Any,
+    TypedDict,
+    TypeVar,
+    Unpack,
+)
 
 import aiohttp
 
+from bs4 import FeatureNotFound
 from loguru import logger
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from ..abstract.parser import BaseParser, parsers
 from ..abstract.request import RequestItem, BaseRequestManager
+from ..manager.checkpoint import CheckpointManager
+from ..manager.job import JobManager
 from ..manager.manga import MangaManager
 from ..manager.request import RequestManager
-from ..entities.schemas import MangaSchema, BaseManga
+from ..entities.schemas import MangaSchema, BaseManga, CheckpointSchema
+from ..executor import ExecutorConfig, ParseExecutor
+from ..pipeline import Emit, Handler, Pipeline, PipelineConfig
+from ..selector import BACKEND
+
+_T = TypeVar("_T")
+_P = TypeVar("_P", bound=BaseParser)
+
+
+class UpdateStats(TypedDict):
+    """Итог обновления манги"""
+
+    new: int
+    """Добавлено новой манги"""
+
+    changed: int
+    """Обновлено манги, содержимое которой изменилось"""
+
+    unchanged: int
+    """Пропущено манги без изменений"""
+
+
+class RunContext:
+    """
+    Состояние одного прохода по страницам: диапазон и прогресс.
+
+    Паук может проходить несколько диапазонов одновременно (шарды),
+    у каждого прохода свой контекст, общий прогресс собирается в status.
+    """
+
+    __slots__ = ("start", "end", "page", "processed")
+
+    def __init__(self, start: int, end: int):
+        """
+        Args:
+            start (int): Первая страница диапазона.
+            end (int): Последняя страница диапазона (включительно).
+        """
+        self.start = start
+        self.end = end
+        self.page: int | None = None
+        self.processed = 0
+
+    @property
+    def total(self) -> int:
+        """Количество страниц в диапазоне"""
+        return max(self.end - self.start + 1, 0)
+
+    def __repr__(self) -> str:
+        return f"RunContext(start={self.start}, end={self.end}, processed={self.processed})"
+
+
+def split_pages(start: int, end: int, shards: int) -> list[tuple[int, int]]:
+    """Делит диапазон страниц на непрерывные части почти одинакового размера
+
+    Args:
+        start (int): Первая страница.
+        end (int): Последняя страница (включительно).
+        shards (int): Количество частей.
+
+    Returns:
+        list[tuple[int, int]]: Диапазоны (первая, последняя страница), пустые части не возвращаются.
+    """
+    total = end - start + 1
+    if total <= 0:
+        return []
+
+    shards = max(1, min(shards, total))
+    size, rest = divmod(total, shards)
+
+    ranges = []
+    for index in range(shards):
+        last = start + size + (index < rest) - 1
+        ranges.append((start, last))
+        start = last + 1
+
+    return ranges
 
 
 class BaseSpider(ABC):
@@ -32,6 +123,21 @@ class BaseSpider(ABC):
     BASE_BATCH = 10
     """Базовый размер пачки для парсинга"""
 
+    HOST_MAX_CONCURRENT: int | None = None
+    """Начальное количество одновременных запросов к сайту, дальше лимит подстраивается сам. None - значение менеджера запросов"""
+
+    HOST_RPS: float | None = None
+    """Максимальное количество запросов в секунду к сайту. None - значение менеджера запросов"""
+
+    START_PAGE: int = 1
+    """Первая страница пагинации"""
+
+    HEAD_STOP_AFTER: int = 50
+    """Сколько манги подряд, которая уже есть в базе данных, останавливает head-сканирование"""
+
+    page: int | None = None
+    """Номер страницы, которую последней отдал pages(). None - паук не сообщает номер, прогресс не сохраняется"""
+
     @overload
     def __init__(
         self,
@@ -39,6 +145,12 @@ class BaseSpider(ABC):
         manager: Optional[MangaManager] = None,
         features: Optional[str] = None,
         batch: Optional[int] = None,
+        pipeline: Optional[PipelineConfig] = None,
+        head_stop_after: Optional[dict[str, int]] = None,
+        checkpoint: Optional[CheckpointManager] = None,
+        executor: Optional[ParseExecutor] = None,
+        backend: Optional[BACKEND] = None,
+        jobs: Optional[JobManager] = None,
     ) -> None:
         """
         Инициализация спайдера с использованием существующего менеджера запросов.
@@ -48,6 +160,12 @@ class BaseSpider(ABC):
             manager (MangaManager | None): Менеджер для обработки и хранения данных о манге. Если менеджер является None то функция "run" перестает работать. (по умолчанию None).
             features (str): Парсер, используемый для разбора HTML (по умолчанию 'html.parser').
             batch (int): Размер пачки для парсинга (по умолчанию 10).
+            pipeline (PipelineConfig): Настройки конвейера парсинга (по умолчанию PipelineConfig()).
+            head_stop_after (dict[str, int]): Порог остановки head-сканирования по названию паука (по умолчанию HEAD_STOP_AFTER).
+            checkpoint (CheckpointManager): Менеджер прогресса, без него run не продолжает прерванный парсинг (по умолчанию None).
+            executor (ParseExecutor): Пул, в котором разбираются страницы (по умолчанию разбор в event loop).
+            backend (BACKEND): Движок разбора HTML, "bs4" или "lxml" (по умолчанию DEFAULT_BACKEND парсера).
+            jobs (JobManager): Очередь задач, с ней run только добавляет новую мангу в очередь, загружают её воркеры (по умолчанию None).
         """
 
     @overload
@@ -57,6 +175,12 @@ class BaseSpider(ABC):
         manager: Optional[MangaManager] = None,
         features: Optional[str] = None,
         batch: Optional[int] = None,
+        pipeline: Optional[PipelineConfig] = None,
+        head_stop_after: Optional[dict[str, int]] = None,
+        checkpoint: Optional[CheckpointManager] = None,
+        executor: Optional[ParseExecutor] = None,
+        backend: Optional[BACKEND] = None,
+        jobs: Optional[JobManager] = None,
         **kwargs: Unpack[RequestItem],
     ) -> None:
         """
@@ -67,6 +191,12 @@ class BaseSpider(ABC):
             manager (MangaManager): Менеджер для обработки и хранения данных о манге. Если менеджер является None то функция "run" перестает работать. (по умолчанию None).
             features (str): Парсер, используемый для разбора HTML (по умолчанию 'html.parser').
             batch (int): Размер пачки для парсинга (по умолчанию 10).
+            pipeline (PipelineConfig): Настройки конвейера парсинга (по умолчанию PipelineConfig()).
+            head_stop_after (dict[str, int]): Порог остановки head-сканирования по названию паука (по умолчанию HEAD_STOP_AFTER).
+            checkpoint (CheckpointManager): Менеджер прогресса, без него run не продолжает прерванный парсинг (по умолчанию None).
+            executor (ParseExecutor): Пул, в котором разбираются страницы (по умолчанию разбор в event loop).
+            backend (BACKEND): Движок разбора HTML, "bs4" или "lxml" (по умолчанию DEFAULT_BACKEND парсера).
+            jobs (JobManager): Очередь задач, с ней run только добавляет новую мангу в очередь, загружают её воркеры (по умолчанию None).
             max_concurrent (int, опционально): Максимальное количество одновременных запросов.
             max_retries (int, опционально): Максимальное количество попыток повтора запроса.
             sleep_time (int, опционально): Время задержки между запросами.
@@ -82,6 +212,12 @@ class BaseSpider(ABC):
         manager: MangaManager | None = None,
         features: Optional[str] = None,
         batch: Optional[int] = None,
+        pipeline: Optional[PipelineConfig] = None,
+        head_stop_after: Optional[dict[str, int]] = None,
+        checkpoint: Optional[CheckpointManager] = None,
+        executor: Optional[ParseExecutor] = None,
+        backend: Optional[BACKEND] = None,
+        jobs: Optional[JobManager] = None,
         **kwargs,
     ) -> None:
         """
@@ -92,13 +228,19 @@ class BaseSpider(ABC):
             manager (MangaManager): Менеджер для управления данными о манге. Если менеджер является None то функция "run" перестает работать. (по умолчанию None).
             features (str): Парсер HTML (по умолчанию 'html.parser').
             batch (int): Размер пачки для парсинга (по умолчанию 10).
+            pipeline (PipelineConfig): Настройки конвейера парсинга (по умолчанию PipelineConfig()).
+            head_stop_after (dict[str, int]): Порог остановки head-сканирования по названию паука (по умолчанию HEAD_STOP_AFTER).
+            checkpoint (CheckpointManager): Менеджер прогресса, без него run не продолжает прерванный парсинг (по умолчанию None).
+            executor (ParseExecutor): Пул, в котором разбираются страницы (по умолчанию разбор в event loop).
+            backend (BACKEND): Движок разбора HTML, "bs4" или "lxml" (по умолчанию DEFAULT_BACKEND парсера).
+            jobs (JobManager): Очередь задач, с ней run только добавляет новую мангу в очередь, загружают её воркеры (по умолчанию None).
             **kwargs: Дополнительные параметры, передаваемые в BaseRequestManager при необходимости.
 
         Исключения:
             TypeError: Если session не является ни ClientSession, ни BaseRequestManager.
         """
         if isinstance(session, BaseRequestManager):
-            self.http = session
+            self.http = session.for_spider(self.__class__.__name__)
 
         elif isinstance(session, aiohttp.ClientSession):
             self.http = RequestManager(session, **kwargs)
@@ -111,55 +253,189 @@ class BaseSpider(ABC):
         self.batch = batch or self.BASE_BATCH
         self.features = features or self.BASE_FEATURES
         self.manager = manager
+        self.pipeline_config = pipeline or PipelineConfig()
+        self.head_stop_after = (head_stop_after or {}).get(
+            self.__class__.__name__, self.HEAD_STOP_AFTER
+        )
+        self.checkpoint = checkpoint
+        self.executor = executor or ParseExecutor(ExecutorConfig(kind="inline"))
+        self.backend = backend
+        self.jobs = jobs
+        self.pipeline: Pipeline | None = None
+        self.contexts: list[RunContext] = []
 
         self._args_test()
+        self.load_parsers()
+
+        if self.HOST_MAX_CONCURRENT or self.HOST_RPS:
+            self.http.set_host_limit(
+                self.BASE_URL,
+                max_concurrent=self.HOST_MAX_CONCURRENT,
+                rps=self.HOST_RPS,
+            )
+
         logger.debug(f"Инициализирован класс {self.__class__.__name__}")
 
-    async def run(self, start_page: int | None = None) -> None:
+    async def run(
+        self,
+        start_page: int | None = None,
+        resume: bool = False,
+        end_page: int | None = None,
+    ) -> None:
         """
         Запускает процесс парсинга манги.
 
-        Метод последовательно получает пакеты страниц, извлекает информацию о манге
-        и добавляет её в менеджер. Пропускает пустые результаты.
+        Работает как конвейер: страницы пагинации -> отбор новой манги -> загрузка
+        манги -> запись в базу данных. Стадии соединены ограниченными очередями,
+        поэтому медленная страница манги не останавливает остальные.
+        Пропускает пустые результаты. Страницы, ответившие 304 Not Modified, разбираются
+        из кэша как обычно: манга с них могла быть не записана в прошлый раз
+        (ошибка загрузки или записи, остановка паука).
+
+        Если передана очередь задач, новая манга не загружается, а добавляется
+        в очередь для воркеров (worker.py).
+
+        Если передан менеджер прогресса, после каждой полностью записанной страницы
+        сохраняется прогресс, после завершения он удаляется. Если запись манги
+        завершилась ошибкой, прогресс дальше этой страницы не сдвигается и после
+        завершения не удаляется, продолжение (resume) начнёт с неё. Проход по части
+        диапазона (end_page, см. run_sharded) прогресс не сохраняет.
 
         Args:
             start_page (int | None): Стартовая страница для парсинга.
+            resume (bool): Продолжить с сохранённого прогресса, если start_page не указан.
+            end_page (int | None): Последняя страница для парсинга (по умолчанию до конца).
         """
         if self.manager is None:
             raise AttributeError("Менеджер не был передан, функция 'run' не работает")
 
-        async for manga_batch in self.pages(start_page=start_page):
-            tasks: list[Awaitable[Optional[MangaSchema]]] = []
+        name = self.__class__.__name__
+        run_id = uuid4().hex
+        checkpoint_manager = self.checkpoint if end_page is None else None
+        if resume and start_page is None and checkpoint_manager is not None:
+            if checkpoint := await checkpoint_manager.get(name):
+                start_page = checkpoint.page + 1
+                run_id = checkpoint.run_id
+                logger.info(
+                    f"Продолжение с сохранённого прогресса (spider={name}, page={start_page}, run_id={run_id})"
+                )
+
+        pages: list[int | None] = []
+
+        async def source() -> AsyncGenerator[list[BaseManga], Any]:
+            async for manga_batch in self.pages(
+                start_page=start_page, end_page=end_page
+            ):
+                pages.append(self.page)
+                yield manga_batch
+
+        async def save(index: int) -> None:
+            if checkpoint_manager is None or pages[index] is None:
+                return
+
+            try:
+                await checkpoint_manager.save(
+                    CheckpointSchema(
+                        spider=name,
+                        run_id=run_id,
+                        page=pages[index],
+                    )
+                )
+            except SQLAlchemyError as error:
+                logger.error(
+                    f"Не удалось сохранить прогресс (spider={name}, message={error})"
+                )
+
+        async def dedup(manga_batch: list[BaseManga], emit: Emit) -> None:
+            known = await self.manager.known_skus(manga_batch)
             for manga in manga_batch:
-                if await self.manager.in_database(manga):
+                if manga.sku in known:
                     logger.debug(f"Манга уже существует в базе данных: {manga.sku}")
                     continue
-                tasks.append(asyncio.create_task(self.get(str(manga.url))))
 
-            async for manga in asyncio.as_completed(tasks):
-                result = await manga
-                if result is None:
-                    continue
+                await emit(manga)
 
-                if not result.gallery:
-                    logger.warning(f"Манга {result.sku} не содержит галереи")
-                    continue
+        async def enqueue(manga_batch: list[BaseManga], emit: Emit) -> None:
+            known = await self.manager.known_skus(manga_batch)
+            await self.jobs.enqueue(
+                name, [manga for manga in manga_batch if manga.sku not in known]
+            )
 
-                try:
-                    await self.manager.add_manga(result)
-                except IntegrityError as error:
-                    logger.error(
-                        f"Ошибка во время добавления манги (manga={manga}, message={error})"
-                    )
+        if self.jobs is not None:
+            pipeline = self.pipeline = Pipeline(
+                f"{name}.run", maxsize=self.pipeline_config.queue_size or self.batch * 2
+            ).stage("enqueue", enqueue)
+        else:
+            pipeline = self._create_pipeline(
+                "run", dedup, self._add_mangas, batched=True
+            )
+
+        await pipeline.run(source(), on_done=save)
+
+        if checkpoint_manager is None:
+            return
+
+        if pipeline.failed:
+            logger.warning(
+                f"Парсинг завершён с ошибками, прогресс сохранён (spider={name}, run_id={run_id})"
+            )
+            return
+
+        await checkpoint_manager.clear(name)
 
-    async def update(self, start_page: int | None = None) -> None:
+    async def run_sharded(self, shards: int, start_page: int | None = None) -> None:
+        """
+        Запускает парсинг, диапазон страниц делится на shards частей, которые
+        проходятся одновременно.
+
+        Все части используют одного паука, а значит и общие лимиты запросов к сайту.
+        Прогресс частей не сохраняется. Если паук не знает количество страниц
+        (page_total вернул None), парсинг идёт обычным run.
+
+        Args:
+            shards (int): Количество частей.
+            start_page (int | None): Стартовая страница для парсинга.
+        """
+        total = await self.page_total()
+        start = start_page or self.START_PAGE
+        if total is None or shards <= 1:
+            await self.run(start_page=start_page)
+            return
+
+        ranges = split_pages(start, total, shards)
+        logger.info(
+            f"Парсинг по частям (spider={self.__class__.__name__}, shards={ranges})"
+        )
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for first, last in ranges:
+                    group.create_task(self.run(start_page=first, end_page=last))
+        except* Exception as error:
+            # Ошибка одной части останавливает остальные, наружу уходит первая ошибка
+            raise error.exceptions[0]
+
+    async def page_total(self) -> int | None:
+        """
+        Количество страниц пагинации.
+
+        Returns:
+            int | None: Количество страниц, None - паук его не знает и не делится на части.
+        """
+        return None
+
+    async def update(self, start_page: int | None = None) -> UpdateStats:
         """Запускает обновление манги.
 
-        Метод последовательно получает пакеты страниц, извлекает информацию о манге
-        и обновляет её в менеджере. Пропускает пустые результаты. Если найдена новая манга, то она добавляется в базу данных.
+        Работает как конвейер, так-же как и run, но манга загружается вся
+        и обновляется в менеджере. Пропускает пустые результаты. Если найдена новая манга, то она добавляется в базу данных.
+        В базу данных записывается только манга, отпечаток содержимого которой изменился.
 
         Args:
             start_page (int | None): Стартовая страница для парсинга.
+
+        Returns:
+            UpdateStats: Сколько манги добавлено, обновлено и пропущено без изменений.
         """
 
         if self.manager is None:
@@ -167,30 +443,263 @@ class BaseSpider(ABC):
                 "Менеджер не был передан, функция 'update' не работает"
             )
 
-        async for manga_batch in self.pages(start_page=start_page):
-            tasks: list[Awaitable[Optional[MangaSchema]]] = []
+        stats: UpdateStats = {"new": 0, "changed": 0, "unchanged": 0}
+        known: dict[str, str | None] = {}
+
+        async def split(manga_batch: list[BaseManga], emit: Emit) -> None:
+            fingerprints = await self.manager.fingerprints(manga_batch)
+            # Отпечаток, записанный этим обновлением, новее прочитанного из базы данных
+            for sku, fingerprint in fingerprints.items():
+                known.setdefault(sku, fingerprint)
+
             for manga in manga_batch:
-                tasks.append(asyncio.create_task(self.get(str(manga.url))))
+                await emit(manga)
+
+        async def write(manga: MangaSchema, emit: Emit) -> None:
+            # Одна манга может встретиться дважды (страницы сдвинулись во время обхода),
+            # поэтому записанный отпечаток запоминается до записи
+            fingerprint = manga.fingerprint
+            try:
+                if manga.sku not in known:
+                    known[manga.sku] = fingerprint
+                    await self.manager.add_manga(manga)
+                    stats["new"] += 1
+                    return
+
+                if known.get(manga.sku) == fingerprint:
+                    stats["unchanged"] += 1
+                    return
+
+                known[manga.sku] = fingerprint
+                await self.manager.update_manga(
+                    **manga.as_dict(), fingerprint=fingerprint
+                )
+                stats["changed"] += 1
+            except IntegrityError as error:
+                logger.error(
+                    f"Ошибка во время добавления манги (manga={manga.url}, message={error})"
+                )
+
+        pipeline = self._create_pipeline("update", split, write)
+        await pipeline.run(self.pages(start_page=start_page))
+
+        logger.info(
+            f"Обновление завершено (spider={self.__class__.__name__}, new={stats['new']}, changed={stats['changed']}, unchanged={stats['unchanged']})"
+        )
+        return stats
+
+    async def head(self, start_page: int | None = None) -> None:
+        """Запускает head-сканирование: только новая манга.
+
+        Страницы идут от новых к старым, как и в run, но сканирование останавливается,
+        когда подряд встретилось `head_stop_after` манги, которая уже есть в базе данных.
+        Новая манга появляется на первых страницах, поэтому обычно хватает пары страниц.
+        Страницы загружаются по одной, следующая - только после того, как отбор
+        решил, идти ли дальше, поэтому после остановки лишние страницы не загружаются.
+        Страница, ответившая 304 Not Modified, тоже останавливает сканирование:
+        новой манги с прошлого запроса не появилось. Если в прошлый раз манга
+        с неё не была записана, её добавит run, он такие страницы не пропускает.
+
+        Если передана очередь задач, новая манга, как и в run, не загружается,
+        а добавляется в очередь для воркеров (worker.py).
 
-            async for manga in asyncio.as_completed(tasks):
-                result = await manga
-                if result is None:
-                    continue
+        Args:
+            start_page (int | None): Стартовая страница для парсинга.
+        """
+        if self.manager is None:
+            raise AttributeError("Менеджер не был передан, функция 'head' не работает")
+
+        name = self.__class__.__name__
+        known_streak = 0
+        stopped = False
+        selected = asyncio.Event()
+
+        async def source() -> AsyncGenerator[list[BaseManga], Any]:
+            async with aclosing(
+                self.pages(start_page=start_page, stop_unchanged=True, batch=1)
+            ) as pages:
+                async for manga_batch in pages:
+                    selected.clear()
+                    yield manga_batch
+
+                    # Следующая страница загружается, когда отбор решил, идти ли дальше
+                    await selected.wait()
+                    if stopped:
+                        break
+
+        async def select(manga_batch: list[BaseManga], emit: Emit) -> None:
+            nonlocal known_streak, stopped
+            try:
+                if stopped:
+                    return
+
+                known = await self.manager.known_skus(manga_batch)
+                new: list[BaseManga] = []
+                for manga in manga_batch:
+                    if manga.sku not in known:
+                        known_streak = 0
+                        new.append(manga)
+                        continue
+
+                    known_streak += 1
+                    if known_streak >= self.head_stop_after:
+                        logger.info(
+                            f"Head-сканирование остановлено (spider={name}, known={known_streak})"
+                        )
+                        stopped = True
+                        break
+
+                if self.jobs is not None:
+                    await self.jobs.enqueue(name, new)
+                    return
+
+                for manga in new:
+                    await emit(manga)
+            finally:
+                selected.set()
+
+        if self.jobs is not None:
+            pipeline = self.pipeline = Pipeline(
+                f"{name}.head",
+                maxsize=self.pipeline_config.queue_size or self.batch * 2,
+            ).stage("select", select, maxsize=1)
+        else:
+            pipeline = self._create_pipeline(
+                "head", select, self._add_mangas, batched=True, select_maxsize=1
+            )
 
-                if not result.gallery:
-                    logger.warning(f"Манга {result.sku} не содержит галереи")
-                    continue
+        await pipeline.run(source())
 
-                try:
-                    if not await self.manager.in_database(result):
-                        await self.manager.add_manga(result)
+    async def parse(self, parser: BaseParser[_T], markup: Any, **kwargs) -> _T:
+        """Разбирает разметку парсером в пуле парсинга, event loop не блокируется.
 
-                    else:
-                        await self.manager.update_manga(**result.as_dict())
-                except IntegrityError as error:
-                    logger.error(
-                        f"Ошибка во время добавления манги (manga={manga}, message={error})"
-                    )
+        Args:
+            parser (BaseParser[_T]): Парсер
+            markup (Any): Сырые байты страницы, либо JSON
+            **kwargs: Параметры BaseParser.parse
+
+        Returns:
+            _T: Результат парсера
+        """
+        return await self.executor.run(parser.parse, markup, **kwargs)
+
+    def get_parser(self, parser: type[_P], base_url: str | None = None) -> _P:
+        """Возвращает общий экземпляр парсера с настройками паука.
+
+        Args:
+            parser (type[_P]): Класс парсера
+            base_url (str | None): Базовый URL парсера (по умолчанию BASE_URL).
+
+        Returns:
+            _P: Парсер из реестра, один на все загрузки
+        """
+        return parsers.get(
+            parser, base_url or self.BASE_URL, self.features, self.backend
+        )
+
+    def load_parsers(self) -> None:
+        """
+        Создаёт парсеры паука при инициализации через get_parser.
+
+        Если движок для парсинга не установлен, ошибка возникает сразу при загрузке
+        паука, а не при первой загрузке манги.
+
+        Исключения:
+            FeatureNotFound: Движок для парсинга не установлен.
+        """
+
+    async def _add_mangas(self, mangas: list[MangaSchema], emit: Emit) -> None:
+        """Стадия записи новой манги в базу данных, манга записывается пачками
+
+        Если пачка не записалась из-за IntegrityError (ошибка в данных одной
+        из манги), манга записывается по одной, чтобы остальная манга пачки
+        не пропала. Если и так записана не вся манга, ошибка уходит в конвейер,
+        как и остальные ошибки (база данных недоступна и т.п.): страница
+        не отмечается записанной.
+        """
+        try:
+            results = await self.manager.add_many_manga(mangas)
+        except IntegrityError as error:
+            logger.warning(
+                f"Пачка манги не записана, запись по одной (size={len(mangas)}, message={error})"
+            )
+            await self._add_one_by_one(mangas)
+            return
+
+        added = sum(x.status == "added" for x in results)
+        logger.debug(
+            f"Записана пачка манги (spider={self.__class__.__name__}, added={added}, exists={len(results) - added})"
+        )
+
+    async def _add_one_by_one(self, mangas: list[MangaSchema]) -> None:
+        """Записывает мангу по одной, ошибка одной манги не мешает остальным
+
+        Raises:
+            IntegrityError: Первая ошибка, если записана не вся манга.
+        """
+        errors: list[IntegrityError] = []
+        for manga in mangas:
+            try:
+                await self.manager.add_manga(manga)
+            except IntegrityError as error:
+                logger.error(
+                    f"Ошибка во время добавления манги (manga={manga.url}, message={error})"
+                )
+                errors.append(error)
+
+        if errors:
+            raise errors[0]
+
+    def _create_pipeline(
+        self,
+        name: str,
+        select: Handler,
+        write: Handler,
+        batched: bool = False,
+        select_maxsize: int | None = None,
+    ) -> Pipeline:
+        """Создаёт конвейер: отбор манги -> загрузка манги -> запись в базу данных
+
+        Args:
+            name (str): Название конвейера
+            select (Handler): Стадия, которая получает пачку со страницы пагинации и передаёт дальше отдельную мангу
+            write (Handler): Стадия записи в базу данных
+            batched (bool, optional): write получает список манги (не больше PipelineConfig.write_batch). По умолчанию False.
+            select_maxsize (int | None, optional): Сколько страниц пагинации ждут отбора. По умолчанию размер очереди конвейера.
+
+        Returns:
+            Pipeline: Конвейер, источник - pages()
+        """
+
+        async def detail(manga: BaseManga, emit: Emit) -> None:
+            result = await self.get(str(manga.url))
+
+            if result is None:
+                return
+
+            if not result.gallery:
+                logger.warning(f"Манга {result.sku} не содержит галереи")
+                return
+
+            await emit(result)
+
+        config = self.pipeline_config
+        self.pipeline = (
+            Pipeline(
+                f"{self.__class__.__name__}.{name}",
+                maxsize=config.queue_size or self.batch * 2,
+                fatal=(FeatureNotFound,),
+            )
+            .stage("select", select, maxsize=select_maxsize)
+            .stage("detail", detail, workers=config.detail_workers or self.batch)
+            .stage(
+                "write",
+                write,
+                workers=config.write_workers,
+                batch=config.write_batch if batched else 1,
+            )
+        )
+        return self.pipeline
 
     async def pages_full(
         self, start_page: int | None = None
@@ -238,13 +747,20 @@ class BaseSpider(ABC):
 
     @abstractmethod
     async def pages(
-        self, start_page: int | None = None
+        self,
+        start_page: int | None = None,
+        stop_unchanged: bool = False,
+        end_page: int | None = None,
+        batch: int | None = None,
     ) -> AsyncGenerator[list[BaseManga], Any]:
         """
         Абстрактный метод для генерации пакетов URL-адресов страниц с мангой.
 
         Args:
             start_page (int): Стартовая страница для парсинга.
+            stop_unchanged (bool): Остановиться на первой странице, которая не изменилась с прошлого запроса (ответ 304).
+            end_page (int | None): Последняя страница для парсинга (по умолчанию до конца).
+            batch (int | None): Сколько страниц загружается одновременно (по умолчанию размер пачки паука).
 
         Returns:
             Асинхронный генератор, выдающий списки базовых манг (BaseManga).
@@ -1,7 +1,9 @@
 import hashlib
 
+from datetime import datetime
+
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey, JSON, Index
+from sqlalchemy import String, ForeignKey, JSON, Index, DateTime, Text
 
 
 class Base(DeclarativeBase): ...
@@ -25,6 +27,8 @@ class Genre(Base):
         "GenreManga", back_populates="genre"
     )
 
+    __table_args__ = (Index("uq_genres_name", "name", unique=True),)
+
     def as_dict(self):
         return {
             "id": self.id,
@@ -50,6 +54,8 @@ class Author(Base):
 
     mangas: Mapped[list["Manga"]] = relationship("Manga", back_populates="author")
 
+    __table_args__ = (Index("uq_author_name", "name", unique=True),)
+
     def as_dict(self):
         return {
             "id": self.id,
@@ -75,6 +81,8 @@ class Language(Base):
 
     mangas: Mapped[list["Manga"]] = relationship("Manga", back_populates="language")
 
+    __table_args__ = (Index("uq_language_name", "name", unique=True),)
+
     def as_dict(self):
         return {
             "id": self.id,
@@ -104,6 +112,11 @@ class GenreManga(Base):
     genre: Mapped["Genre"] = relationship("Genre", back_populates="mangas_connection")
     manga: Mapped["Manga"] = relationship("Manga", back_populates="genres_connection")
 
+    __table_args__ = (
+        Index("idx_genre_id_id", "genre_id", "id"),
+        Index("uq_genre_manga_manga_id_genre_id", "manga_id", "genre_id", unique=True),
+    )
+
 
 class Gallery(Base):
     """
@@ -135,6 +148,7 @@ class Manga(Base):
         language_id (int): id языка
         author_id (int): id автора
         sku (str): уникальный идентификатор манги
+        fingerprint (str | None): отпечаток содержимого (MangaSchema.fingerprint), None если ещё не вычислен
         genres_connection (list[GenreManga]): список связей с жанрами
         author (Author): автор манги
         language (Language): язык манги
@@ -153,6 +167,7 @@ class Manga(Base):
     language_id: Mapped[int] = mapped_column(ForeignKey("language.id"), nullable=True)
     author_id: Mapped[int] = mapped_column(ForeignKey("author.id"), nullable=True)
     sku: Mapped[str] = mapped_column(String(32), unique=True, index=True)
+    fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     genres_connection: Mapped[list["GenreManga"]] = relationship(
         "GenreManga", back_populates="manga", cascade="delete", passive_deletes=True
@@ -212,4 +227,64 @@ class Manga(Base):
         Index("idx_sku", "sku"),
         Index("idx_title", "title"),
         Index("idx_url", "url"),
+        Index("idx_author_id_id", "author_id", "id"),
+        Index("idx_language_id_id", "language_id", "id"),
+    )
+
+
+class Checkpoint(Base):
+    """
+    Модель прогресса паука, чтобы после перезапуска продолжить с того же места
+
+    Args:
+        id (int): id записи
+        spider (str): название паука
+        run_id (str): id запуска, при продолжении не меняется
+        page (int): последняя страница, вся манга с которой (и со всех предыдущих) записана
+        updated_at (datetime): время сохранения
+    """
+
+    __tablename__ = "checkpoints"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    spider: Mapped[str] = mapped_column(String(255), unique=True)
+    run_id: Mapped[str] = mapped_column(String(32))
+    page: Mapped[int] = mapped_column()
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(), default=datetime.now, onupdate=datetime.now
+    )
+
+
+class CrawlJob(Base):
+    """
+    Модель задачи на загрузку манги, очередь для воркеров (worker.py)
+
+    Args:
+        id (int): id задачи
+        spider (str): название паука, который загрузит мангу
+        url (str): ссылка на мангу, одна задача на ссылку
+        status (str): pending, running, done либо failed
+        attempts (int): сколько раз задачу уже брали в работу
+        locked_by (str | None): воркер, который выполняет задачу
+        locked_at (datetime | None): когда задачу взяли в работу
+        error (str | None): последняя ошибка
+        created_at (datetime): время добавления
+        updated_at (datetime): время последнего изменения
+    """
+
+    __tablename__ = "crawl_jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    spider: Mapped[str] = mapped_column(String(255))
+    url: Mapped[str] = mapped_column(String(2048), unique=True)
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    locked_by: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text(), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(), default=datetime.now)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(), default=datetime.now, onupdate=datetime.now
     )
+
+    __table_args__ = (Index("idx_crawl_jobs_status", "status", "id"),)
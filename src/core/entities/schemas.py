@@ -1,6 +1,9 @@
 import hashlib
+import json
 
 from aiohttp import BasicAuth
+from typing import Literal
+
 from pydantic import BaseModel, HttpUrl, Field, field_validator
 
 
@@ -83,6 +86,24 @@ class MangaSchema(MangaWithGallery):
             "language": self.language,
         }
 
+    @property
+    def fingerprint(self) -> str:
+        """Отпечаток содержимого: название, постер, теги (жанры, автор, язык) и галерея
+
+        Порядок жанров не учитывается, сайты часто отдают их в разном порядке.
+        """
+        data = [
+            self.title,
+            str(self.poster),
+            sorted(set(self.genres)),
+            self.author,
+            self.language,
+            [str(x) for x in self.gallery],
+        ]
+        return hashlib.sha256(
+            json.dumps(data, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
 
 class OutputMangaSchema(MangaWithGallery):
     """
@@ -236,3 +257,61 @@ class MangaFindResultSchema(BaseModel):
 
     page_now: int = Field(0)
     """Текущая страница поиска"""
+
+    next_cursor: str | None = Field(None)
+    """Курсор следующей страницы, None если страница последняя"""
+
+
+class CheckpointSchema(BaseModel):
+    """
+    Схема прогресса паука
+
+    Args:
+        spider (str): название паука
+        run_id (str): id запуска
+        page (int): последняя полностью записанная страница
+    """
+
+    spider: str
+    run_id: str
+    page: int
+
+
+JOB_STATUS = Literal["pending", "running", "done", "failed"]
+
+
+class CrawlJobSchema(BaseModel):
+    """
+    Схема задачи на загрузку манги из очереди
+
+    Args:
+        id (int): id задачи
+        spider (str): название паука, который загрузит мангу
+        url (str): ссылка на мангу
+        status (JOB_STATUS): состояние задачи
+        attempts (int): сколько раз задачу уже брали в работу
+    """
+
+    id: int
+    spider: str
+    url: str
+    status: JOB_STATUS = Field("pending")
+    attempts: int = Field(0)
+
+
+INGEST_STATUS = Literal["added", "exists"]
+
+
+class IngestResultSchema(BaseModel):
+    """
+    Схема результата массовой записи одной манги
+
+    Args:
+        sku (str): sku манги
+        id (int): id манги в БД
+        status (INGEST_STATUS): added - манга добавлена, exists - манга уже была в БД
+    """
+
+    sku: str
+    id: int
+    status: INGEST_STATUS
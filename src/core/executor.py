@@ -0,0 +1,99 @@
+"""Разбор страниц вне event loop.
+
+BeautifulSoup работает синхронно, и большая страница галереи блокирует event loop
+(а вместе с ним и API) на десятки миллисекунд. Парсинг выполняется в пуле потоков
+или процессов: на вход сырые байты, на выход готовые схемы.
+"""
+
+import asyncio
+import multiprocessing
+import sys
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Literal, TypeAlias, TypeVar
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+
+EXECUTOR_KIND: TypeAlias = Literal["inline", "thread", "process"]
+_T = TypeVar("_T")
+
+
+class ExecutorConfig(BaseModel):
+    """Настройки пула для парсинга"""
+
+    kind: EXECUTOR_KIND = Field("process")
+    """inline - в event loop, thread - пул потоков, process - пул процессов (все ядра)."""
+
+    workers: int | None = Field(None, ge=1)
+    """Размер пула, None - количество ядер."""
+
+
+def _init_worker(level: str) -> None:
+    """Инициализация процесса пула, логи только в консоль, файл логов пишет основной процесс"""
+    logger.remove()
+    logger.add(sys.stderr, level=level)
+
+
+class ParseExecutor:
+    """Пул, в котором выполняется парсинг."""
+
+    def __init__(self, config: ExecutorConfig | None = None, log_level: str = "INFO"):
+        """Инициализация пула, сам пул создаётся при первом вызове
+
+        Args:
+            config (ExecutorConfig | None, optional): Настройки пула. По умолчанию ExecutorConfig().
+            log_level (str, optional): Уровень логов в процессах пула. По умолчанию "INFO".
+        """
+        self.config = config or ExecutorConfig()
+        self.log_level = log_level
+        self._executor: Executor | None = None
+
+    async def run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Выполнить функцию в пуле
+
+        Для пула процессов функция и аргументы должны сериализоваться pickle:
+        парсер и байты страницы подходят, сессия и паук нет.
+
+        Args:
+            func (Callable[..., _T]): Функция
+            *args (Any): Аргументы функции
+            **kwargs (Any): Именованные аргументы функции
+
+        Returns:
+            _T: Результат функции
+        """
+        if self.config.kind == "inline":
+            return func(*args, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        """Остановить пул"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.config.kind == "process":
+                # spawn: процесс с запущенным event loop и потоками нельзя безопасно fork-ать
+                self._executor = ProcessPoolExecutor(
+                    self.config.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.log_level,),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.config.workers, thread_name_prefix="parser"
+                )
+
+            logger.debug(f"Создан пул для парсинга (config={self.config})")
+
+        return self._executor
@@ -3,6 +3,10 @@ from .request import RequestManager
 from .spider import SpiderManager
 from .alert import AlertManager
 from .auth import AuthManager
+from .checkpoint import CheckpointManager
+from .job import JobManager
+from .tag import TagCache
+from .count import CountCache
 
 __all__ = [
     "MangaManager",
@@ -10,4 +14,8 @@ __all__ = [
     "SpiderManager",
     "AlertManager",
     "AuthManager",
+    "CheckpointManager",
+    "JobManager",
+    "TagCache",
+    "CountCache",
 ]
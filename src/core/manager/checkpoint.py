@@ -0,0 +1,84 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
+from loguru import logger
+
+from ..entities.schemas import CheckpointSchema
+from ..entities.models import Checkpoint
+
+
+class CheckpointManager:
+    """
+    Менеджер прогресса пауков.
+
+    Паук сохраняет последнюю полностью записанную страницу, и после перезапуска
+    продолжает с неё, а не с первой страницы.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        """
+        Инициализирует менеджер прогресса.
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy для подключения к БД.
+        """
+        self._engine = engine
+        self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+
+    async def get(self, spider: str) -> CheckpointSchema | None:
+        """
+        Получает прогресс паука.
+
+        Args:
+            spider (str): Название паука.
+
+        Returns:
+            CheckpointSchema | None: Прогресс, либо None если паук не сохранял прогресс.
+        """
+        async with self.Session() as session:
+            checkpoint = await session.scalar(
+                select(Checkpoint).where(Checkpoint.spider == spider)
+            )
+            if checkpoint is None:
+                return None
+
+            return CheckpointSchema(
+                spider=checkpoint.spider,
+                run_id=checkpoint.run_id,
+                page=checkpoint.page,
+            )
+
+    async def save(self, checkpoint: CheckpointSchema) -> None:
+        """
+        Сохраняет прогресс паука, старый прогресс перезаписывается.
+
+        Args:
+            checkpoint (CheckpointSchema): Прогресс паука.
+        """
+        async with self.Session() as session:
+            async with session.begin():
+                model = await session.scalar(
+                    select(Checkpoint).where(Checkpoint.spider == checkpoint.spider)
+                )
+                if model is None:
+                    model = Checkpoint(spider=checkpoint.spider)
+                    session.add(model)
+
+                model.run_id = checkpoint.run_id
+                model.page = checkpoint.page
+
+        logger.debug(
+            f"Сохранён прогресс (spider={checkpoint.spider}, page={checkpoint.page})"
+        )
+
+    async def clear(self, spider: str) -> None:
+        """
+        Удаляет прогресс паука, вызывается после полного завершения.
+
+        Args:
+            spider (str): Название паука.
+        """
+        async with self.Session() as session:
+            async with session.begin():
+                await session.execute(
+                    delete(Checkpoint).where(Checkpoint.spider == spider)
+                )
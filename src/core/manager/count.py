@@ -0,0 +1,185 @@
+import asyncio
+import time
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterable, Iterator, Literal, TypeAlias
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
+from loguru import logger
+
+from ..entities.models import GenreManga, Manga
+
+
+COUNT_KIND: TypeAlias = Literal["all", "genre", "author", "language"]
+
+
+class CountCache:
+    """
+    Количество манги: всего, по жанру, по автору и по языку.
+
+    Счётчики загружаются из базы данных (`GROUP BY`) при первом обращении,
+    дальше MangaManager меняет их при каждой записи, и количество для страницы
+    берётся из памяти без запроса.
+
+    Запись в памяти видит только свой процесс: мангу, записанную другими
+    процессами (воркеры очереди, см. QueueConfig.count_ttl), счётчики увидят
+    только после перечитывания раз в ttl секунд.
+
+    Количество по текстовому запросу считается запросом и хранится query_ttl секунд.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        ttl: float = 600,
+        query_ttl: float = 60,
+        query_size: int = 1024,
+    ):
+        """
+        Инициализирует кэш количества.
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy для подключения к БД.
+            ttl (float, optional): Через сколько секунд счётчики перечитываются. По умолчанию 600.
+            query_ttl (float, optional): Сколько секунд хранится количество по текстовому запросу. По умолчанию 60.
+            query_size (int, optional): Сколько текстовых запросов хранится. По умолчанию 1024.
+        """
+        self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+        self.ttl = ttl
+        self.query_ttl = query_ttl
+        self.query_size = query_size
+
+        self._all = 0
+        self._totals: dict[str, Counter[int]] = {
+            "genre": Counter(),
+            "author": Counter(),
+            "language": Counter(),
+        }
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        self._queries: OrderedDict[str, tuple[float, int]] = OrderedDict()
+
+    async def load(self) -> None:
+        """Перечитывает все счётчики из базы данных"""
+        totals: dict[str, Counter[int]] = {}
+        async with self.Session() as session:
+            total = await session.scalar(select(func.count()).select_from(Manga))
+            for kind, column in (
+                ("genre", GenreManga.genre_id),
+                ("author", Manga.author_id),
+                ("language", Manga.language_id),
+            ):
+                rows = await session.execute(
+                    select(column, func.count())
+                    .where(column.is_not(None))
+                    .group_by(column)
+                )
+                totals[kind] = Counter(dict(rows.tuples().all()))
+
+        self._all = total or 0
+        self._totals = totals
+        self._loaded_at = time.monotonic()
+        self._queries.clear()
+        logger.debug(f"Загружены счётчики манги (total={self._all})")
+
+    async def total(self, kind: COUNT_KIND = "all", key: int | None = None) -> int:
+        """
+        Количество манги.
+
+        Args:
+            kind (COUNT_KIND, optional): all - вся манга, иначе манга с тегом key. По умолчанию "all".
+            key (int | None, optional): id жанра, автора или языка. По умолчанию None.
+
+        Returns:
+            int: Количество манги.
+        """
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self.load()
+
+        if kind == "all":
+            return self._all
+
+        return self._totals[kind][key]
+
+    async def query(self, text: str, count: Callable[[], Awaitable[int]]) -> int:
+        """
+        Количество манги по текстовому запросу.
+
+        Args:
+            text (str): Запрос.
+            count (Callable[[], Awaitable[int]]): Считает количество, если его нет в кэше.
+
+        Returns:
+            int: Количество манги.
+        """
+        if (cached := self._queries.get(text)) is not None:
+            created, total = cached
+            if time.monotonic() - created < self.query_ttl:
+                self._queries.move_to_end(text)
+                return total
+
+        total = await count()
+        self._queries[text] = (time.monotonic(), total)
+        self._queries.move_to_end(text)
+        while len(self._queries) > self.query_size:
+            self._queries.popitem(last=False)
+
+        return total
+
+    def add(
+        self,
+        genres: Iterable[int] = (),
+        author: int | None = None,
+        language: int | None = None,
+        sign: int = 1,
+    ) -> None:
+        """
+        Учитывает записанную (sign=1) или удалённую (sign=-1) мангу.
+
+        Вызывается после коммита, внутри transaction. Пока счётчики не загружены,
+        ничего не делает: загрузка и так увидит мангу.
+
+        Args:
+            genres (Iterable[int], optional): id жанров манги, по одному на связь. По умолчанию ().
+            author (int | None, optional): id автора. По умолчанию None.
+            language (int | None, optional): id языка. По умолчанию None.
+            sign (int, optional): 1 - манга добавлена, -1 - удалена. По умолчанию 1.
+        """
+        if self._loaded_at is None:
+            return
+
+        self._all += sign
+        for genre in genres:
+            self._totals["genre"][genre] += sign
+
+        if author is not None:
+            self._totals["author"][author] += sign
+
+        if language is not None:
+            self._totals["language"][language] += sign
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Оборачивает запись манги вместе с вызовом add.
+
+        Если запись прервана ошибкой или отменой, неизвестно, прошёл ли коммит,
+        поэтому счётчики сбрасываются и перечитаются при следующем обращении.
+        """
+        try:
+            yield
+        except BaseException:
+            self.invalidate()
+            raise
+
+    def invalidate(self) -> None:
+        """Сбрасывает кэш, счётчики перечитаются при следующем обращении"""
+        self._loaded_at = None
+        self._queries.clear()
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
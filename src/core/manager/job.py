@@ -0,0 +1,291 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement, and_, case, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
+from loguru import logger
+
+from ..entities.schemas import BaseManga, CrawlJobSchema
+from ..entities.models import CrawlJob
+
+
+class JobManager:
+    """
+    Менеджер очереди задач на загрузку манги.
+
+    Паук только находит новую мангу на страницах и добавляет задачи, а загружают
+    мангу воркеры (worker.py), которых может быть сколько угодно. Задачи
+    раздаются через `SELECT ... FOR UPDATE SKIP LOCKED`, поэтому одну задачу
+    не возьмут два воркера. На SQLite блокировки строк нет, подходит только
+    для одного воркера (локальная разработка и тесты).
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        """
+        Инициализирует менеджер очереди.
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy для подключения к БД.
+        """
+        self._engine = engine
+        self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+
+    async def enqueue(self, spider: str, mangas: list[BaseManga]) -> int:
+        """
+        Добавляет задачи на загрузку манги.
+
+        Задача уже в очереди или в работе не дублируется, выполненная
+        либо проваленная задача возвращается в очередь.
+
+        Args:
+            spider (str): Название паука, который загрузит мангу.
+            mangas (list[BaseManga]): Манга, например новая манга с одной страницы.
+
+        Returns:
+            int: Сколько задач добавлено или возвращено в очередь.
+        """
+        now = datetime.now()
+        rows = {
+            str(manga.url): {
+                "spider": spider,
+                "url": str(manga.url),
+                "status": "pending",
+                "attempts": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for manga in mangas
+        }
+        if not rows:
+            return 0
+
+        insert = (
+            postgresql.insert
+            if self._engine.dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        statement = insert(CrawlJob).values(list(rows.values()))
+        statement = statement.on_conflict_do_update(
+            index_elements=[CrawlJob.url],
+            set_={
+                "spider": statement.excluded.spider,
+                "status": "pending",
+                "attempts": 0,
+                "error": None,
+                "locked_by": None,
+                "locked_at": None,
+                "updated_at": now,
+            },
+            where=CrawlJob.status.in_(("done", "failed")),
+        )
+
+        async with self.Session() as session:
+            async with session.begin():
+                result = await session.execute(statement)
+
+        logger.debug(
+            f"Добавлены задачи (spider={spider}, total={len(rows)}, queued={result.rowcount})"
+        )
+        return result.rowcount
+
+    async def claim(
+        self,
+        worker: str,
+        limit: int = 10,
+        spiders: list[str] | None = None,
+        lock_timeout: float | None = None,
+        max_attempts: int | None = None,
+    ) -> list[CrawlJobSchema]:
+        """
+        Берёт задачи в работу.
+
+        Args:
+            worker (str): Название воркера.
+            limit (int, optional): Максимальное количество задач. По умолчанию 10.
+            spiders (list[str] | None, optional): Только задачи этих пауков. По умолчанию все.
+            lock_timeout (float | None, optional): Через сколько секунд задача в работе считается брошенной
+                (воркер упал) и отдаётся снова. По умолчанию никогда.
+            max_attempts (int | None, optional): Брошенная задача, у которой закончились попытки, не отдаётся,
+                а отмечается проваленной (например, воркер каждый раз падает на ней). По умолчанию без ограничения.
+
+        Returns:
+            list[CrawlJobSchema]: Задачи, которые теперь выполняет воркер.
+        """
+        now = datetime.now()
+        condition = CrawlJob.status == "pending"
+        abandoned = None
+        if lock_timeout is not None:
+            abandoned = and_(
+                CrawlJob.status == "running",
+                CrawlJob.locked_at < now - timedelta(seconds=lock_timeout),
+            )
+            condition = or_(condition, abandoned)
+
+        query = select(CrawlJob).where(condition)
+        if spiders is not None:
+            query = query.where(CrawlJob.spider.in_(spiders))
+
+        async with self.Session() as session:
+            async with session.begin():
+                if abandoned is not None and max_attempts is not None:
+                    result = await session.execute(
+                        update(CrawlJob)
+                        .where(abandoned, CrawlJob.attempts >= max_attempts)
+                        .values(
+                            status="failed",
+                            locked_by=None,
+                            locked_at=None,
+                            error="Воркер не завершил задачу, попытки закончились",
+                            updated_at=now,
+                        )
+                    )
+                    if result.rowcount:
+                        logger.warning(
+                            f"Брошенные задачи отмечены проваленными (total={result.rowcount})"
+                        )
+
+                jobs = (
+                    await session.scalars(
+                        query.order_by(CrawlJob.id)
+                        .limit(limit)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).all()
+
+                for job in jobs:
+                    job.status = "running"
+                    job.locked_by = worker
+                    job.locked_at = now
+                    job.attempts += 1
+                    job.updated_at = now
+
+                return [
+                    CrawlJobSchema(
+                        id=job.id,
+                        spider=job.spider,
+                        url=job.url,
+                        status="running",
+                        attempts=job.attempts,
+                    )
+                    for job in jobs
+                ]
+
+    async def complete(self, job_id: int, worker: str) -> bool:
+        """
+        Отмечает задачу выполненной.
+
+        Args:
+            job_id (int): id задачи.
+            worker (str): Название воркера, который выполнял задачу.
+
+        Returns:
+            bool: False, если задача уже не у этого воркера (отдана другому после lock_timeout).
+        """
+        async with self.Session() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(CrawlJob)
+                    .where(*self._locked(job_id, worker))
+                    .values(
+                        status="done",
+                        locked_by=None,
+                        locked_at=None,
+                        error=None,
+                        updated_at=datetime.now(),
+                    )
+                )
+
+        return self._owned(result.rowcount, job_id, worker)
+
+    async def fail(
+        self, job_id: int, worker: str, error: str, max_attempts: int = 3
+    ) -> bool:
+        """
+        Отмечает неудачную попытку, задача возвращается в очередь, пока не
+        закончатся попытки.
+
+        Args:
+            job_id (int): id задачи.
+            worker (str): Название воркера, который выполнял задачу.
+            error (str): Описание ошибки.
+            max_attempts (int, optional): Сколько попыток даётся задаче. По умолчанию 3.
+
+        Returns:
+            bool: False, если задача уже не у этого воркера (отдана другому после lock_timeout).
+        """
+        async with self.Session() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(CrawlJob)
+                    .where(*self._locked(job_id, worker))
+                    .values(
+                        status=case(
+                            (CrawlJob.attempts >= max_attempts, "failed"),
+                            else_="pending",
+                        ),
+                        locked_by=None,
+                        locked_at=None,
+                        error=error,
+                        updated_at=datetime.now(),
+                    )
+                )
+
+        return self._owned(result.rowcount, job_id, worker)
+
+    async def release(self, worker: str) -> int:
+        """
+        Возвращает в очередь незавершённые задачи воркера, вызывается при его остановке.
+        Попытка не засчитывается.
+
+        Args:
+            worker (str): Название воркера.
+
+        Returns:
+            int: Сколько задач возвращено.
+        """
+        async with self.Session() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(CrawlJob)
+                    .where(CrawlJob.locked_by == worker, CrawlJob.status == "running")
+                    .values(
+                        status="pending",
+                        attempts=CrawlJob.attempts - 1,
+                        locked_by=None,
+                        locked_at=None,
+                        updated_at=datetime.now(),
+                    )
+                )
+
+        return result.rowcount
+
+    async def stats(self) -> dict[str, int]:
+        """
+        Количество задач по состояниям.
+
+        Returns:
+            dict[str, int]: Состояние: количество задач.
+        """
+        async with self.Session() as session:
+            rows = await session.execute(
+                select(CrawlJob.status, func.count()).group_by(CrawlJob.status)
+            )
+            return {status: total for status, total in rows}
+
+    @staticmethod
+    def _locked(job_id: int, worker: str) -> tuple[ColumnElement[bool], ...]:
+        """Условие: задача в работе у этого воркера"""
+        return (
+            CrawlJob.id == job_id,
+            CrawlJob.locked_by == worker,
+            CrawlJob.status == "running",
+        )
+
+    @staticmethod
+    def _owned(rowcount: int, job_id: int, worker: str) -> bool:
+        if not rowcount:
+            logger.warning(
+                f"Задача уже не у воркера, результат не записан (job={job_id}, worker={worker})"
+            )
+
+        return bool(rowcount)
@@ -1,8 +1,9 @@
 from typing import overload
 
-from sqlalchemy import func, delete
+from sqlalchemy import delete, update
 
-from sqlalchemy import select
+from sqlalchemy import func, select, insert
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
 from loguru import logger
@@ -12,9 +13,13 @@ from ..entities.schemas import (
     OutputMangaSchema,
     BaseManga,
     ObjectWithId,
+    IngestResultSchema,
 )
 from ..entities.models import Manga, Gallery, Language, Author, GenreManga, Genre
 from .._tools import logging
+from .tag import TagCache
+from .count import CountCache
+from .search import SearchIndex
 
 
 class MangaManager:
@@ -31,15 +36,27 @@ class MangaManager:
 
     BASE_PER_PAGE: int = 30
 
-    def __init__(self, engine: AsyncEngine):
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        tags: TagCache | None = None,
+        counts: CountCache | None = None,
+        search: SearchIndex | None = None,
+    ):
         """
         Инициализирует менеджер манги.
 
         Args:
             engine (AsyncEngine): Асинхронный движок SQLAlchemy для подключения к БД.
+            tags (TagCache | None, optional): Кэш жанров, авторов и языков. По умолчанию свой кэш.
+            counts (CountCache | None, optional): Количество манги по тегам. По умолчанию свой кэш.
+            search (SearchIndex | None, optional): Поиск по названию. По умолчанию свой индекс.
         """
         self._engine = engine
         self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+        self.tags = tags or TagCache(engine)
+        self.counts = counts or CountCache(engine)
+        self.search = search or SearchIndex(engine)
 
     @logging
     async def add_manga(self, manga: MangaSchema) -> OutputMangaSchema:
@@ -55,64 +72,189 @@ class MangaManager:
         Returns:
             OutputMangaSchema: Добавленная манга с заполненными ID и связями. OutputMangaSchema, если манга уже существует.
         """
-        async with self.Session() as session:
-            async with session.begin():
-                find_manga = await session.scalar(
-                    select(Manga)
-                    .where(Manga.sku == manga.sku)
-                    .options(
-                        joinedload(Manga.author),
-                        joinedload(Manga.language),
-                        selectinload(Manga.genres_connection).joinedload(
-                            GenreManga.genre
-                        ),
-                        joinedload(Manga.gallery),
+        # Теги создаются до транзакции манги, см. TagCache
+        author_id = (
+            await self.tags.get_id(Author, manga.author) if manga.author else None
+        )
+        language_id = (
+            await self.tags.get_id(Language, manga.language) if manga.language else None
+        )
+        genres = await self.tags.get_ids(Genre, manga.genres)
+
+        with self.counts.transaction():
+            async with self.Session() as session:
+                async with session.begin():
+                    find_manga = await session.scalar(
+                        select(Manga)
+                        .where(Manga.sku == manga.sku)
+                        .options(
+                            joinedload(Manga.author),
+                            joinedload(Manga.language),
+                            selectinload(Manga.genres_connection).joinedload(
+                                GenreManga.genre
+                            ),
+                            joinedload(Manga.gallery),
+                        )
+                        .execution_options(populate_existing=True)
+                    )
+                    if find_manga is not None:
+                        logger.warning(f"Манга уже существует (sku={find_manga.sku})")
+                        return self._build_manga(find_manga, id=find_manga.id)
+
+                    result = Manga(
+                        title=manga.title,
+                        url=str(manga.url),
+                        poster=str(manga.poster),
+                        language_id=language_id,
+                        author_id=author_id,
+                        fingerprint=manga.fingerprint,
+                    )
+                    session.add(result)
+                    await session.flush()
+
+                    output = OutputMangaSchema(
+                        title=manga.title,
+                        poster=manga.poster,
+                        url=manga.url,
+                        genres=self._connect(result, manga, session, genres),
+                        author=ObjectWithId(name=manga.author, id=author_id)
+                        if author_id
+                        else None,
+                        language=ObjectWithId(name=manga.language, id=language_id)
+                        if language_id
+                        else None,
+                        gallery=manga.gallery,
+                        id=result.id,
                     )
-                    .execution_options(populate_existing=True)
-                )
-                if find_manga is not None:
-                    logger.warning(f"Манга уже существует (sku={find_manga.sku})")
-                    return self._build_manga(find_manga, id=find_manga.id)
 
-                title = manga.title
-                url = str(manga.url)
-                poster = str(manga.poster)
+            self.counts.add(
+                [genres[x] for x in dict.fromkeys(manga.genres)], author_id, language_id
+            )
+        self.search.add(output.id, manga.title)
+        return output
 
-                language = None
-                author = None
+    @logging
+    async def add_many_manga(
+        self, mangas: list[MangaSchema]
+    ) -> list[IngestResultSchema]:
+        """
+        Добавляет много манги за одну транзакцию.
 
-                if manga.language:
-                    language = await self._add_language(session, manga.language)
+        В отличие от add_manga число запросов не зависит от количества манги:
+        авторы, жанры и языки ищутся и создаются пачкой через TagCache, манга
+        записывается через `INSERT ... ON CONFLICT (sku) DO NOTHING`, связи
+        с жанрами и галереи - многострочными INSERT.
 
-                if manga.author:
-                    author = await self._add_author(session, manga.author)
+        Args:
+            mangas (list[MangaSchema]): Манга, повторы по sku записываются один раз.
 
-                result = Manga(
-                    title=title,
-                    url=url,
-                    poster=poster,
-                    language_id=language.id if language is not None else None,
-                    author_id=author.id if author is not None else None,
+        Returns:
+            list[IngestResultSchema]: Результат для каждой манги в порядке mangas.
+        """
+        unique: dict[str, MangaSchema] = {}
+        for manga in mangas:
+            unique.setdefault(manga.sku, manga)
+
+        if not unique:
+            return []
+
+        authors = await self.tags.get_ids(
+            Author, {x.author for x in unique.values() if x.author}
+        )
+        languages = await self.tags.get_ids(
+            Language, {x.language for x in unique.values() if x.language}
+        )
+        genres = await self.tags.get_ids(
+            Genre, {y for x in unique.values() for y in x.genres}
+        )
+
+        with self.counts.transaction():
+            async with self.Session() as session:
+                async with session.begin():
+                    dialect_insert = (
+                        postgresql.insert
+                        if self._engine.dialect.name == "postgresql"
+                        else sqlite.insert
+                    )
+                    rows = await session.execute(
+                        dialect_insert(Manga)
+                        .values(
+                            [
+                                {
+                                    "title": manga.title,
+                                    "url": str(manga.url),
+                                    "poster": str(manga.poster),
+                                    "sku": sku,
+                                    "fingerprint": manga.fingerprint,
+                                    "author_id": authors.get(manga.author),
+                                    "language_id": languages.get(manga.language),
+                                }
+                                for sku, manga in unique.items()
+                            ]
+                        )
+                        .on_conflict_do_nothing(index_elements=[Manga.sku])
+                        .returning(Manga.sku, Manga.id)
+                    )
+                    added: dict[str, int] = dict(rows.tuples().all())
+
+                    if added:
+                        links = [
+                            {"manga_id": id, "genre_id": genres[genre]}
+                            for sku, id in added.items()
+                            for genre in dict.fromkeys(unique[sku].genres)
+                        ]
+                        if links:
+                            await session.execute(insert(GenreManga), links)
+
+                        await session.execute(
+                            insert(Gallery),
+                            [
+                                {
+                                    "manga_id": id,
+                                    "urls": [str(x) for x in unique[sku].gallery],
+                                }
+                                for sku, id in added.items()
+                            ],
+                        )
+
+                    exists: dict[str, int] = {}
+                    if missing := [x for x in unique if x not in added]:
+                        rows = await session.execute(
+                            select(Manga.sku, Manga.id).where(Manga.sku.in_(missing))
+                        )
+                        exists = dict(rows.tuples().all())
+
+            for sku in added:
+                self.counts.add(
+                    [genres[x] for x in dict.fromkeys(unique[sku].genres)],
+                    authors.get(unique[sku].author),
+                    languages.get(unique[sku].language),
                 )
-                session.add(result)
-                await session.flush()
-
-                genres = await self._connect(result, manga, session)
-
-                return OutputMangaSchema(
-                    title=manga.title,
-                    poster=manga.poster,
-                    url=manga.url,
-                    genres=genres,
-                    author=ObjectWithId(name=manga.author, id=author.id)
-                    if author
-                    else None,
-                    language=ObjectWithId(name=manga.language, id=language.id)
-                    if language
-                    else None,
-                    gallery=manga.gallery,
-                    id=result.id,
+
+        for sku in added:
+            self.search.add(added[sku], unique[sku].title)
+
+        logger.debug(
+            f"Манга добавлена пачкой (total={len(mangas)}, added={len(added)}, exists={len(exists)})"
+        )
+        # Повтор sku внутри пачки - манга уже записана первым вхождением
+        seen: set[str] = set()
+        result: list[IngestResultSchema] = []
+        for manga in mangas:
+            sku = manga.sku
+            if sku in added and sku not in seen:
+                result.append(
+                    IngestResultSchema(sku=sku, id=added[sku], status="added")
+                )
+            else:
+                result.append(
+                    IngestResultSchema(
+                        sku=sku, id=added.get(sku) or exists[sku], status="exists"
+                    )
                 )
+            seen.add(sku)
+
+        return result
 
     @logging
     async def update_manga(
@@ -126,6 +268,7 @@ class MangaManager:
         author: str | None = None,
         gallery: list[str] | None = None,
         genres: list[str] | None = None,
+        fingerprint: str | None = None,
     ) -> OutputMangaSchema | None:
         """Обновить мангу
         Если не указан параметр, то он не будет обновлен
@@ -139,67 +282,104 @@ class MangaManager:
             author (str | None, optional): Автор. По умолчанию None.
             gallery (list[str] | None, optional): Галлерея. По умолчанию None.
             genres (list[str] | None, optional): Жанры. По умолчанию None.
+            fingerprint (str | None, optional): Отпечаток нового содержимого (MangaSchema.fingerprint). По умолчанию None.
 
         Returns:
             OutputMangaSchema | None: Схема данных манги. Если манга не найдена, то None.
         """
-        async with self.Session() as session:
-            async with session.begin():
-                find_manga = await session.scalar(
-                    select(Manga)
-                    .where(Manga.sku == sku)
-                    .options(
-                        joinedload(Manga.author),
-                        joinedload(Manga.language),
-                        selectinload(Manga.genres_connection).joinedload(
-                            GenreManga.genre
-                        ),
-                        joinedload(Manga.gallery),
+        # Теги создаются до транзакции манги, см. TagCache
+        language_id = (
+            await self.tags.get_id(Language, language) if language is not None else None
+        )
+        author_id = (
+            await self.tags.get_id(Author, author) if author is not None else None
+        )
+        genre_ids = await self.tags.get_ids(Genre, genres or [])
+
+        with self.counts.transaction():
+            async with self.Session() as session:
+                async with session.begin():
+                    find_manga = await session.scalar(
+                        select(Manga)
+                        .where(Manga.sku == sku)
+                        .options(
+                            joinedload(Manga.author),
+                            joinedload(Manga.language),
+                            selectinload(Manga.genres_connection).joinedload(
+                                GenreManga.genre
+                            ),
+                            joinedload(Manga.gallery),
+                        )
+                        .execution_options(populate_existing=True)
+                    )
+                    if find_manga is None:
+                        logger.warning(f"Манга не существует (sku={sku})")
+                        return None
+
+                    before = (
+                        [x.genre_id for x in find_manga.genres_connection],
+                        find_manga.author_id,
+                        find_manga.language_id,
                     )
-                    .execution_options(populate_existing=True)
-                )
-                if find_manga is None:
-                    logger.warning(f"Манга не существует (sku={sku})")
-                    return None
 
-                if title is not None:
-                    find_manga.title = title
+                    if title is not None:
+                        find_manga.title = title
 
-                if url is not None and find_manga.url != str(url):
-                    find_manga.url = str(url)
+                    if url is not None and find_manga.url != str(url):
+                        find_manga.url = str(url)
 
-                if poster is not None and find_manga.poster != str(poster):
-                    find_manga.poster = str(poster)
+                    if poster is not None and find_manga.poster != str(poster):
+                        find_manga.poster = str(poster)
 
-                if language is not None and find_manga.language != language:
-                    find_manga.language_id = (
-                        await self._add_language(session, language)
-                    ).id
+                    if language_id is not None:
+                        find_manga.language_id = language_id
 
-                if author is not None and find_manga.author != author:
-                    find_manga.author_id = (await self._add_author(session, author)).id
+                    if author_id is not None:
+                        find_manga.author_id = author_id
 
-                if genres is not None:
-                    await session.execute(
-                        delete(GenreManga).where(GenreManga.manga_id == find_manga.id)
-                    )
-                    for genre in genres:
-                        genre = await self._add_genre(session, genre)
-                        session.add(
-                            GenreManga(manga_id=find_manga.id, genre_id=genre.id)
+                    if genres is not None:
+                        await session.execute(
+                            delete(GenreManga).where(
+                                GenreManga.manga_id == find_manga.id
+                            )
                         )
-
-                if gallery is not None:
-                    await session.execute(
-                        delete(Gallery).where(Gallery.manga_id == find_manga.id)
-                    )
-                    gallery = Gallery(
-                        urls=[str(x) for x in gallery], manga_id=find_manga.id
+                        for genre in dict.fromkeys(genres):
+                            session.add(
+                                GenreManga(
+                                    manga_id=find_manga.id, genre_id=genre_ids[genre]
+                                )
+                            )
+
+                    if gallery is not None:
+                        await session.execute(
+                            delete(Gallery).where(Gallery.manga_id == find_manga.id)
+                        )
+                        gallery = Gallery(
+                            urls=[str(x) for x in gallery], manga_id=find_manga.id
+                        )
+                        session.add(gallery)
+
+                    if fingerprint is not None:
+                        find_manga.fingerprint = fingerprint
+
+                    await session.flush()
+                    after = (
+                        [genre_ids[x] for x in dict.fromkeys(genres)]
+                        if genres is not None
+                        else before[0],
+                        find_manga.author_id,
+                        find_manga.language_id,
                     )
-                    session.add(gallery)
+                    output = self._build_manga(find_manga, id=find_manga.id)
+
+            if before != after:
+                self.counts.add(*before, sign=-1)
+                self.counts.add(*after)
 
-                await session.flush()
-                return self._build_manga(find_manga, id=find_manga.id)
+        if title is not None:
+            self.search.add(output.id, title)
+
+        return output
 
     @logging
     async def get_manga(self, id: int) -> OutputMangaSchema | None:
@@ -320,102 +500,101 @@ class MangaManager:
                     await session.commit()
 
     @logging
-    async def get_total(self) -> int:
-        """Получить общее количество манги в базе данных"""
-        async with self.Session() as session:
-            total = await session.scalar(select(func.count()).select_from(Manga))
-            return total or 0
+    async def known_skus(self, mangas: list[BaseManga]) -> set[str]:
+        """Проверяет наличие пачки манги в базе данных одним запросом
 
-    async def _connect(
-        self, manga: Manga, manga_schema: MangaSchema, session: AsyncSession
-    ) -> list[ObjectWithId]:
-        """
-        Связывает мангу с жанрами и галереей.
-
-        Создаёт записи в таблицах связи и добавляет галерею.
+        Так-же как и in_database, обновляет постер у манги, если он изменился.
 
         Args:
-            manga (Manga): Объект манги из БД.
-            manga_schema (MangaSchema): Входные данные манги.
-            session (AsyncSession): Активная сессия БД.
+            mangas (list[BaseManga]): Манга, например одна страница из pages()
 
         Returns:
-            list[ObjectWithId]: Список связанных объектов.
-
+            set[str]: SKU манги, которая уже есть в базе данных
         """
-        result: list[ObjectWithId] = []
-        for genre_name in manga_schema.genres:
-            genre = await self._add_genre(session, genre_name)
-            session.add(GenreManga(genre_id=genre.id, manga_id=manga.id))
-            result.append(ObjectWithId(id=genre.id, name=genre.name))
-
-        gallery = Gallery(
-            urls=[str(x) for x in manga_schema.gallery], manga_id=manga.id
-        )
-        session.add(gallery)
-        return result
+        posters = {manga.sku: str(manga.poster) for manga in mangas}
+        if not posters:
+            return set()
 
-    async def _add_author(self, session: AsyncSession, author: str) -> Author:
-        """
-        Добавляет автора в БД или возвращает существующего.
+        async with self.Session() as session:
+            async with session.begin():
+                rows = (
+                    await session.execute(
+                        select(Manga.id, Manga.sku, Manga.poster).where(
+                            Manga.sku.in_(posters)
+                        )
+                    )
+                ).all()
 
-        Args:
-            session (AsyncSession): Активная сессия БД.
-            author (str): Имя автора.
+                changed = [
+                    {"id": id, "poster": posters[sku]}
+                    for id, sku, poster in rows
+                    if poster != posters[sku]
+                ]
+                if changed:
+                    await session.execute(update(Manga), changed)
+                    logger.debug(f"Обновлены постеры (total={len(changed)})")
 
-        Returns:
-            Author: Объект автора.
-        """
-        return await self._add_item(session, Author, author)
+        return {sku for _, sku, _ in rows}
 
-    async def _add_genre(self, session: AsyncSession, genre: str) -> Genre:
-        """
-        Добавляет жанр в БД или возвращает существующий.
+    @logging
+    async def fingerprints(self, mangas: list[BaseManga]) -> dict[str, str | None]:
+        """Отпечатки содержимого пачки манги одним запросом
 
         Args:
-            session (AsyncSession): Активная сессия БД.
-            genre (str): Название жанра.
+            mangas (list[BaseManga]): Манга, например одна страница из pages()
 
         Returns:
-            Genre: Объект жанра.
-        """
-        return await self._add_item(session, Genre, genre)
-
-    async def _add_language(self, session: AsyncSession, language: str) -> Language:
+            dict[str, str | None]: SKU: отпечаток, только для манги, которая есть в базе данных.
+                None - отпечаток ещё не сохранён (манга добавлена до появления отпечатков).
         """
-        Добавляет язык в БД или возвращает существующий.
+        skus = {manga.sku for manga in mangas}
+        if not skus:
+            return {}
 
-        Args:
-            session (AsyncSession): Активная сессия БД.
-            language (str): Название языка.
+        async with self.Session() as session:
+            rows = await session.execute(
+                select(Manga.sku, Manga.fingerprint).where(Manga.sku.in_(skus))
+            )
+            return {sku: fingerprint for sku, fingerprint in rows}
 
-        Returns:
-            Language: Объект языка.
-        """
-        return await self._add_item(session, Language, language)
+    @logging
+    async def get_total(self) -> int:
+        """Получить общее количество манги в базе данных"""
+        async with self.Session() as session:
+            total = await session.scalar(select(func.count()).select_from(Manga))
+            return total or 0
 
-    async def _add_item(
-        self, session: AsyncSession, model: type[Author | Genre | Language], item: str
-    ) -> Author | Genre | Language:
+    def _connect(
+        self,
+        manga: Manga,
+        manga_schema: MangaSchema,
+        session: AsyncSession,
+        genres: dict[str, int],
+    ) -> list[ObjectWithId]:
         """
-        Универсальный метод для добавления сущности (автор, жанр, язык).
+        Связывает мангу с жанрами и галереей.
 
-        Проверяет наличие записи по имени, при отсутствии создаёт новую.
+        Создаёт записи в таблицах связи и добавляет галерею.
 
         Args:
+            manga (Manga): Объект манги из БД.
+            manga_schema (MangaSchema): Входные данные манги.
             session (AsyncSession): Активная сессия БД.
-            model (type[Author | Genre | Language]): Модель сущности.
-            item (str): Имя сущности.
+            genres (dict[str, int]): Название: id жанров манги (TagCache.get_ids).
 
         Returns:
-            Author | Genre | Language: Найденная или созданная сущность.
+            list[ObjectWithId]: Список связанных объектов.
+
         """
-        if result := await session.scalar(select(model).where(model.name == item)):
-            return result
+        result: list[ObjectWithId] = []
+        for genre_name in dict.fromkeys(manga_schema.genres):
+            session.add(GenreManga(genre_id=genres[genre_name], manga_id=manga.id))
+            result.append(ObjectWithId(id=genres[genre_name], name=genre_name))
 
-        result = model(name=item)
-        session.add(result)
-        await session.flush()
+        gallery = Gallery(
+            urls=[str(x) for x in manga_schema.gallery], manga_id=manga.id
+        )
+        session.add(gallery)
         return result
 
     @overload
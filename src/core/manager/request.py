@@ -1,15 +1,23 @@
-from hashlib import sha256
-from typing import Unpack, Literal, TypeAlias, overload
+import copy
+import time
+
+from typing import Self, Unpack, Literal, TypeAlias, overload
 
-from fake_headers import Headers
 from aiohttp import ClientSession
 from aiohttp import ClientResponseError, ServerDisconnectedError
 from aiohttp.client import _RequestOptions
 from aiohttp import ClientOSError
 from loguru import logger
 
-from ..abstract.request import BaseRequestManager
+from ..abstract.request import BaseRequestManager, RequestItem
 from ..entities.schemas import AiohttpProxy
+from ..network import (
+    ConnectionPool,
+    ConnectorConfig,
+    PoolStats,
+    get_host,
+    parse_retry_after,
+)
 
 ReturnType: TypeAlias = Literal["text", "read"]
 
@@ -17,9 +25,59 @@ ReturnType: TypeAlias = Literal["text", "read"]
 class RequestManager(BaseRequestManager[ClientSession]):
     BASE_PROXY = AiohttpProxy
 
-    def __init__(self, session, **kw):
+    THROTTLE_STATUS = (429, 503)
+    """Статусы, при которых хост ограничивает нас, лимит хоста уменьшается"""
+
+    def __init__(self, session: ClientSession, **kw: Unpack[RequestItem]):
         super().__init__(session, **kw)
-        self.headers = Headers()
+        self.connector = ConnectorConfig.model_validate(kw.get("connector") or {})
+        self.pools: dict[str, ConnectionPool] = {}
+
+    @classmethod
+    def create(cls, **kw: Unpack[RequestItem]) -> Self:
+        """Создаёт менеджер запросов со своим пулом соединений, вызывается внутри запущенного event loop.
+
+        Returns:
+            Self: Менеджер запросов, сессию закрывает метод close
+        """
+        pool = ConnectionPool(
+            "default", ConnectorConfig.model_validate(kw.get("connector") or {})
+        )
+        http = cls(pool.create_session(), **kw)
+        http.pools[pool.name] = pool
+        return http
+
+    def for_spider(self, name: str) -> Self:
+        """Менеджер запросов для паука. Если включен connector.per_spider, паук получает свой пул соединений,
+        а лимиты хостов, кэш и прокси остаются общими.
+
+        Args:
+            name (str): Название паука
+
+        Returns:
+            Self: Менеджер запросов
+        """
+        if not self.connector.per_spider or not self.pools:
+            return self
+
+        if name not in self.pools:
+            self.pools[name] = ConnectionPool(name, self.connector)
+
+        http = copy.copy(self)
+        http.session = self.pools[name].create_session()
+        http.parent = self
+        return http
+
+    @property
+    def pool_stats(self) -> list[PoolStats]:
+        """Открытые, простаивающие и ожидающие соединения по каждому пулу"""
+        return [pool.stats for pool in self.pools.values()]
+
+    async def close(self) -> None:
+        """Закрыть файл записанных ответов и пулы соединений"""
+        await super().close()
+        for pool in self.pools.values():
+            await pool.close()
 
     @overload
     async def request(
@@ -128,14 +186,49 @@ class RequestManager(BaseRequestManager[ClientSession]):
         Returns:
             str | bytes | None: Возвращает данные с страницы
         """
-        if f"{method}{url}" in self.cache:
+        key = self.cache_key(method, url, type, kwargs)
+        if self.cassette is not None and self.record_mode == "replay":
+            return await self.cassette.replay(key, url, self.replay_latency)
+
+        if (result := await self.cache.get(key)) is not None:
             logger.info(f"Используется кэш (url={url}, method={method})")
-            return self.cache[f"{method}{url}"]
+        else:
+            result = await self.flight.do(
+                key, lambda: self._request(method, url, type, key, **kwargs)
+            )
+
+        if self.cassette is not None and self.record_mode == "record":
+            await self.cassette.record(key, method, url, result)
 
-        async with self.semaphore:
-            logger.debug(f"Попытка получить страницу (url={url}, method={method})")
-            for _ in range(self.max_retries):
-                proxy = self.get_proxy()
+        return result
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        type: ReturnType,
+        key: str,
+        **kwargs: Unpack[_RequestOptions],
+    ) -> str | bytes | None:
+        """Выполняет запрос с повторными попытками, результат сохраняется в кэш по ключу.
+
+        Args:
+            method (str): Метод запроса
+            url (str): URL запроса
+            type (ReturnType): Тип возвращаемых данных
+            key (str): Ключ запроса для кэша
+
+        Returns:
+            str | bytes | None: Данные страницы
+        """
+        host = get_host(url)
+        limiter = self.hosts.get(host)
+        stale = await self.cache.get_stale(key) if method.upper() == "GET" else None
+        logger.debug(f"Попытка получить страницу (url={url}, method={method})")
+        for attempt in range(1, self.max_retries + 1):
+            await limiter.pace()
+            async with self.hosts.slot(url):
+                proxy = self.get_proxy(url)
                 templates = {}
                 try:
                     if proxy:
@@ -144,26 +237,50 @@ class RequestManager(BaseRequestManager[ClientSession]):
                     else:
                         templates = kwargs.copy()
 
-                    if (
-                        sku := sha256(
-                            (f"{method}{url}" + str(templates)).encode()
-                        ).hexdigest()
-                    ) in self.cache:
-                        return self.cache[sku]
-
-                    templates["headers"] = kwargs.get(
-                        "headers", self.headers.generate()
+                    templates["headers"] = kwargs.get("headers") or self.profiles.get(
+                        proxy.proxy if proxy else None, host
                     )
+                    if stale is not None:
+                        templates["headers"] = {
+                            **templates["headers"],
+                            **self.conditional_headers(stale.validators),
+                        }
 
+                    start = time.monotonic()
                     async with self.session.request(
                         method, url, **templates
                     ) as response:
+                        if response.status == 304 and stale is not None:
+                            logger.debug(
+                                f"Страница не изменилась (url={url}, method={method})"
+                            )
+                            if proxy:
+                                self.good_response(
+                                    proxy, time.monotonic() - start, url=url
+                                )
+                            self.set_unchanged(url, True)
+                            await self.cache.refresh(key, stale)
+                            limiter.success()
+                            return stale.value
+
                         response.raise_for_status()
                         result = await getattr(response, type)()
                         logger.debug(
                             f"Удалось получить страницу (url={url}, method={method}, result_len={len(result)})"
                         )
-                        self.cache[sku] = result
+                        if proxy:
+                            self.good_response(
+                                proxy, time.monotonic() - start, len(result), url
+                            )
+                        self.set_unchanged(url, False)
+                        await self.cache.set(
+                            key,
+                            result,
+                            validators=self.get_validators(response.headers)
+                            if method.upper() == "GET"
+                            else None,
+                        )
+                        limiter.success()
                         return result
 
                 except ClientResponseError as error:
@@ -177,14 +294,20 @@ class RequestManager(BaseRequestManager[ClientSession]):
                         logger.warning(
                             f"Страница недоступна (url={url}, method={method}, message={error.message})"
                         )
+                        self.profiles.rotate(proxy.proxy if proxy else None, host)
                         return
 
-                    elif error.status == 407:
+                    elif error.status in self.THROTTLE_STATUS:
+                        limiter.throttle(
+                            parse_retry_after((error.headers or {}).get("Retry-After"))
+                        )
+
+                    elif error.status == 407 and proxy:
                         logger.warning(
                             f"Прокси более не доступен (proxy={proxy.proxy})"
                         )
-                        if proxy:
-                            self.ban_proxy(proxy)
+                        self.ban_proxy(proxy)
+                        self.profiles.rotate(proxy.proxy, host)
                     logger.error(
                         f"Не удалось получить страницу (url={url}, method={method}, message={error.message}, status={error.status})"
                     )
@@ -211,7 +334,7 @@ class RequestManager(BaseRequestManager[ClientSession]):
                         )
                     else:
                         if proxy:
-                            self.wrong_response(proxy)
+                            self.wrong_response(proxy, url)
                         logger.error(
                             f"Ошибка сети: разрыв соединения или недоступность сервера. (error={error})"
                         )
@@ -220,13 +343,18 @@ class RequestManager(BaseRequestManager[ClientSession]):
                     logger.error(
                         f"Превышено время ожидание ответа, новая попытка (url={url}, method={method})"
                     )
+                    limiter.throttle()
                     if proxy:
-                        self.wrong_response(proxy)
+                        self.wrong_response(proxy, url)
 
                 finally:
-                    await self.sleep()
+                    if proxy:
+                        self.settle_proxy(proxy)
 
-            logger.error(f"Не удалось получить страницу за {self.max_retries} попыток")
+            if attempt < self.max_retries:
+                await self.backoff(url, attempt)
+
+        logger.error(f"Не удалось получить страницу за {self.max_retries} попыток")
 
     async def get(
         self, url: str, type: ReturnType, **kwargs: Unpack[_RequestOptions]
@@ -237,6 +365,3 @@ class RequestManager(BaseRequestManager[ClientSession]):
         self, url: str, type: ReturnType, **kwargs: Unpack[_RequestOptions]
     ) -> str | bytes | None:
         return await self.request("POST", url, type=type, **kwargs)
-
-    def _get_headers(self):
-        return self.headers.generate()
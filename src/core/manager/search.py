@@ -0,0 +1,212 @@
+import asyncio
+import time
+import unicodedata
+
+from sqlalchemy import ColumnElement, and_, case, func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
+from loguru import logger
+
+from ..entities.models import Manga
+
+
+TRIGRAM_INDEX = "idx_title_trgm"
+"""GIN индекс pg_trgm по lower(title), создаётся миграцией"""
+
+
+def normalize(value: str) -> str:
+    """Приводит название к виду для поиска: NFKC (полноширинные символы и т.п.) и casefold
+
+    Args:
+        value (str): Название или запрос
+
+    Returns:
+        str: Нормализованная строка
+    """
+    return unicodedata.normalize("NFKC", value).casefold()
+
+
+def rank(title: str, query: str) -> int:
+    """Релевантность названия: 2 - совпадает с запросом, 1 - начинается с запроса, 0 - содержит слова запроса
+
+    Args:
+        title (str): Нормализованное название
+        query (str): Нормализованный запрос
+
+    Returns:
+        int: Релевантность
+    """
+    if title == query:
+        return 2
+
+    return 1 if title.startswith(query) else 0
+
+
+def sql_search(query: str) -> tuple[ColumnElement[bool], ColumnElement[int]]:
+    """Условие и релевантность (как rank) поиска по названию в базе данных
+
+    Условие - `lower(title) LIKE '%слово%'` для каждого слова запроса,
+    с pg_trgm такой LIKE идёт по индексу TRIGRAM_INDEX.
+
+    Args:
+        query (str): Запрос
+
+    Returns:
+        tuple[ColumnElement[bool], ColumnElement[int]]: Условие WHERE и релевантность
+    """
+    query = " ".join(query.lower().split())
+    title = func.lower(Manga.title)
+    condition = and_(
+        *(title.like(f"%{_escape(x)}%", escape="/") for x in query.split())
+    )
+    relevance = case(
+        (title == query, 2),
+        (title.like(f"{_escape(query)}%", escape="/"), 1),
+        else_=0,
+    )
+    return condition, relevance
+
+
+def _escape(value: str) -> str:
+    # Шаблон одним параметром, а не конкатенацией, чтобы план с индексом строился и для подготовленных запросов
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+class SearchIndex:
+    """
+    Поиск манги по названию.
+
+    На PostgreSQL с pg_trgm и индексом TRIGRAM_INDEX поиск выполняет база данных
+    (native). Иначе (SQLite, нет расширения) используется триграммный индекс
+    в памяти: для каждого слова запроса кандидаты - пересечение списков манги
+    по его триграммам, поэтому проверяется не весь каталог, а только кандидаты.
+
+    Индекс в памяти загружается при первом поиске, MangaManager дополняет его
+    при записи, раз в ttl секунд он перечитывается.
+    """
+
+    def __init__(self, engine: AsyncEngine, ttl: float = 600):
+        """
+        Инициализирует поиск.
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy для подключения к БД.
+            ttl (float, optional): Через сколько секунд индекс в памяти перечитывается. По умолчанию 600.
+        """
+        self._engine = engine
+        self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+        self.ttl = ttl
+
+        self._native: bool | None = None
+        self._titles: dict[int, str] = {}
+        self._trigrams: dict[str, set[int]] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def native(self) -> bool:
+        """
+        Выполняет ли поиск база данных (pg_trgm и индекс TRIGRAM_INDEX).
+
+        Returns:
+            bool: True - искать через sql_search, False - через find.
+        """
+        if self._native is None:
+            self._native = False
+            if self._engine.dialect.name == "postgresql":
+                async with self.Session() as session:
+                    self._native = bool(
+                        await session.scalar(
+                            text(
+                                "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+                            ).bindparams(name=TRIGRAM_INDEX)
+                        )
+                    )
+
+            logger.info(
+                f"Поиск по названию (mode={'pg_trgm' if self._native else 'memory'})"
+            )
+
+        return self._native
+
+    async def load(self) -> None:
+        """Загружает названия всей манги в индекс в памяти"""
+        async with self.Session() as session:
+            rows = (await session.execute(select(Manga.id, Manga.title))).tuples()
+
+            self._titles = {}
+            self._trigrams = {}
+            for id, title in rows:
+                self._index(id, title)
+
+        self._loaded_at = time.monotonic()
+        logger.debug(f"Загружен поисковый индекс (size={len(self._titles)})")
+
+    async def find(self, query: str) -> list[tuple[int, int]]:
+        """
+        Ищет мангу, название которой содержит все слова запроса.
+
+        Args:
+            query (str): Запрос.
+
+        Returns:
+            list[tuple[int, int]]: (релевантность, id) найденной манги, сначала релевантные и новые.
+        """
+        if self._stale():
+            async with self._lock:
+                if self._stale():
+                    await self.load()
+
+        query = " ".join(normalize(query).split())
+        words = query.split()
+
+        candidates: set[int] | None = None
+        for word in words:
+            postings = sorted(
+                (self._trigrams.get(x, set()) for x in self._grams(word)), key=len
+            )
+            for posting in postings:
+                candidates = (
+                    set(posting) if candidates is None else candidates & posting
+                )
+                if not candidates:
+                    return []
+
+        if candidates is None:
+            # Все слова короче триграммы
+            candidates = set(self._titles)
+
+        result = [
+            (rank(self._titles[id], query), id)
+            for id in candidates
+            if all(x in self._titles[id] for x in words)
+        ]
+        return sorted(result, reverse=True)
+
+    def add(self, id: int, title: str) -> None:
+        """
+        Добавляет или обновляет мангу в индексе в памяти. Пока индекс не загружен, ничего не делает.
+
+        Args:
+            id (int): id манги.
+            title (str): Название.
+        """
+        if self._loaded_at is None:
+            return
+
+        if id in self._titles:
+            for gram in self._grams(self._titles[id]):
+                self._trigrams[gram].discard(id)
+
+        self._index(id, title)
+
+    def _stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl
+
+    def _index(self, id: int, title: str) -> None:
+        title = normalize(title)
+        self._titles[id] = title
+        for gram in self._grams(title):
+            self._trigrams.setdefault(gram, set()).add(id)
+
+    @staticmethod
+    def _grams(value: str) -> set[str]:
+        return {value[i : i + 3] for i in range(len(value) - 2)}
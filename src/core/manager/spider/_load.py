@@ -6,6 +6,7 @@ from typing import Unpack, overload
 
 import aiohttp
 
+from bs4 import FeatureNotFound
 from loguru import logger
 
 from ...abstract.spider import BaseSpider
@@ -18,6 +19,7 @@ ERROR_SPIDER_NOT_FOUND = "Паук {spider} не найден. Пожалуйс
 WARNING_SPIDER_CLOUDFARE = (
     "Парсер {spider} использует CloudFare. Парсер будет пропущен при инициализации"
 )
+ERROR_SPIDER_PARSER = "Не удалось создать парсеры паука {spider}: движок для парсинга {features} не установлен."
 WARNING_SPIDER_BANNED = "Парсер {spider} указан как заблокированный. Парсер будет пропущен при инициализации"
 
 
@@ -92,6 +94,9 @@ def load_spiders(
     Returns:
         list[BaseSpider]: Инициализированные пауки.
 
+    Raises:
+        FeatureNotFound: Движок для парсинга не установлен, парсеры пауков создаются при загрузке.
+
     Warning:
         Если manager не будет указан функция run, перестанет работать.
     """
@@ -122,9 +127,19 @@ def load_spiders(
             logger.warning(WARNING_SPIDER_BANNED.format(spider=spider_name))
             continue
 
-        spider = spider_factory(
-            session=session, manager=manager, features=features, batch=batch, **kwargs
-        )
+        try:
+            spider = spider_factory(
+                session=session,
+                manager=manager,
+                features=features,
+                batch=batch,
+                **kwargs,
+            )
+        except FeatureNotFound:
+            logger.error(
+                ERROR_SPIDER_PARSER.format(spider=spider_name, features=features)
+            )
+            raise
 
         spiders.append(spider)
 
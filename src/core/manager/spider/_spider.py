@@ -6,6 +6,8 @@ from typing import overload, Unpack
 
 import aiohttp
 
+from loguru import logger
+
 from ._load import load_spiders
 from ._starter import SpiderStarter
 from ._status import SpiderStatus, SpiderStatusEnum
@@ -13,6 +15,7 @@ from ..manga import MangaManager
 from ..alert import AlertManager
 from ...abstract.request import BaseRequestManager, RequestItem
 from ...abstract.spider import BaseSpider
+from ...network import HostStats, PoolStats, ProxyStats
 
 
 class SpiderManager:
@@ -25,6 +28,7 @@ class SpiderManager:
         manager: MangaManager | None = None,
         features: str | None = None,
         batch: int | None = None,
+        shards: dict[str, int] | None = None,
     ) -> None:
         """Менеджер пауков, через него можно запустить парсинг со всех пауков, так-же получить статус каждого.
 
@@ -35,6 +39,7 @@ class SpiderManager:
             manager (MangaManager | None, optional): Менеджер манги. Обычное состояние None
             features (str | None, optional): Движок для парсинга. Обычное состояние None
             batch (int | None, optional): Размер пачки для парсинга. Обычное состояние None
+            shards (dict[str, int] | None, optional): На сколько частей делить страницы при полном сканировании, по названию паука. Обычное состояние None
 
         Returns:
             list[BaseSpider]: Инициализированные пауки.
@@ -52,6 +57,7 @@ class SpiderManager:
         manager: MangaManager | None = None,
         features: str | None = None,
         batch: int | None = None,
+        shards: dict[str, int] | None = None,
         **kwargs: Unpack[RequestItem],
     ) -> None:
         """Менеджер пауков, через него можно запустить парсинг со всех пауков, так-же получить статус каждого.
@@ -63,6 +69,7 @@ class SpiderManager:
             manager (MangaManager | None, optional): Менеджер манги. Обычное состояние None
             features (str | None, optional): Движок для парсинга. Обычное состояние None
             batch (int | None, optional): Размер пачки для парсинга. Обычное состояние None
+            shards (dict[str, int] | None, optional): На сколько частей делить страницы при полном сканировании, по названию паука. Обычное состояние None
 
         Returns:
             list[BaseSpider]: Инициализированные пауки.
@@ -79,6 +86,7 @@ class SpiderManager:
         manager: MangaManager | None = None,
         features: str | None = None,
         batch: int | None = None,
+        shards: dict[str, int] | None = None,
         **kwargs,
     ) -> None:
         """Менеджер пауков, через него можно запустить парсинг со всех пауков, так-же получить статус каждого.
@@ -90,6 +98,7 @@ class SpiderManager:
             manager (MangaManager | None, optional): Менеджер манги. Обычное состояние None
             features (str | None, optional): Движок для парсинга. Обычное состояние None
             batch (int | None, optional): Размер пачки для парсинга. Обычное состояние None
+            shards (dict[str, int] | None, optional): На сколько частей делить страницы при полном сканировании, по названию паука. Обычное состояние None
 
         Returns:
             list[BaseSpider]: Инициализированные пауки.
@@ -107,12 +116,15 @@ class SpiderManager:
         )
 
         self.alert = alert
+        self.shards = shards or {}
         self._manager = bool(manager)
         self._starter = SpiderStarter(self.spiders, self.alert)
 
     async def start_full_parsing(self) -> None:
         """Начинает полное сканирование, сайтов.
 
+        Пауки из `shards` проходят свои страницы несколькими частями одновременно.
+
         Raises:
             AttributeError: Если менеджер не был передан
         """
@@ -122,19 +134,24 @@ class SpiderManager:
                 "Менеджер не был передан. Убедитесь, что менеджер передан перед запуском парсинга."
             )
 
-        if all(x.status == SpiderStatusEnum.RUNNING for x in self.status):
+        if all(
+            self.starter.spiders[x] and self.starter.methods.get(x) != "head"
+            for x in self.spiders
+        ):
             await self.starter._alert(
                 "Все пауки уже запущены, перезапуск не требуется.", "info"
             )
             return
 
         for spider in self.spiders:
-            tasks.append(asyncio.create_task(self._starter.start_spider(spider)))
-        try:
-            await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
-        finally:
-            if not all(x.status == SpiderStatusEnum.NOT_RUNNING for x in self.status):
-                await asyncio.shield(self.stop_all_spider())
+            tasks.append(
+                asyncio.create_task(
+                    self._starter.start_spider(
+                        spider, shards=self.shards.get(spider.__class__.__name__, 1)
+                    )
+                )
+            )
+        await self._gather(tasks)
 
     async def update_full_parsing(self) -> None:
         """
@@ -161,11 +178,52 @@ class SpiderManager:
 
         for spider in self.spiders:
             tasks.append(asyncio.create_task(self._starter.update_spider(spider)))
+        await self._gather(tasks)
+
+    async def start_head_parsing(self) -> None:
+        """Начинает head-сканирование сайтов, только новая манга с первых страниц.
+
+        Запускаются только свободные пауки, паук, который уже работает (например полное сканирование), не трогается.
+        Начало и конец работы только пишутся в лог, без оповещений.
+
+        Raises:
+            AttributeError: Если менеджер не был передан
+        """
+        if not self._manager:
+            raise AttributeError(
+                "Менеджер не был передан. Убедитесь, что менеджер передан перед запуском парсинга."
+            )
+
+        spiders = [
+            spider
+            for spider in self.spiders
+            if self.get_spider_status(spider).status != SpiderStatusEnum.RUNNING
+        ]
+        if not spiders:
+            logger.info("Все пауки заняты, head-сканирование пропущено.")
+            return
+
+        tasks = [
+            asyncio.create_task(self._starter.head_spider(spider, alert=False))
+            for spider in spiders
+        ]
+        await self._gather(tasks)
+
+    @staticmethod
+    async def _gather(tasks: list[asyncio.Task[None]]) -> None:
+        """Ждёт запущенных пауков, при отмене останавливает только их.
+
+        Args:
+            tasks (list[asyncio.Task[None]]): Задачи запуска пауков.
+        """
         try:
             await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
-        finally:
-            if not all(x.status == SpiderStatusEnum.NOT_RUNNING for x in self.status):
-                await asyncio.shield(self.stop_all_spider())
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
+            raise
 
     async def stop_all_spider(self) -> None:
         """Останавливает все пауки."""
@@ -184,6 +242,31 @@ class SpiderManager:
             all_status.append(self.get_spider_status(spider))
         return all_status
 
+    @property
+    def http_managers(self) -> list[BaseRequestManager]:
+        """Возвращает уникальные менеджеры запросов всех пауков."""
+        managers: list[BaseRequestManager] = []
+        for spider in self.spiders:
+            if not any(spider.http.root is x for x in managers):
+                managers.append(spider.http.root)
+
+        return managers
+
+    @property
+    def host_stats(self) -> list[HostStats]:
+        """Возвращает нагрузку по хостам со всех менеджеров запросов."""
+        return [stats for http in self.http_managers for stats in http.host_stats]
+
+    @property
+    def proxy_stats(self) -> list[ProxyStats]:
+        """Возвращает здоровье прокси со всех менеджеров запросов."""
+        return [stats for http in self.http_managers for stats in http.proxy_stats]
+
+    @property
+    def pool_stats(self) -> list[PoolStats]:
+        """Возвращает состояние пулов соединений со всех менеджеров запросов."""
+        return [stats for http in self.http_managers for stats in http.pool_stats]
+
     @property
     def starter(self) -> SpiderStarter:
         """Возвращает стартер пауков
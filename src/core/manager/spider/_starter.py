@@ -23,6 +23,8 @@ class SpiderStarter:
         self.spiders: dict[BaseSpider, None | asyncio.Task[None]] = {
             spider: None for spider in spiders
         }
+        self.methods: dict[BaseSpider, str] = {}
+        """Каким методом запущен паук (`run`, `head`, ...), только для работающих пауков"""
 
     async def stop_spider(self, spider: str | BaseSpider | type[BaseSpider]) -> None:
         """Остановить работу паука
@@ -60,20 +62,37 @@ class SpiderStarter:
                 )
         finally:
             self.spiders[spider] = None
+            self.methods.pop(spider, None)
 
     async def start_spider(
-        self, spider: str | BaseSpider | type[BaseSpider], start_page: int | None = None
+        self,
+        spider: str | BaseSpider | type[BaseSpider],
+        start_page: int | None = None,
+        resume: bool = True,
+        shards: int = 1,
     ) -> None:
         """Начать работу паука.
 
         Args:
             spider (str | BaseSpider): Паук, либо название паука.
             start_page (int | None, optional): Параметр для выбора страницы для начало. Обычное состояние None
+            resume (bool, optional): Продолжить с сохранённого прогресса, если start_page не указан. Обычное состояние True
+            shards (int, optional): На сколько частей разделить страницы, части проходятся одновременно (прогресс не сохраняется). Обычное состояние 1
         """
+        if shards > 1:
+            await self._start_spider(
+                spider,
+                method="run_sharded",
+                start_page=start_page,
+                shards=shards,
+            )
+            return
+
         await self._start_spider(
             spider,
             method="run",
             start_page=start_page,
+            resume=resume,
         )
 
     async def update_spider(
@@ -95,18 +114,47 @@ class SpiderStarter:
             start_page=start_page,
         )
 
+    async def head_spider(
+        self,
+        spider: str | BaseSpider | type[BaseSpider],
+        start_page: int | None = None,
+        alert: bool = True,
+    ) -> None:
+        """Начать head-сканирование паука, только новая манга с первых страниц.
+
+        Полное сканирование, запущенное во время head-сканирования, останавливает его.
+
+        Args:
+            spider (str | BaseSpider | type[BaseSpider]): Паук, либо название паука.
+            start_page (int | None, optional): Параметр для выбора страницы для начало. Обычное состояние None
+            alert (bool, optional): Оповещать о начале и конце работы, иначе только лог. Обычное состояние True
+        """
+        await self._start_spider(
+            spider,
+            method="head",
+            start_page=start_page,
+            alert=alert,
+        )
+
     async def _start_spider(
         self,
         spider: str | BaseSpider | type[BaseSpider],
         method: str,
         start_page: int | None = None,
+        alert: bool = True,
+        **kwargs,
     ) -> None:
         """Внутренняя функция для запуска пауков
 
+        Если паук уже запущен, `update` останавливает его, остальные методы останавливают
+        только head-сканирование (полное сканирование важнее), иначе запуск пропускается.
+
         Args:
             spider (str | BaseSpider | type[BaseSpider]): Паук, либо название паука.
-            method (str): Метод запуска паука. Пример `run`, `update`
+            method (str): Метод запуска паука. Пример `run`, `run_sharded`, `update`, `head`
             start_page (int | None, optional): Параметр для выбора страницы для начало. Обычное состояние None
+            alert (bool, optional): Оповещать о начале и конце работы, иначе только лог. Обычное состояние True
+            **kwargs: Дополнительные параметры метода паука.
         """
         spider = self._get_spider(spider)
         if not hasattr(spider, method):
@@ -114,25 +162,32 @@ class SpiderStarter:
                 f"У паука {self._get_spider_name(spider)} нет метода {method}"
             )
 
-        if self.spiders[spider]:
-            if method == "run":
+        if running := self.spiders[spider]:
+            if method == "update" or (
+                method != "head" and self.methods.get(spider) == "head"
+            ):
+                await self.stop_spider(spider)
+                # Ждём, пока остановленный паук допишет и закроет свой pipeline
+                await asyncio.wait([running])
+
+            else:
                 await self._alert(
                     f"Паук {self._get_spider_name(spider)} уже запущен. Необходимо остановить его перед запуском.",
                     "warning",
                 )
                 return
 
-            elif method == "update":
-                await self.stop_spider(spider)
-
+        task: asyncio.Task[None] | None = None
         try:
-            await self._alert(
-                f"Паук {self._get_spider_name(spider)}, начал свою работу.", "info"
+            await self._notify(
+                f"Паук {self._get_spider_name(spider)}, начал свою работу.", alert
             )
-            self.spiders[spider] = asyncio.create_task(
-                getattr(spider, method)(start_page=start_page)
+            task = asyncio.create_task(
+                getattr(spider, method)(start_page=start_page, **kwargs)
             )
-            await self.spiders[spider]
+            self.spiders[spider] = task
+            self.methods[spider] = method
+            await task
 
         except FeatureNotFound:
             await self._alert(
@@ -147,14 +202,16 @@ class SpiderStarter:
             )
 
         finally:
-            if task := self.spiders[spider]:
-                if not task.done():
-                    task.cancel()
+            if task is not None and not task.done():
+                task.cancel()
 
-            self.spiders[spider] = None
-            await self._alert(
-                f"Паук {self._get_spider_name(spider)}, закончил свою работу.",
-                "info",
+            # Паука могли остановить и запустить заново, чужую задачу не трогаем
+            if self.spiders[spider] is task:
+                self.spiders[spider] = None
+                self.methods.pop(spider, None)
+
+            await self._notify(
+                f"Паук {self._get_spider_name(spider)}, закончил свою работу.", alert
             )
 
     def _get_spider(self, spider: str | BaseSpider | type[BaseSpider]) -> BaseSpider:
@@ -209,6 +266,19 @@ class SpiderStarter:
         else:
             logger.debug("Менеджер сообщение не передан.")
 
+    async def _notify(self, message: str, alert: bool) -> None:
+        """
+        Сообщение о начале или конце работы паука: оповещение, либо только лог.
+
+        Args:
+            message (str): Сообщение
+            alert (bool): Отправить оповещение
+        """
+        if alert:
+            await self._alert(message, "info")
+        else:
+            logger.info(message)
+
     @property
     def all_work(self) -> bool:
         return any(self.spiders.values())
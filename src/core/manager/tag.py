@@ -0,0 +1,201 @@
+import asyncio
+import time
+
+from typing import Iterable, TypedDict
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession, AsyncEngine
+from loguru import logger
+
+from ..entities.schemas import ObjectWithId
+from ..entities.models import Author, Genre, Language
+
+
+_TAGS = type[Genre] | type[Language] | type[Author]
+
+
+class TagCacheStats(TypedDict):
+    """Статистика кэша тегов"""
+
+    hits: int
+    """Имён найдено в кэше"""
+
+    misses: int
+    """Имён, за которыми пришлось идти в базу данных"""
+
+    hit_ratio: float
+    """Доля попаданий, 0 если обращений ещё не было"""
+
+    size: int
+    """Сколько тегов в кэше"""
+
+
+class TagCache:
+    """
+    Кэш тегов (жанры, авторы, языки): имя -> id.
+
+    Таблица тега загружается целиком при первом обращении, дальше имена
+    ищутся в памяти. Новые имена создаются через
+    `INSERT ... ON CONFLICT (name) DO NOTHING` по уникальному индексу,
+    поэтому несколько процессов могут создавать один тег одновременно.
+
+    Теги создаются в своей короткой транзакции, а не в транзакции манги:
+    откат записи манги не оставит в кэше id, которого нет в базе данных.
+    """
+
+    def __init__(self, engine: AsyncEngine, ttl: float = 300):
+        """
+        Инициализирует кэш тегов.
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy для подключения к БД.
+            ttl (float, optional): Через сколько секунд списки тегов (all) перечитываются из базы данных,
+                чтобы были видны теги, созданные другими процессами. По умолчанию 300.
+        """
+        self._engine = engine
+        self.Session: async_sessionmaker[AsyncSession] = async_sessionmaker(engine)
+        self.ttl = ttl
+
+        self._ids: dict[_TAGS, dict[str, int]] = {}
+        self._loaded_at: dict[_TAGS, float] = {}
+        self._lists: dict[_TAGS, list[ObjectWithId]] = {}
+        self._locks: dict[_TAGS, asyncio.Lock] = {
+            model: asyncio.Lock() for model in (Genre, Author, Language)
+        }
+
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self, *models: _TAGS) -> None:
+        """
+        Загружает таблицы тегов целиком.
+
+        Args:
+            *models (_TAGS): Модели тегов. По умолчанию все.
+        """
+        for model in models or (Genre, Language, Author):
+            async with self.Session() as session:
+                rows = await session.execute(select(model.name, model.id))
+                self._ids[model] = dict(rows.tuples().all())
+
+            self._loaded_at[model] = time.monotonic()
+            self._lists.pop(model, None)
+            logger.debug(
+                f"Загружен кэш тегов (table={model.__tablename__}, size={len(self._ids[model])})"
+            )
+
+    async def get_ids(self, model: _TAGS, names: Iterable[str]) -> dict[str, int]:
+        """
+        Возвращает id тегов, недостающие теги создаются.
+
+        Args:
+            model (_TAGS): Модель тега.
+            names (Iterable[str]): Имена тегов.
+
+        Returns:
+            dict[str, int]: Имя: id тега.
+        """
+        names = set(names)
+        if not names:
+            return {}
+
+        ids = await self._table(model)
+        missing = names - ids.keys()
+        self.hits += len(names) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            async with self._locks[model]:
+                # Пока ждали, теги мог создать другой вызов
+                if missing := missing - ids.keys():
+                    ids.update(await self._insert(model, missing))
+                    self._lists.pop(model, None)
+
+        return {name: ids[name] for name in names}
+
+    async def get_id(self, model: _TAGS, name: str) -> int:
+        """
+        Возвращает id тега, тег создаётся, если его нет.
+
+        Args:
+            model (_TAGS): Модель тега.
+            name (str): Имя тега.
+
+        Returns:
+            int: id тега.
+        """
+        return (await self.get_ids(model, [name]))[name]
+
+    async def all(self, model: _TAGS) -> list[ObjectWithId]:
+        """
+        Все теги, новые сначала.
+
+        Args:
+            model (_TAGS): Модель тега.
+
+        Returns:
+            list[ObjectWithId]: Обьекты с ID и названием.
+        """
+        if time.monotonic() - self._loaded_at.get(model, -self.ttl) >= self.ttl:
+            await self.load(model)
+
+        if model not in self._lists:
+            self._lists[model] = [
+                ObjectWithId(id=id, name=name)
+                for name, id in sorted(
+                    self._ids[model].items(), key=lambda x: x[1], reverse=True
+                )
+            ]
+
+        return self._lists[model]
+
+    def invalidate(self, *models: _TAGS) -> None:
+        """
+        Сбрасывает кэш, нужно вызывать после удаления или переименования тегов.
+
+        Args:
+            *models (_TAGS): Модели тегов. По умолчанию все.
+        """
+        for model in models or tuple(self._locks):
+            self._ids.pop(model, None)
+            self._loaded_at.pop(model, None)
+            self._lists.pop(model, None)
+
+    @property
+    def stats(self) -> TagCacheStats:
+        """Статистика кэша"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "size": sum(len(x) for x in self._ids.values()),
+        }
+
+    async def _table(self, model: _TAGS) -> dict[str, int]:
+        if model not in self._ids:
+            async with self._locks[model]:
+                if model not in self._ids:
+                    await self.load(model)
+
+        return self._ids[model]
+
+    async def _insert(self, model: _TAGS, names: set[str]) -> dict[str, int]:
+        """Создаёт теги, которых нет в базе данных, и возвращает id всех names"""
+        insert = (
+            postgresql.insert
+            if self._engine.dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        async with self.Session() as session:
+            async with session.begin():
+                await session.execute(
+                    insert(model)
+                    .values([{"name": name} for name in sorted(names)])
+                    .on_conflict_do_nothing(index_elements=[model.name])
+                )
+                rows = await session.execute(
+                    select(model.name, model.id).where(model.name.in_(names))
+                )
+                return dict(rows.tuples().all())
@@ -10,6 +10,7 @@ from sqlalchemy import pool
 
 from alembic import context
 from src.core.entities.models import Base
+from src.core.manager.search import TRIGRAM_INDEX
 from dotenv import load_dotenv
 
 load_dotenv("api.env")
@@ -29,6 +30,16 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Объекты, которые autogenerate сравнивает с моделями
+
+    Индекс TRIGRAM_INDEX создаётся миграцией только при наличии pg_trgm
+    и в моделях не описан, autogenerate не должен его удалять.
+    """
+    return not (type_ == "index" and name == TRIGRAM_INDEX)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -53,6 +64,7 @@ def run_migrations_offline() -> None:
         url=url,
         render_as_batch=True,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -78,7 +90,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,63 @@
+"""added unique tag names
+
+Revision ID: 4a8d2e6f1b37
+Revises: 9e4a1c7d3f52
+Create Date: 2026-10-17 21:05:43.118402
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4a8d2e6f1b37"
+down_revision: Union[str, Sequence[str], None] = "9e4a1c7d3f52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Таблица тегов: (таблица, колонка), которая на неё ссылается
+TAGS = {
+    "genres": ("genre_manga", "genre_id"),
+    "author": ("mangas", "author_id"),
+    "language": ("mangas", "language_id"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (ref_table, ref_column) in TAGS.items():
+        # Дубликаты имён сливаются в запись с наименьшим id
+        op.execute(
+            f"UPDATE {ref_table} SET {ref_column} = ("
+            f"SELECT MIN(t2.id) FROM {table} t1 JOIN {table} t2 ON t2.name = t1.name "
+            f"WHERE t1.id = {ref_table}.{ref_column}"
+            f") WHERE {ref_column} IS NOT NULL"
+        )
+        op.execute(
+            f"DELETE FROM {table} WHERE id NOT IN "
+            f"(SELECT MIN(id) FROM {table} GROUP BY name)"
+        )
+        op.create_index(f"uq_{table}_name", table, ["name"], unique=True)
+
+    # Манга, связанная с двумя написаниями одного жанра, после слияния связана
+    # с жанром дважды: остаётся одна связь
+    op.execute(
+        "DELETE FROM genre_manga WHERE id NOT IN "
+        "(SELECT MIN(id) FROM genre_manga GROUP BY manga_id, genre_id)"
+    )
+    op.create_index(
+        "uq_genre_manga_manga_id_genre_id",
+        "genre_manga",
+        ["manga_id", "genre_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_genre_manga_manga_id_genre_id", table_name="genre_manga")
+    for table in TAGS:
+        op.drop_index(f"uq_{table}_name", table_name=table)
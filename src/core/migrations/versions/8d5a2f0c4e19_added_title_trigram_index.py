@@ -0,0 +1,55 @@
+"""added title trigram index
+
+Revision ID: 8d5a2f0c4e19
+Revises: 6c1f3b9d7e24
+Create Date: 2026-10-17 23:41:27.830512
+
+"""
+
+import logging
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d5a2f0c4e19"
+down_revision: Union[str, Sequence[str], None] = "6c1f3b9d7e24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        logger.info(
+            f"Индекс idx_title_trgm пропущен, поиск будет работать через индекс в памяти (dialect={bind.dialect.name})"
+        )
+        return
+
+    try:
+        with bind.begin_nested():
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except sa.exc.DBAPIError as error:
+        logger.warning(
+            f"Расширение pg_trgm недоступно, поиск будет работать через индекс в памяти (message={error})"
+        )
+        return
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_title_trgm ON mangas "
+        "USING gin (lower(title) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS idx_title_trgm")
@@ -0,0 +1,52 @@
+"""Сетевой слой для менеджера запросов: лимиты по хостам, стратегии задержек, объединение запросов, кэш и т п."""
+
+from .cache import MB, CacheStats, ResponseCache
+from .cassette import RECORD_MODE, Cassette
+from .connector import ConnectionPool, ConnectorConfig, PoolStats
+from .flight import SingleFlight
+from .headers import HeaderPool, create_profile
+from .limiter import (
+    HostLimit,
+    HostLimiter,
+    HostScheduler,
+    HostStats,
+    get_host,
+    parse_retry_after,
+)
+from .proxy import ProxyPool, ProxyStats
+from .pacing import (
+    PACING,
+    BasePacing,
+    FixedPacing,
+    JitterPacing,
+    AdaptivePacing,
+    create_pacing,
+)
+
+__all__ = [
+    "HostLimit",
+    "HostLimiter",
+    "HostScheduler",
+    "HostStats",
+    "get_host",
+    "parse_retry_after",
+    "PACING",
+    "BasePacing",
+    "FixedPacing",
+    "JitterPacing",
+    "AdaptivePacing",
+    "create_pacing",
+    "SingleFlight",
+    "MB",
+    "CacheStats",
+    "ResponseCache",
+    "ProxyPool",
+    "ProxyStats",
+    "HeaderPool",
+    "create_profile",
+    "RECORD_MODE",
+    "Cassette",
+    "ConnectionPool",
+    "ConnectorConfig",
+    "PoolStats",
+]
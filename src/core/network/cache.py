@@ -0,0 +1,338 @@
+"""Кэш ответов, ограниченный по байтам.
+
+Два уровня: память (LRU + TTL) и необязательный диск, который переживает
+перезапуск приложения.
+
+Устаревшие записи с валидаторами (ETag, Last-Modified) не удаляются сразу:
+по ним выполняется условный запрос, и при ответе 304 запись продлевается.
+"""
+
+import asyncio
+import os
+import pickle
+import sys
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, TypedDict
+
+from loguru import logger
+
+
+MB = 1024 * 1024
+
+
+class CacheStats(TypedDict):
+    """Статистика кэша"""
+
+    hits: int
+    """Попадания в память"""
+
+    disk_hits: int
+    """Попадания на диск"""
+
+    misses: int
+    """Промахи"""
+
+    evictions: int
+    """Сколько записей было вытеснено"""
+
+    revalidated: int
+    """Сколько устаревших записей продлено после ответа 304"""
+
+    memory_items: int
+    """Количество записей в памяти"""
+
+    memory_bytes: int
+    """Занятый объём памяти в байтах"""
+
+    disk_items: int
+    """Количество записей на диске"""
+
+    disk_bytes: int
+    """Занятый объём диска в байтах"""
+
+
+class CacheEntry:
+    """Запись кэша"""
+
+    __slots__ = ("value", "size", "expires", "validators")
+
+    def __init__(
+        self,
+        value: Any,
+        size: int,
+        expires: float,
+        validators: dict[str, str] | None = None,
+    ):
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.validators = validators
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires
+
+
+def sizeof(value: Any) -> int:
+    """Примерный размер значения в байтах
+
+    Args:
+        value (Any): Значение
+
+    Returns:
+        int: Размер в байтах
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+
+    return len(pickle.dumps(value))
+
+
+class ResponseCache:
+    """Кэш ответов с ограничением по байтам, вытеснением LRU и временем жизни."""
+
+    SUFFIX = ".cache"
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        directory: str | None = None,
+        disk_maxsize: int | None = None,
+    ):
+        """Инициализация кэша
+
+        Args:
+            maxsize (int): Максимальный размер кэша в памяти (в байтах).
+            ttl (float): Время жизни записи (в секундах).
+            directory (str | None, optional): Папка для хранения кэша на диске. None - только память.
+            disk_maxsize (int | None, optional): Максимальный размер кэша на диске (в байтах). По умолчанию maxsize * 4.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = Path(directory) if directory else None
+        self.disk_maxsize = disk_maxsize or maxsize * 4
+
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._memory_bytes = 0
+
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._revalidated = 0
+
+        if self.directory is not None:
+            self._load_disk_index()
+
+    async def get(self, key: str) -> Any | None:
+        """Получить значение из кэша
+
+        Args:
+            key (str): Ключ
+
+        Returns:
+            Any | None: Значение, либо None если записи нет или она устарела
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            if not entry.expired:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return entry.value
+
+            if entry.validators is None:
+                self._pop_memory(key)
+
+        if key in self._disk:
+            entry = await asyncio.to_thread(self._read_file, key)
+            if entry is None or (entry.expired and entry.validators is None):
+                self._remove_disk(key)
+            elif not entry.expired:
+                self._disk.move_to_end(key)
+                self._disk_hits += 1
+                self._put_memory(key, entry)
+                return entry.value
+
+        self._misses += 1
+        return None
+
+    async def get_stale(self, key: str) -> CacheEntry | None:
+        """Получить запись с валидаторами, даже если она устарела
+
+        Args:
+            key (str): Ключ
+
+        Returns:
+            CacheEntry | None: Запись, либо None если записи нет или у неё нет валидаторов
+        """
+        entry = self._memory.get(key)
+        if entry is None and key in self._disk:
+            entry = await asyncio.to_thread(self._read_file, key)
+
+        if entry is None or not entry.validators:
+            return None
+
+        return entry
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        """Сохранить значение в кэш
+
+        Args:
+            key (str): Ключ
+            value (Any): Значение
+            ttl (float | None, optional): Время жизни записи. По умолчанию ttl кэша.
+            validators (dict[str, str] | None, optional): Заголовки ETag и Last-Modified ответа.
+        """
+        entry = CacheEntry(
+            value, sizeof(value), time.time() + (ttl or self.ttl), validators or None
+        )
+        self._put_memory(key, entry)
+
+        if self.directory is not None:
+            size = await asyncio.to_thread(self._write_file, key, entry)
+            if size is not None:
+                self._disk_bytes -= self._disk.pop(key, 0)
+                self._disk[key] = size
+                self._disk_bytes += size
+                self._evict_disk()
+
+    async def refresh(self, key: str, entry: CacheEntry) -> None:
+        """Продлить устаревшую запись после ответа 304
+
+        Args:
+            key (str): Ключ
+            entry (CacheEntry): Запись, полученная из get_stale
+        """
+        self._revalidated += 1
+        await self.set(key, entry.value, validators=entry.validators)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._memory.get(key)
+        if entry is not None and not entry.expired:
+            return True
+
+        return key in self._disk
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def clear(self) -> None:
+        """Очистить кэш в памяти и на диске."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+        for key in list(self._disk):
+            self._remove_disk(key)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Счётчики попаданий, промахов и вытеснений"""
+        return {
+            "hits": self._hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "revalidated": self._revalidated,
+            "memory_items": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_items": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _put_memory(self, key: str, entry: CacheEntry) -> None:
+        self._pop_memory(key)
+        if entry.size > self.maxsize:
+            logger.debug(
+                f"Запись больше размера кэша, в память не сохраняется (key={key}, size={entry.size})"
+            )
+            return
+
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+
+        while self._memory_bytes > self.maxsize:
+            old_key, old = self._memory.popitem(last=False)
+            self._memory_bytes -= old.size
+            self._evictions += 1
+            logger.debug(f"Запись вытеснена из памяти (key={old_key})")
+
+    def _pop_memory(self, key: str) -> None:
+        if (entry := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= entry.size
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.SUFFIX}"
+
+    def _load_disk_index(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = sorted(
+            (x for x in os.scandir(self.directory) if x.name.endswith(self.SUFFIX)),
+            key=lambda x: x.stat().st_mtime,
+        )
+        for file in files:
+            size = file.stat().st_size
+            self._disk[file.name.removesuffix(self.SUFFIX)] = size
+            self._disk_bytes += size
+
+        logger.debug(
+            f"Загружен кэш с диска (items={len(self._disk)}, bytes={self._disk_bytes})"
+        )
+        self._evict_disk()
+
+    def _read_file(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                expires, value, *validators = pickle.load(file)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            logger.warning(f"Не удалось прочитать кэш с диска (key={key})")
+            return None
+
+        return CacheEntry(
+            value, sizeof(value), expires, validators[0] if validators else None
+        )
+
+    def _write_file(self, key: str, entry: CacheEntry) -> int | None:
+        data = pickle.dumps((entry.expires, entry.value, entry.validators))
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as error:
+            logger.warning(
+                f"Не удалось сохранить кэш на диск (key={key}, error={error})"
+            )
+            return None
+
+        return len(data)
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.disk_maxsize and self._disk:
+            key = next(iter(self._disk))
+            self._remove_disk(key)
+            self._evictions += 1
+
+    def _remove_disk(self, key: str) -> None:
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            self._path(key).unlink(missing_ok=True)
+        except OSError:
+            logger.warning(f"Не удалось удалить кэш с диска (key={key})")
@@ -0,0 +1,114 @@
+"""Запись и воспроизведение ответов (cassette).
+
+В режиме записи каждый ответ сохраняется в файл SQLite (тело сжато zlib),
+в режиме воспроизведения ответы берутся из файла без обращения к сети,
+с искусственной задержкой. Это позволяет измерять скорость парсинга и записи
+в базу данных без доноров.
+"""
+
+import asyncio
+import pickle
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+from pathlib import Path
+from typing import Any, Literal, TypeAlias
+
+from loguru import logger
+
+
+RECORD_MODE: TypeAlias = Literal["off", "record", "replay"]
+
+
+class Cassette:
+    """Хранилище записанных ответов."""
+
+    def __init__(self, path: str):
+        """Инициализация хранилища
+
+        Args:
+            path (str): Путь к файлу SQLite, будет создан если его нет.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, method TEXT, url TEXT, body BLOB, created REAL)"
+        )
+        self._connection.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self._recorded: set[str] = set()
+
+    async def record(self, key: str, method: str, url: str, value: Any) -> None:
+        """Сохранить ответ, повторно в рамках одного запуска ответ не записывается
+
+        Args:
+            key (str): Ключ запроса
+            method (str): Метод запроса
+            url (str): URL запроса
+            value (Any): Ответ, None - страница не получена
+        """
+        if key in self._recorded:
+            return
+
+        self._recorded.add(key)
+        body = zlib.compress(pickle.dumps(value))
+        await asyncio.to_thread(self._write, key, method.upper(), url, body)
+
+    async def replay(self, key: str, url: str, latency: float = 0) -> Any | None:
+        """Получить записанный ответ
+
+        Args:
+            key (str): Ключ запроса
+            url (str): URL запроса, для логов
+            latency (float, optional): Искусственная задержка, от latency/2 до latency*3/2 секунд.
+
+        Returns:
+            Any | None: Ответ, либо None если ответ не записан
+        """
+        if latency:
+            await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+
+        body = await asyncio.to_thread(self._read, key)
+        if body is None:
+            self.misses += 1
+            logger.warning(f"Ответ не записан (url={url})")
+            return None
+
+        self.hits += 1
+        return pickle.loads(zlib.decompress(body))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+    def close(self) -> None:
+        """Закрыть файл"""
+        with self._lock:
+            self._connection.close()
+
+    def _write(self, key: str, method: str, url: str, body: bytes) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, method, url, body, time.time()),
+            )
+            self._connection.commit()
+
+    def _read(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        return row[0] if row else None
@@ -0,0 +1,170 @@
+"""Пулы соединений aiohttp.
+
+Общий лимит соединений, лимит на хост, кэш DNS и время жизни keep-alive
+задаются в конфигурации. Счётчики созданных и переиспользованных соединений
+показывают, упирается ли скорость в постоянное открытие новых соединений.
+"""
+
+from types import SimpleNamespace
+from typing import TypedDict
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+)
+from loguru import logger
+from pydantic import BaseModel, Field
+
+
+class ConnectorConfig(BaseModel):
+    """Настройки пула соединений"""
+
+    limit: int = Field(100, ge=0)
+    """Общий лимит соединений, 0 - без ограничения."""
+
+    limit_per_host: int = Field(0, ge=0)
+    """Лимит соединений к одному хосту, 0 - без ограничения."""
+
+    ttl_dns_cache: int | None = Field(300, ge=0)
+    """Время жизни кэша DNS (в секундах), None - кэш без ограничения по времени."""
+
+    keepalive_timeout: float = Field(30, gt=0)
+    """Сколько секунд держать простаивающее соединение открытым."""
+
+    per_spider: bool = Field(False)
+    """Отдельный пул соединений для каждого паука."""
+
+
+class PoolStats(TypedDict):
+    """Статистика пула соединений"""
+
+    name: str
+    """Название пула"""
+
+    limit: int
+    """Общий лимит соединений"""
+
+    limit_per_host: int
+    """Лимит соединений к одному хосту"""
+
+    open: int
+    """Открытых соединений (занятые + простаивающие)"""
+
+    idle: int
+    """Простаивающих соединений, готовых к переиспользованию"""
+
+    acquiring: int
+    """Запросов, которые ждут свободное соединение"""
+
+    created: int
+    """Сколько соединений было создано"""
+
+    reused: int
+    """Сколько раз соединение было переиспользовано"""
+
+
+class ConnectionPool:
+    """Пул соединений со своим TCPConnector и сессией."""
+
+    def __init__(self, name: str, config: ConnectorConfig | None = None):
+        """Инициализация пула
+
+        Args:
+            name (str): Название пула
+            config (ConnectorConfig | None, optional): Настройки пула. По умолчанию ConnectorConfig().
+        """
+        self.name = name
+        self.config = config or ConnectorConfig()
+        self.session: ClientSession | None = None
+
+        self._connector: TCPConnector | None = None
+        self._created = 0
+        self._reused = 0
+        self._unreadable = False
+
+    def create_session(self) -> ClientSession:
+        """Создать сессию, вызывается внутри запущенного event loop
+
+        Returns:
+            ClientSession: Сессия с настроенным пулом соединений
+        """
+        if self.session is not None:
+            return self.session
+
+        trace = TraceConfig()
+        trace.on_connection_create_end.append(self._on_create)
+        trace.on_connection_reuseconn.append(self._on_reuse)
+
+        self._connector = TCPConnector(
+            limit=self.config.limit,
+            limit_per_host=self.config.limit_per_host,
+            ttl_dns_cache=self.config.ttl_dns_cache,
+            keepalive_timeout=self.config.keepalive_timeout,
+        )
+        self.session = ClientSession(connector=self._connector, trace_configs=[trace])
+        logger.debug(f"Создан пул соединений (name={self.name}, config={self.config})")
+        return self.session
+
+    async def close(self) -> None:
+        """Закрыть сессию и все соединения"""
+        if self.session is not None:
+            await self.session.close()
+
+    @property
+    def stats(self) -> PoolStats:
+        """Открытые, простаивающие и ожидающие соединения"""
+        idle, active, acquiring = self._connections()
+        return {
+            "name": self.name,
+            "limit": self.config.limit,
+            "limit_per_host": self.config.limit_per_host,
+            "open": idle + active,
+            "idle": idle,
+            "acquiring": acquiring,
+            "created": self._created,
+            "reused": self._reused,
+        }
+
+    def _connections(self) -> tuple[int, int, int]:
+        """Простаивающие, занятые и ожидающие соединения TCPConnector
+
+        Публичного API для этих чисел у aiohttp нет, поэтому читаются внутренние
+        поля коннектора. Если их нет (aiohttp изменился), возвращаются нули,
+        и об этом один раз пишется в лог.
+        """
+        connector = self._connector
+        if connector is None:
+            return 0, 0, 0
+
+        try:
+            idle = sum(len(x) for x in connector._conns.values())
+            active = len(connector._acquired)
+            acquiring = sum(len(x) for x in connector._waiters.values())
+        except (AttributeError, TypeError) as error:
+            if not self._unreadable:
+                self._unreadable = True
+                logger.warning(
+                    f"Состояние пула соединений недоступно, idle/open/acquiring будут равны 0 (name={self.name}, error={error!r})"
+                )
+            return 0, 0, 0
+
+        return idle, active, acquiring
+
+    async def _on_create(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionCreateEndParams,
+    ) -> None:
+        self._created += 1
+
+    async def _on_reuse(
+        self,
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceConnectionReuseconnParams,
+    ) -> None:
+        self._reused += 1
@@ -0,0 +1,71 @@
+"""Объединение одинаковых запросов (single-flight).
+
+Если одинаковый запрос уже выполняется, новые вызовы ждут его результат,
+а не идут в сеть повторно.
+"""
+
+import asyncio
+
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from loguru import logger
+
+
+_T = TypeVar("_T")
+
+
+class SingleFlight(Generic[_T]):
+    """Выполняет не более одного запроса на ключ одновременно."""
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task[_T]] = {}
+        self._waiters: dict[str, int] = {}
+        self.coalesced = 0
+        """Сколько вызовов получили результат чужого запроса"""
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[_T]]) -> _T:
+        """Выполнить запрос, либо дождаться уже выполняемого
+
+        Если все ожидающие отменены, общий запрос тоже отменяется.
+
+        Args:
+            key (str): Ключ запроса
+            factory (Callable[[], Awaitable[_T]]): Функция, которая создаёт запрос
+
+        Returns:
+            _T: Результат запроса
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._tasks[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Ожидание уже выполняемого запроса (key={key})")
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(key) == 1:
+                task.cancel()
+            raise
+        finally:
+            if key in self._waiters and self._tasks.get(key) is task:
+                self._waiters[key] -= 1
+
+    @property
+    def inflight(self) -> int:
+        """Количество выполняемых запросов"""
+        return len(self._tasks)
+
+    def _forget(self, key: str, task: asyncio.Task[_T]) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            del self._waiters[key]
+
+        if not task.cancelled():
+            # Исключение уже передано ожидающим, помечаем его как полученное
+            task.exception()
@@ -0,0 +1,88 @@
+"""Профили заголовков.
+
+Профили создаются один раз при запуске, у каждого постоянный User-Agent,
+Accept-Language и Accept-Encoding. Профиль закрепляется за парой (прокси, хост)
+и меняется только после бана, поэтому один "клиент" не меняет User-Agent
+от запроса к запросу.
+"""
+
+import random
+
+from typing import Callable
+
+from fake_headers import Headers
+from loguru import logger
+
+
+LANGUAGES = (
+    "en-US,en;q=0.9",
+    "en-GB,en;q=0.9",
+    "en-US,en;q=0.8,ja;q=0.6",
+    "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+    "de-DE,de;q=0.9,en;q=0.8",
+)
+
+
+def create_profile() -> dict[str, str]:
+    """Создать профиль заголовков
+
+    Returns:
+        dict[str, str]: Заголовки
+    """
+    return {
+        "User-Agent": Headers().generate()["User-Agent"],
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": random.choice(LANGUAGES),
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+
+
+class HeaderPool:
+    """Набор профилей заголовков, закреплённых за парой (прокси, хост)."""
+
+    def __init__(
+        self,
+        size: int = 16,
+        factory: Callable[[], dict[str, str]] = create_profile,
+    ):
+        """Инициализация набора профилей
+
+        Args:
+            size (int, optional): Количество профилей. По умолчанию 16.
+            factory (Callable[[], dict[str, str]], optional): Функция, которая создаёт профиль.
+        """
+        self.profiles = [factory() for _ in range(max(1, size))]
+        self._bound: dict[tuple[str | None, str], int] = {}
+
+    def get(self, proxy: str | None, host: str) -> dict[str, str]:
+        """Получить профиль для пары (прокси, хост), при первом обращении профиль выбирается случайно
+
+        Args:
+            proxy (str | None): Прокси, None - без прокси
+            host (str): Хост запроса
+
+        Returns:
+            dict[str, str]: Заголовки профиля
+        """
+        key = (proxy, host)
+        if key not in self._bound:
+            self._bound[key] = random.randrange(len(self.profiles))
+
+        return self.profiles[self._bound[key]]
+
+    def rotate(self, proxy: str | None, host: str) -> None:
+        """Сменить профиль для пары (прокси, хост) после бана
+
+        Args:
+            proxy (str | None): Прокси
+            host (str): Хост запроса
+        """
+        key = (proxy, host)
+        old = self._bound.get(key)
+        choices = [x for x in range(len(self.profiles)) if x != old] or [0]
+        self._bound[key] = random.choice(choices)
+        logger.debug(f"Сменён профиль заголовков (proxy={proxy}, host={host})")
+
+    def __len__(self) -> int:
+        return len(self.profiles)
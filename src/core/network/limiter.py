@@ -0,0 +1,464 @@
+"""Планировщик запросов по хостам.
+
+Каждый хост получает собственный лимит одновременных запросов и бюджет
+запросов в секунду (token bucket), поэтому медленный донор больше не занимает
+слоты, которые могли бы использовать остальные.
+
+Задержка "вежливости" выдерживается до того как занять слот: запросы к хосту
+расходятся по времени, но слот не простаивает пока запрос спит.
+
+Лимит одновременных запросов подстраивается сам (AIMD): растёт на единицу
+за "окно" удачных ответов и уменьшается вдвое при 429/503/таймаутах.
+Заголовок Retry-After приостанавливает запросы к хосту.
+"""
+
+import asyncio
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, TypedDict
+from urllib.parse import urlparse
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from .pacing import BasePacing
+
+
+class HostLimit(BaseModel):
+    """Ограничения для одного хоста"""
+
+    max_concurrent: int | None = Field(None, ge=1)
+    """Максимальное количество одновременных запросов к хосту."""
+
+    rps: float | None = Field(None, gt=0)
+    """Максимальное количество запросов в секунду. None - без ограничения."""
+
+    burst: int | None = Field(None, ge=1)
+    """Размер "ведра" токенов, сколько запросов можно сделать подряд без ожидания."""
+
+    max_limit: int | None = Field(None, ge=1)
+    """Потолок для адаптивного лимита одновременных запросов."""
+
+
+class HostStats(TypedDict):
+    """Статистика хоста в реальном времени"""
+
+    host: str
+    """Хост"""
+
+    max_concurrent: int
+    """Текущий лимит одновременных запросов"""
+
+    max_limit: int
+    """Потолок адаптивного лимита"""
+
+    rps: float | None
+    """Бюджет запросов в секунду"""
+
+    active: int
+    """Количество запросов, которые выполняются прямо сейчас"""
+
+    queue: int
+    """Глубина очереди, сколько запросов ожидают слот"""
+
+    total: int
+    """Общее количество выданных слотов"""
+
+    wait_avg: float
+    """Среднее время ожидания слота (в секундах)"""
+
+    wait_max: float
+    """Максимальное время ожидания слота (в секундах)"""
+
+    throttled: int
+    """Сколько раз хост ограничивал нас (429/503/таймаут)"""
+
+    paused: float
+    """Сколько секунд осталось до конца паузы по Retry-After"""
+
+
+def get_host(url: str) -> str:
+    """Получить хост из URL
+
+    Args:
+        url (str): URL, либо уже хост
+
+    Returns:
+        str: Хост в нижнем регистре
+    """
+    url = str(url)
+    if "//" not in url:
+        return url.lower()
+
+    return urlparse(url).netloc.lower()
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Разобрать заголовок Retry-After
+
+    Args:
+        value (str | None): Значение заголовка, секунды либо HTTP-дата
+
+    Returns:
+        float | None: Сколько секунд ждать, либо None если заголовок не указан или некорректен
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostLimiter:
+    """Ограничитель запросов для одного хоста: очередь слотов + token bucket."""
+
+    DECREASE: float = 0.5
+    """Во сколько раз уменьшается лимит при ограничении со стороны хоста"""
+
+    COOLDOWN: float = 1
+    """Не уменьшать лимит чаще, чем раз в COOLDOWN секунд: одна волна ошибок - одно уменьшение"""
+
+    def __init__(
+        self,
+        host: str,
+        max_concurrent: int,
+        rps: float | None = None,
+        burst: int | None = None,
+        pacing: BasePacing | None = None,
+        max_limit: int | None = None,
+    ):
+        """Инициализация ограничителя
+
+        Args:
+            host (str): Хост
+            max_concurrent (int): Начальное количество одновременных запросов
+            rps (float | None, optional): Запросов в секунду. По умолчанию None.
+            burst (int | None, optional): Размер ведра токенов. По умолчанию 1.
+            pacing (BasePacing | None, optional): Стратегия задержек. По умолчанию без задержек.
+            max_limit (int | None, optional): Потолок адаптивного лимита. None - лимит не меняется.
+        """
+        self.host = host
+        self.max_concurrent = max_concurrent
+        self.rps = rps
+        self.burst = burst or 1
+        self.pacing = pacing
+        self.max_limit = max(max_limit, max_concurrent) if max_limit else None
+
+        self._limit = float(max_concurrent)
+        self._configured = max_concurrent
+        self._cut_at = 0.0
+        self._paused_until = 0.0
+        self._throttled = 0
+
+        self._next = 0.0
+
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+        self._total = 0
+        self._wait_sum = 0.0
+        self._wait_max = 0.0
+
+    async def acquire(self) -> None:
+        """Ожидает свободный слот и токен для запроса."""
+        start = time.monotonic()
+        await self._acquire_slot()
+        try:
+            await self._take_token()
+        except BaseException:
+            self.release()
+            raise
+
+        wait = time.monotonic() - start
+        self._total += 1
+        self._wait_sum += wait
+        self._wait_max = max(self._wait_max, wait)
+
+    async def pace(self) -> None:
+        """Выдерживает задержку вежливости, не занимая слот.
+
+        Задержка стратегии делится между слотами: к хосту уходит не более
+        заданного в настройках max_concurrent запросов за время задержки, независимо
+        от того сколько длится сам запрос. Адаптивный лимит на задержку не влияет,
+        иначе каждое его увеличение сокращало бы паузу между запросами.
+        """
+        now = time.monotonic()
+        start = max(now, self._paused_until)
+        if self.pacing is not None:
+            start = max(start, self._next)
+            self._next = start + self.pacing.interval() / self._configured
+
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    def success(self) -> None:
+        """Удачный ответ: лимит растёт на единицу за каждые max_concurrent удачных ответов."""
+        if self.pacing is not None:
+            self.pacing.success()
+
+        if self.max_limit is None or self._limit >= self.max_limit:
+            return
+
+        self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+        if int(self._limit) > self.max_concurrent:
+            self.max_concurrent = int(self._limit)
+            logger.debug(
+                f"Лимит хоста увеличен (host={self.host}, max_concurrent={self.max_concurrent})"
+            )
+            self._wake()
+
+    def throttle(self, retry_after: float | None = None) -> None:
+        """Хост ограничивает нас (429/503/таймаут): лимит уменьшается вдвое
+
+        Args:
+            retry_after (float | None, optional): Значение Retry-After, на это время запросы к хосту приостанавливаются.
+        """
+        self._throttled += 1
+        now = time.monotonic()
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+            logger.warning(
+                f"Хост просит подождать (host={self.host}, retry_after={retry_after})"
+            )
+
+        if self.max_limit is None or now - self._cut_at < self.COOLDOWN:
+            return
+
+        self._cut_at = now
+        self._limit = max(1.0, self._limit * self.DECREASE)
+        self.max_concurrent = int(self._limit)
+        logger.warning(
+            f"Лимит хоста уменьшен (host={self.host}, max_concurrent={self.max_concurrent})"
+        )
+
+    @property
+    def paused(self) -> float:
+        """Сколько секунд осталось до конца паузы по Retry-After"""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def release(self) -> None:
+        """Освобождает слот."""
+        self._active -= 1
+        self._wake()
+
+    def update(
+        self,
+        max_concurrent: int | None = None,
+        rps: float | None = None,
+        burst: int | None = None,
+        max_limit: int | None = None,
+    ) -> None:
+        """Обновить лимиты хоста, ожидающие запросы сразу получают освободившиеся слоты
+
+        Args:
+            max_concurrent (int | None, optional): Новый лимит одновременных запросов.
+            rps (float | None, optional): Новый бюджет запросов в секунду.
+            burst (int | None, optional): Новый размер ведра токенов.
+            max_limit (int | None, optional): Новый потолок адаптивного лимита.
+        """
+        if max_concurrent is not None:
+            self.max_concurrent = max_concurrent
+            self._limit = float(max_concurrent)
+            self._configured = max_concurrent
+        if max_limit is not None and self.max_limit is not None:
+            self.max_limit = max_limit
+        if self.max_limit is not None:
+            self.max_limit = max(self.max_limit, self.max_concurrent)
+        if rps is not None:
+            self.rps = rps
+        if burst is not None:
+            self.burst = burst
+            self._tokens = min(self._tokens, float(burst))
+
+        self._wake()
+
+    @property
+    def stats(self) -> HostStats:
+        """Статистика хоста"""
+        return {
+            "host": self.host,
+            "max_concurrent": self.max_concurrent,
+            "max_limit": self.max_limit or self.max_concurrent,
+            "rps": self.rps,
+            "active": self._active,
+            "queue": sum(1 for x in self._waiters if not x.done()),
+            "total": self._total,
+            "wait_avg": self._wait_sum / self._total if self._total else 0.0,
+            "wait_max": self._wait_max,
+            "throttled": self._throttled,
+            "paused": self.paused,
+        }
+
+    async def _acquire_slot(self) -> None:
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Слот уже был выдан, возвращаем его следующему в очереди
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def _wake(self) -> None:
+        while self._waiters and self._active < self.max_concurrent:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+
+            self._active += 1
+            waiter.set_result(None)
+
+    async def _take_token(self) -> None:
+        while self.rps is not None:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rps
+            )
+            self._updated = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            await asyncio.sleep((1 - self._tokens) / self.rps)
+
+
+class HostScheduler:
+    """Планировщик, хранит ограничители для каждого хоста."""
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        rps: float | None = None,
+        limits: dict[str, HostLimit] | None = None,
+        pacing: BasePacing | None = None,
+        max_limit: int | None = None,
+    ):
+        """Инициализация планировщика
+
+        Args:
+            max_concurrent (int): Лимит одновременных запросов для хоста по умолчанию.
+            rps (float | None, optional): Бюджет запросов в секунду для хоста по умолчанию.
+            limits (dict[str, HostLimit] | None, optional): Лимиты из конфигурации. Имеют приоритет над лимитами пауков.
+            pacing (BasePacing | None, optional): Стратегия задержек, каждый хост получает свою копию.
+            max_limit (int | None, optional): Потолок адаптивного лимита по умолчанию. None - адаптивный лимит выключен.
+        """
+        self.max_concurrent = max_concurrent
+        self.rps = rps
+        self.pacing = pacing
+        self.max_limit = max_limit
+
+        self._limiters: dict[str, HostLimiter] = {}
+        self._configured: set[str] = set()
+
+        for host, limit in (limits or {}).items():
+            self.set_limit(host, HostLimit.model_validate(limit), override=True)
+            self._configured.add(get_host(host))
+
+    def set_limit(self, url: str, limit: HostLimit, override: bool = False) -> None:
+        """Указать лимиты для хоста
+
+        Args:
+            url (str): URL либо хост
+            limit (HostLimit): Лимиты
+            override (bool, optional): Перезаписать лимиты, указанные в конфигурации. По умолчанию False.
+        """
+        host = get_host(url)
+        if host in self._configured and not override:
+            logger.debug(
+                f"Лимиты хоста указаны в конфигурации, пропускаем (host={host})"
+            )
+            return
+
+        if host in self._limiters:
+            self._limiters[host].update(
+                limit.max_concurrent, limit.rps, limit.burst, limit.max_limit
+            )
+        else:
+            self._limiters[host] = HostLimiter(
+                host,
+                max_concurrent=limit.max_concurrent or self.max_concurrent,
+                rps=limit.rps or self.rps,
+                burst=limit.burst,
+                pacing=self._create_pacing(),
+                max_limit=self._max_limit(limit.max_limit),
+            )
+
+        logger.debug(f"Указаны лимиты для хоста (host={host}, limit={limit})")
+
+    def get(self, url: str) -> HostLimiter:
+        """Получить ограничитель хоста, если его нет он будет создан с лимитами по умолчанию
+
+        Args:
+            url (str): URL либо хост
+
+        Returns:
+            HostLimiter: Ограничитель хоста
+        """
+        host = get_host(url)
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(
+                host,
+                max_concurrent=self.max_concurrent,
+                rps=self.rps,
+                pacing=self._create_pacing(),
+                max_limit=self._max_limit(),
+            )
+
+        return self._limiters[host]
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostLimiter]:
+        """Занять слот у хоста на время запроса
+
+        Args:
+            url (str): URL запроса
+
+        Yields:
+            HostLimiter: Ограничитель хоста
+        """
+        limiter = self.get(url)
+        await limiter.acquire()
+        try:
+            yield limiter
+        finally:
+            limiter.release()
+
+    def _create_pacing(self) -> BasePacing | None:
+        return self.pacing.copy() if self.pacing is not None else None
+
+    def _max_limit(self, max_limit: int | None = None) -> int | None:
+        if self.max_limit is None:
+            return None
+
+        return max_limit or self.max_limit
+
+    @property
+    def stats(self) -> list[HostStats]:
+        """Статистика по всем хостам"""
+        return [limiter.stats for limiter in self._limiters.values()]
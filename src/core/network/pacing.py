@@ -0,0 +1,122 @@
+"""Стратегии задержек между запросами.
+
+Задержка "вежливости" выдерживается планировщиком хоста до того как занять слот,
+а после неудачных запросов выполняется экспоненциальный откат (backoff).
+"""
+
+import copy
+import random
+
+from abc import ABC, abstractmethod
+from typing import Literal, TypeAlias
+
+
+PACING: TypeAlias = Literal["fixed", "jitter", "adaptive"]
+
+
+class BasePacing(ABC):
+    """Базовая стратегия задержек."""
+
+    def __init__(self, delay: float, max_delay: float = 60):
+        """Инициализация стратегии
+
+        Args:
+            delay (float): Базовая задержка между запросами (в секундах).
+            max_delay (float, optional): Максимальная задержка отката. По умолчанию 60.
+        """
+        self.delay = delay
+        self.max_delay = max_delay
+
+    @abstractmethod
+    def interval(self) -> float:
+        """Задержка между запросами к хосту."""
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка после неудачной попытки
+
+        Args:
+            attempt (int): Номер неудачной попытки, начиная с 1.
+
+        Returns:
+            float: Время ожидания в секундах.
+        """
+        return min(self.max_delay, self.delay * 2 ** (attempt - 1))
+
+    def success(self) -> None:
+        """Вызывается после удачного запроса."""
+
+    def failure(self) -> None:
+        """Вызывается после неудачного запроса."""
+
+    def copy(self) -> "BasePacing":
+        """Копия стратегии для нового хоста, у каждого хоста своё состояние."""
+        return copy.copy(self)
+
+
+class FixedPacing(BasePacing):
+    """Фиксированная задержка."""
+
+    def interval(self) -> float:
+        return self.delay
+
+
+class JitterPacing(BasePacing):
+    """Случайная задержка от 0 до delay, откат с "полным джиттером"."""
+
+    def interval(self) -> float:
+        return self.delay * random.uniform(0, 1)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, super().backoff(attempt))
+
+
+class AdaptivePacing(BasePacing):
+    """Задержка растёт при ошибках и плавно возвращается к базовой при удачных запросах."""
+
+    INCREASE: float = 2
+    """Во сколько раз увеличивается задержка после ошибки"""
+
+    DECREASE: float = 0.9
+    """Во сколько раз уменьшается задержка после удачного запроса"""
+
+    def __init__(self, delay: float, max_delay: float = 60):
+        super().__init__(delay, max_delay)
+        self.current = delay
+
+    def interval(self) -> float:
+        return self.current
+
+    def success(self) -> None:
+        self.current = max(self.delay, self.current * self.DECREASE)
+
+    def failure(self) -> None:
+        self.current = min(self.max_delay, max(self.current, 0.1) * self.INCREASE)
+
+
+def create_pacing(
+    pacing: PACING | BasePacing, delay: float, max_delay: float = 60
+) -> BasePacing:
+    """Создаёт стратегию задержек по названию
+
+    Args:
+        pacing (PACING | BasePacing): Название стратегии, либо готовая стратегия.
+        delay (float): Базовая задержка.
+        max_delay (float, optional): Максимальная задержка отката. По умолчанию 60.
+
+    Raises:
+        KeyError: Неизвестная стратегия
+
+    Returns:
+        BasePacing: Стратегия задержек
+    """
+    if isinstance(pacing, BasePacing):
+        return pacing
+
+    if pacing == "fixed":
+        return FixedPacing(delay, max_delay)
+    elif pacing == "jitter":
+        return JitterPacing(delay, max_delay)
+    elif pacing == "adaptive":
+        return AdaptivePacing(delay, max_delay)
+
+    raise KeyError(f"Неизвестная стратегия задержек: {pacing}")
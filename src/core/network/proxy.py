@@ -0,0 +1,309 @@
+"""Пул прокси с оценкой "здоровья".
+
+Для каждого прокси считается скользящее среднее (EWMA) задержки, доли удачных
+запросов и скорости загрузки. Прокси выбирается случайно, но пропорционально
+здоровью, поэтому медленные выходы получают меньше попыток.
+
+Заблокированный прокси не удаляется навсегда, а попадает в карантин. По истечении
+карантина через него проходит один пробный запрос: при успехе прокси возвращается
+в пул, при ошибке карантин удваивается. Если пробный запрос закончился иначе
+(ответ 404, 5xx и т.п.), следующий запрос через прокси снова будет пробным.
+"""
+
+import random
+import time
+
+from typing import TypedDict
+
+from loguru import logger
+
+from ..entities.schemas import ProxySchema
+
+
+class ProxyStats(TypedDict):
+    """Статистика прокси"""
+
+    proxy: str
+    """Адрес прокси"""
+
+    available: bool
+    """Можно ли использовать прокси прямо сейчас"""
+
+    latency: float | None
+    """Средняя задержка ответа (в секундах)"""
+
+    success_rate: float
+    """Доля удачных запросов, от 0 до 1"""
+
+    speed: float | None
+    """Средняя скорость загрузки (байт в секунду)"""
+
+    weight: float
+    """Вес прокси при выборе"""
+
+    failures: int
+    """Неудачных запросов подряд"""
+
+    bans: int
+    """Сколько раз прокси попадал в карантин"""
+
+    quarantine: float
+    """Сколько секунд осталось до пробного запроса"""
+
+    hosts: list[str]
+    """Хосты, закреплённые за прокси"""
+
+
+class ProxyHealth:
+    """Состояние одного прокси"""
+
+    __slots__ = (
+        "latency",
+        "success_rate",
+        "speed",
+        "failures",
+        "bans",
+        "banned_until",
+        "probing",
+    )
+
+    def __init__(self):
+        self.latency: float | None = None
+        self.success_rate = 1.0
+        self.speed: float | None = None
+        self.failures = 0
+        self.bans = 0
+        self.banned_until = 0.0
+        self.probing = False
+
+    @property
+    def quarantined(self) -> bool:
+        return self.bans > 0 and self.banned_until > 0
+
+
+class ProxyPool:
+    """Выбор прокси пропорционально здоровью, карантин и закрепление за хостом."""
+
+    ALPHA: float = 0.3
+    """Вес нового значения в скользящем среднем"""
+
+    MIN_WEIGHT: float = 0.01
+    """Минимальный вес, чтобы плохой прокси иногда всё-таки выбирался"""
+
+    def __init__(
+        self,
+        proxies: list[ProxySchema],
+        max_chance: int = 3,
+        ban: bool = True,
+        quarantine: float = 300,
+        max_quarantine: float = 3600,
+    ):
+        """Инициализация пула
+
+        Args:
+            proxies (list[ProxySchema]): Прокси
+            max_chance (int, optional): Неудачных запросов подряд до карантина. По умолчанию 3.
+            ban (bool, optional): Отправлять ли прокси в карантин. По умолчанию True.
+            quarantine (float, optional): Время первого карантина (в секундах). По умолчанию 300.
+            max_quarantine (float, optional): Максимальное время карантина (в секундах). По умолчанию 3600.
+        """
+        self.max_chance = max_chance
+        self.ban_enabled = ban
+        self.quarantine = quarantine
+        self.max_quarantine = max_quarantine
+
+        self._health: dict[ProxySchema, ProxyHealth] = {
+            proxy: ProxyHealth() for proxy in proxies
+        }
+        self._pinned: dict[str, ProxySchema] = {}
+
+    def choose(self, host: str | None = None) -> ProxySchema | None:
+        """Выбрать прокси для запроса
+
+        Сначала выбирается прокси, закреплённый за хостом, затем прокси, у которого истёк
+        карантин (пробный запрос), иначе случайный прокси пропорционально весу.
+
+        Args:
+            host (str | None, optional): Хост запроса, для закрепления прокси.
+
+        Returns:
+            ProxySchema | None: Прокси или None, если прокси нет либо все в карантине
+        """
+        if not self._health:
+            return None
+
+        now = time.monotonic()
+        if host is not None and (proxy := self._pinned.get(host)) is not None:
+            if not self._health[proxy].quarantined:
+                return proxy
+
+            del self._pinned[host]
+
+        for proxy, health in self._health.items():
+            if health.quarantined and not health.probing and health.banned_until <= now:
+                logger.debug(f"Пробный запрос через прокси (proxy={proxy.proxy})")
+                health.probing = True
+                return proxy
+
+        candidates = [
+            proxy for proxy, health in self._health.items() if not health.quarantined
+        ]
+        if not candidates:
+            logger.debug("Больше нет рабочих прокси")
+            return None
+
+        weights = [self._weight(self._health[proxy]) for proxy in candidates]
+        return random.choices(candidates, weights)[0]
+
+    def success(
+        self,
+        proxy: ProxySchema,
+        latency: float,
+        size: int = 0,
+        host: str | None = None,
+    ) -> None:
+        """Отметить удачный запрос
+
+        Args:
+            proxy (ProxySchema): Прокси
+            latency (float): Время запроса (в секундах)
+            size (int, optional): Размер ответа (в байтах)
+            host (str | None, optional): Хост запроса, прокси будет закреплён за ним.
+        """
+        health = self._health.get(proxy)
+        if health is None:
+            return
+
+        if health.quarantined:
+            logger.info(f"Прокси снова работает (proxy={proxy.proxy})")
+            health.banned_until = 0
+            health.probing = False
+
+        health.failures = 0
+        health.latency = self._ewma(health.latency, latency)
+        health.success_rate = self._ewma(health.success_rate, 1.0)
+        if size and latency > 0:
+            health.speed = self._ewma(health.speed, size / latency)
+
+        if host is not None:
+            self._pinned.setdefault(host, proxy)
+
+    def failure(self, proxy: ProxySchema, host: str | None = None) -> None:
+        """Отметить неудачный запрос, после max_chance ошибок подряд прокси уходит в карантин
+
+        Args:
+            proxy (ProxySchema): Прокси
+            host (str | None, optional): Хост запроса, закрепление будет снято.
+        """
+        health = self._health.get(proxy)
+        if health is None:
+            return
+
+        logger.debug(f"Ошибка у прокси (proxy={proxy.proxy})")
+        health.failures += 1
+        health.success_rate = self._ewma(health.success_rate, 0.0)
+        self._unpin(proxy, host)
+
+        if health.probing or health.failures >= self.max_chance:
+            self.ban(proxy)
+
+    def settle(self, proxy: ProxySchema) -> None:
+        """Завершить запрос через прокси, вызывается после любого исхода запроса
+
+        Если это был пробный запрос и он не закончился ни success, ни failure
+        (например, ответ 404, 429 или 5xx), прокси снова ждёт пробного запроса.
+
+        Args:
+            proxy (ProxySchema): Прокси
+        """
+        health = self._health.get(proxy)
+        if health is not None and health.probing:
+            logger.debug(f"Пробный запрос не дал результата (proxy={proxy.proxy})")
+            health.probing = False
+
+    def ban(self, proxy: ProxySchema) -> None:
+        """Отправить прокси в карантин, каждый следующий карантин в два раза дольше
+
+        Args:
+            proxy (ProxySchema): Прокси
+        """
+        health = self._health.get(proxy)
+        if health is None:
+            return
+
+        self._unpin(proxy)
+        if not self.ban_enabled:
+            logger.debug(
+                f"Прокси (proxy={proxy.proxy}) не отвечает, но бан отключен, поэтому он будет использоваться дальше."
+            )
+            return
+
+        duration = min(self.max_quarantine, self.quarantine * 2**health.bans)
+        health.bans += 1
+        health.banned_until = time.monotonic() + duration
+        health.probing = False
+        health.failures = 0
+        logger.warning(
+            f"Прокси отправлен в карантин (proxy={proxy.proxy}, duration={duration})"
+        )
+
+    def is_available(self, proxy: ProxySchema) -> bool:
+        """Можно ли использовать прокси прямо сейчас
+
+        Args:
+            proxy (ProxySchema): Прокси
+
+        Returns:
+            bool: True, если прокси не в карантине
+        """
+        health = self._health.get(proxy)
+        return health is not None and not health.quarantined
+
+    @property
+    def stats(self) -> list[ProxyStats]:
+        """Статистика по всем прокси"""
+        now = time.monotonic()
+        return [
+            {
+                "proxy": proxy.proxy,
+                "available": not health.quarantined,
+                "latency": health.latency,
+                "success_rate": health.success_rate,
+                "speed": health.speed,
+                "weight": self._weight(health),
+                "failures": health.failures,
+                "bans": health.bans,
+                "quarantine": max(0.0, health.banned_until - now)
+                if health.quarantined
+                else 0.0,
+                "hosts": [
+                    host for host, pinned in self._pinned.items() if pinned == proxy
+                ],
+            }
+            for proxy, health in self._health.items()
+        ]
+
+    def __len__(self) -> int:
+        return len(self._health)
+
+    def __bool__(self) -> bool:
+        return bool(self._health)
+
+    def _weight(self, health: ProxyHealth) -> float:
+        latency = health.latency if health.latency is not None else self._avg_latency()
+        return max(self.MIN_WEIGHT, health.success_rate / max(latency, 0.05))
+
+    def _avg_latency(self) -> float:
+        known = [x.latency for x in self._health.values() if x.latency is not None]
+        return sum(known) / len(known) if known else 1.0
+
+    def _ewma(self, current: float | None, value: float) -> float:
+        if current is None:
+            return value
+
+        return current + self.ALPHA * (value - current)
+
+    def _unpin(self, proxy: ProxySchema, host: str | None = None) -> None:
+        for pinned_host in [x for x, y in self._pinned.items() if y == proxy]:
+            if host is None or pinned_host == host:
+                del self._pinned[pinned_host]
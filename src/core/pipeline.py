@@ -0,0 +1,276 @@
+"""Конвейер обработки (pipeline) с ограниченными очередями.
+
+Каждая стадия имеет свою очередь и свои обработчики (workers). Очереди ограничены
+по размеру, поэтому быстрая стадия ждёт медленную (backpressure), а сеть и база
+данных работают одновременно, а не по очереди.
+"""
+
+import asyncio
+
+from typing import Any, AsyncIterable, Awaitable, Callable, TypedDict
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+
+Emit = Callable[[Any], Awaitable[None]]
+"""Функция, которая передаёт результат в следующую стадию"""
+
+Handler = Callable[[Any, Emit], Awaitable[None]]
+"""Обработчик стадии, получает элемент (у стадии с batch - список элементов) и функцию emit, может вызвать emit сколько угодно раз"""
+
+OnDone = Callable[[int], Awaitable[None]]
+"""Вызывается с порядковым номером элемента источника, когда он и всё что из него получилось обработано без ошибок"""
+
+_STOP = object()
+
+
+class PipelineConfig(BaseModel):
+    """Настройки конвейера пауков"""
+
+    detail_workers: int | None = Field(None, ge=1)
+    """Сколько страниц манги загружается одновременно. None - размер пачки паука."""
+
+    write_workers: int = Field(2, ge=1)
+    """Сколько манги записывается в базу данных одновременно."""
+
+    write_batch: int = Field(20, ge=1)
+    """Сколько манги, ожидающей записи, записывается одним запросом."""
+
+    queue_size: int | None = Field(None, ge=1)
+    """Размер очереди между стадиями. None - два размера пачки паука."""
+
+
+class StageStats(TypedDict):
+    """Статистика стадии"""
+
+    name: str
+    """Название стадии"""
+
+    workers: int
+    """Количество обработчиков"""
+
+    queue: int
+    """Сколько элементов ждут в очереди"""
+
+    processed: int
+    """Сколько элементов обработано"""
+
+    errors: int
+    """Сколько элементов завершилось ошибкой"""
+
+
+class _Tracker:
+    """Следит, какие элементы источника обработаны полностью, вместе со всеми потомками."""
+
+    def __init__(self, on_done: OnDone | None):
+        self.on_done = on_done
+        self.opened = 0
+        self.watermark = 0
+        self.outstanding: dict[int, int] = {}
+        self._lock = asyncio.Lock()
+
+    def open(self) -> int:
+        token = self.opened
+        self.opened += 1
+        self.outstanding[token] = 1
+        return token
+
+    def add(self, token: int) -> None:
+        self.outstanding[token] += 1
+
+    async def release(self, token: int) -> None:
+        self.outstanding[token] -= 1
+        if self.outstanding[token]:
+            return
+
+        # Элементы отмечаются по порядку источника, поэтому on_done под блокировкой
+        async with self._lock:
+            while self.outstanding.get(self.watermark) == 0:
+                del self.outstanding[self.watermark]
+                done = self.watermark
+                self.watermark += 1
+                if self.on_done is not None:
+                    await self.on_done(done)
+
+
+class Stage:
+    """Стадия конвейера"""
+
+    def __init__(
+        self, name: str, handler: Handler, workers: int, maxsize: int, batch: int = 1
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.batch = batch
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(maxsize)
+        self.processed = 0
+        self.errors = 0
+
+    @property
+    def stats(self) -> StageStats:
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "queue": self.queue.qsize(),
+            "processed": self.processed,
+            "errors": self.errors,
+        }
+
+
+class Pipeline:
+    """Конвейер из стадий, соединённых ограниченными очередями."""
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 32,
+        fatal: tuple[type[Exception], ...] = (),
+    ):
+        """Инициализация конвейера
+
+        Args:
+            name (str): Название конвейера, для логов
+            maxsize (int, optional): Размер очереди по умолчанию. По умолчанию 32.
+            fatal (tuple[type[Exception], ...], optional): Ошибки, которые останавливают весь конвейер, остальные только логируются.
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.fatal = fatal
+        self.stages: list[Stage] = []
+
+    def stage(
+        self,
+        name: str,
+        handler: Handler,
+        workers: int = 1,
+        maxsize: int | None = None,
+        batch: int = 1,
+    ) -> "Pipeline":
+        """Добавить стадию
+
+        Args:
+            name (str): Название стадии
+            handler (Handler): Обработчик, ошибки обработчика логируются и не останавливают конвейер,
+                но элемент с ошибкой не считается обработанным (см. run, on_done)
+            workers (int, optional): Количество обработчиков. По умолчанию 1.
+            maxsize (int | None, optional): Размер входной очереди. По умолчанию размер конвейера.
+            batch (int, optional): Больше 1 - обработчик получает список из элементов, которые уже ждут
+                в очереди (не больше batch), сам конвейер их не ждёт. Такая стадия должна быть последней.
+                По умолчанию 1.
+
+        Returns:
+            Pipeline: Этот же конвейер
+
+        Raises:
+            ValueError: Стадия добавлена после стадии с batch
+        """
+        if self.stages and self.stages[-1].batch > 1:
+            raise ValueError("Стадия с batch должна быть последней")
+
+        self.stages.append(
+            Stage(name, handler, workers, maxsize or self.maxsize, batch)
+        )
+        return self
+
+    async def run(
+        self, source: AsyncIterable[Any], on_done: OnDone | None = None
+    ) -> list[StageStats]:
+        """Запустить конвейер, завершается когда источник закончился и все стадии обработали свои очереди
+
+        Args:
+            source (AsyncIterable[Any]): Источник элементов для первой стадии
+            on_done (OnDone | None, optional): Вызывается по порядку источника, когда элемент
+                источника и все элементы, полученные из него, обработаны. После ошибки обработчика
+                on_done больше не вызывается ни для этого элемента, ни для следующих (см. failed).
+
+        Raises:
+            Exception: Ошибка источника, либо fatal ошибка стадии
+
+        Returns:
+            list[StageStats]: Статистика стадий
+        """
+        if not self.stages:
+            raise ValueError("Конвейер не содержит стадий")
+
+        tracker = _Tracker(on_done)
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._feed(source, tracker))
+                for index, stage in enumerate(self.stages):
+                    group.create_task(self._run_stage(index, stage, tracker))
+        except* Exception as error:
+            # Остальные задачи уже отменены, пробрасываем исходную ошибку
+            raise error.exceptions[0]
+
+        logger.info(f"Конвейер завершён (name={self.name}, stats={self.stats})")
+        return self.stats
+
+    @property
+    def stats(self) -> list[StageStats]:
+        """Статистика стадий"""
+        return [stage.stats for stage in self.stages]
+
+    @property
+    def failed(self) -> bool:
+        """Завершился ли ошибкой хотя бы один обработчик"""
+        return any(stage.errors for stage in self.stages)
+
+    async def _feed(self, source: AsyncIterable[Any], tracker: _Tracker) -> None:
+        first = self.stages[0]
+        async for item in source:
+            await first.queue.put((tracker.open(), item))
+
+        for _ in range(first.workers):
+            await first.queue.put(_STOP)
+
+    async def _run_stage(self, index: int, stage: Stage, tracker: _Tracker) -> None:
+        following = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        await asyncio.gather(
+            *(self._worker(stage, following, tracker) for _ in range(stage.workers))
+        )
+
+        if following is not None:
+            for _ in range(following.workers):
+                await following.queue.put(_STOP)
+
+    async def _worker(
+        self, stage: Stage, following: Stage | None, tracker: _Tracker
+    ) -> None:
+        stop = False
+        while not stop and (entry := await stage.queue.get()) is not _STOP:
+            entries = [entry]
+            # Пачка собирается только из того, что уже в очереди
+            while len(entries) < stage.batch and not stage.queue.empty():
+                if (entry := stage.queue.get_nowait()) is _STOP:
+                    stop = True
+                    break
+
+                entries.append(entry)
+
+            tokens = [token for token, _ in entries]
+
+            async def emit(result: Any) -> None:
+                if following is not None:
+                    tracker.add(tokens[0])
+                    await following.queue.put((tokens[0], result))
+
+            item = [x for _, x in entries] if stage.batch > 1 else entries[0][1]
+            try:
+                await stage.handler(item, emit)
+                stage.processed += len(entries)
+            except self.fatal:
+                raise
+            except Exception as error:
+                stage.errors += len(entries)
+                logger.error(
+                    f"Ошибка в стадии конвейера (name={self.name}, stage={stage.name}, error={error!r})"
+                )
+                # Элемент с ошибкой не отмечается обработанным, on_done дальше не вызывается
+                continue
+
+            # При отмене элемент тоже не отмечается обработанным
+            for token in tokens:
+                await tracker.release(token)
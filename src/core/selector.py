@@ -0,0 +1,247 @@
+"""Скомпилированные CSS-селекторы для двух движков разбора.
+
+Селектор компилируется один раз: в шаблон soupsieve (движок bs4) и в XPath lxml
+(движок lxml). Парсер, написанный через Selector и функции get_text/get_attr,
+работает с обоими движками без изменений.
+"""
+
+import re
+
+from functools import cache
+from typing import Any, Literal, TypeAlias
+
+import soupsieve
+
+from bs4.element import Tag
+from lxml import etree
+
+
+BACKEND: TypeAlias = Literal["bs4", "lxml"]
+
+_COMPOUND = re.compile(
+    r"(?P<tag>\*|[a-zA-Z][\w-]*)?(?P<parts>(?:#[\w-]+|\.[\w-]+|\[[^\]]+\])*)"
+)
+_PART = re.compile(
+    r"#(?P<id>[\w-]+)"
+    r"|\.(?P<cls>[\w-]+)"
+    r"|\[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[\^$*~]?=)\s*"
+    r"(?:\"(?P<dq>[^\"]*)\"|'(?P<sq>[^']*)'|(?P<bare>[\w-]+)))?\s*\]"
+)
+_COMBINATOR = re.compile(r"\s*>\s*|\s+")
+
+
+def _has_word(attr: str, value: str) -> str:
+    return f'contains(concat(" ", normalize-space(@{attr}), " "), " {value} ")'
+
+
+def _predicate(part: re.Match[str]) -> str | None:
+    if part.group("id"):
+        return f'@id="{part.group("id")}"'
+
+    if part.group("cls"):
+        return _has_word("class", part.group("cls"))
+
+    attr, op = part.group("attr"), part.group("op")
+    if op is None:
+        return f"@{attr}"
+
+    value = next(x for x in part.group("dq", "sq", "bare") if x is not None)
+    if '"' in value:
+        return None
+
+    if op == "=":
+        return f'@{attr}="{value}"'
+
+    if op == "^=":
+        return f'starts-with(@{attr}, "{value}")'
+
+    if op == "$=":
+        return (
+            f'substring(@{attr}, string-length(@{attr}) - {len(value) - 1}) = "{value}"'
+        )
+
+    if op == "*=":
+        return f'contains(@{attr}, "{value}")'
+
+    return _has_word(attr, value)
+
+
+def css_to_xpath(css: str) -> str | None:
+    """Перевести простой CSS-селектор в XPath относительно элемента
+
+    Поддерживаются тег, #id, .class, [attr], [attr=|^=|$=|*=|~=value]
+    и комбинаторы "пробел" и ">". Остальное (":not", ",", "+" и т.д.) не переводится.
+
+    Args:
+        css (str): CSS-селектор
+
+    Returns:
+        str | None: XPath, либо None если селектор не поддерживается
+    """
+    css = css.strip()
+    position = 0
+    axis = "//"
+    steps: list[str] = []
+
+    while position < len(css):
+        compound = _COMPOUND.match(css, position)
+        if compound is None or compound.end() == position:
+            return None
+
+        parts = compound.group("parts")
+        matches = list(_PART.finditer(parts))
+        if "".join(x.group(0) for x in matches) != parts:
+            return None
+
+        predicates = [_predicate(x) for x in matches]
+        if None in predicates:
+            return None
+
+        tag = (compound.group("tag") or "*").lower()
+        steps.append(axis + tag + "".join(f"[{x}]" for x in predicates))
+
+        position = compound.end()
+        if position == len(css):
+            break
+
+        combinator = _COMBINATOR.match(css, position)
+        if combinator is None or combinator.end() == position:
+            return None
+
+        axis = "/" if ">" in combinator.group() else "//"
+        position = combinator.end()
+
+    return "." + "".join(steps) if steps else None
+
+
+class Selector:
+    """CSS-селектор, скомпилированный для bs4 и lxml."""
+
+    __slots__ = ("css", "_soup", "_xpath")
+
+    def __init__(self, css: str):
+        """Компиляция селектора
+
+        Args:
+            css (str): CSS-селектор
+        """
+        self.css = css
+        self._soup = soupsieve.compile(css)
+        xpath = css_to_xpath(css)
+        self._xpath = etree.XPath(xpath) if xpath else None
+
+    @property
+    def fast(self) -> bool:
+        """Есть ли XPath для движка lxml"""
+        return self._xpath is not None
+
+    def select(self, node: Any) -> list[Any]:
+        """Найти все элементы внутри node
+
+        Args:
+            node (Any): Tag (bs4) или элемент lxml
+
+        Returns:
+            list[Any]: Найденные элементы в порядке документа
+        """
+        if isinstance(node, Tag):
+            return self._soup.select(node)
+
+        return self._get_xpath()(node)
+
+    def select_one(self, node: Any) -> Any | None:
+        """Найти первый элемент внутри node
+
+        Args:
+            node (Any): Tag (bs4) или элемент lxml
+
+        Returns:
+            Any | None: Элемент, либо None
+        """
+        if isinstance(node, Tag):
+            return self._soup.select_one(node)
+
+        result = self._get_xpath()(node)
+        return result[0] if result else None
+
+    def _get_xpath(self) -> etree.XPath:
+        if self._xpath is None:
+            raise ValueError(f"Селектор не поддерживается движком lxml: {self.css}")
+
+        return self._xpath
+
+    def __repr__(self) -> str:
+        return f"Selector({self.css!r})"
+
+
+@cache
+def compile_selector(css: str) -> Selector:
+    """Скомпилировать селектор, одинаковые селекторы компилируются один раз
+
+    Args:
+        css (str): CSS-селектор
+
+    Returns:
+        Selector: Скомпилированный селектор
+    """
+    return Selector(css)
+
+
+def get_text(node: Any, strip: bool = True) -> str:
+    """Текст элемента, как Tag.get_text у bs4
+
+    Args:
+        node (Any): Tag (bs4) или элемент lxml
+        strip (bool, optional): Обрезать пробелы у каждой строки и пропускать пустые. По умолчанию True.
+
+    Returns:
+        str: Текст
+    """
+    if isinstance(node, Tag):
+        return node.get_text(strip=strip)
+
+    # etree.Element - только текст элементов, без комментариев
+    strings = node.itertext(etree.Element)
+    if strip:
+        return "".join(x.strip() for x in strings)
+
+    return "".join(strings)
+
+
+def get_attr(node: Any, name: str) -> str | None:
+    """Атрибут элемента
+
+    Args:
+        node (Any): Tag (bs4) или элемент lxml
+        name (str): Название атрибута
+
+    Returns:
+        str | None: Значение, либо None
+    """
+    value = node.get(name)
+    if isinstance(value, list):
+        # bs4 отдаёт class и подобные атрибуты списком
+        return " ".join(value)
+
+    return value
+
+
+def first_text(node: Any) -> str:
+    """Текст первого узла внутри элемента (Tag.next_element у bs4)
+
+    Args:
+        node (Any): Tag (bs4) или элемент lxml
+
+    Returns:
+        str: Текст первого узла, без пробелов по краям
+    """
+    if isinstance(node, Tag):
+        if node.next_element is None:
+            return ""
+
+        return node.next_element.get_text(strip=True)
+
+    if node.text is not None:
+        return node.text.strip()
+
+    return get_text(node[0]) if len(node) else ""
@@ -1,10 +1,13 @@
 import asyncio
+import base64
+import bisect
+import json
 import math
 
-from typing import Protocol, Literal, overload
+from typing import Awaitable, Callable, Protocol, Literal, overload
 
-from sqlalchemy import Select, select, func, desc
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import ColumnElement, Select, and_, or_, select, func, desc
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, selectinload
 from loguru import logger
 
 from ..entities.schemas import (
@@ -15,6 +18,7 @@ from ..entities.schemas import (
 )
 from ..entities.models import Genre, GenreManga, Language, Author, Manga
 from ..manager.manga import MangaManager
+from ..manager.search import sql_search
 from .._tools import logging
 
 
@@ -27,6 +31,48 @@ class HasManga(Protocol):
 _TAGS = type[Genre] | type[Language] | type[Author]
 
 
+def encode_cursor(key: int, rank: int | None = None) -> str:
+    """Курсор страницы: ключ (и релевантность при поиске) последней манги прошлой страницы
+
+    Args:
+        key (int): Ключ сортировки последней строки
+        rank (int | None, optional): Релевантность последней строки. По умолчанию None.
+
+    Returns:
+        str: Непрозрачный курсор
+    """
+    data = {"id": key} if rank is None else {"id": key, "rank": rank}
+    return (
+        base64.urlsafe_b64encode(json.dumps(data).encode("utf-8"))
+        .decode("ascii")
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """Релевантность и ключ из курсора encode_cursor
+
+    Args:
+        cursor (str): Курсор
+
+    Raises:
+        ValueError: Неверный курсор
+
+    Returns:
+        tuple[int, int]: Релевантность (0, если её нет) и ключ последней строки прошлой страницы
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        result = (data.get("rank", 0), data["id"])
+    except (ValueError, TypeError, KeyError, AttributeError) as error:
+        raise ValueError(f"Неверный курсор (cursor={cursor})") from error
+
+    if not all(isinstance(x, int) and not isinstance(x, bool) for x in result):
+        raise ValueError(f"Неверный курсор (cursor={cursor})")
+
+    return result
+
+
 class BaseService:
     def __init__(self, manager: MangaManager):
         self._manager = manager
@@ -81,7 +127,7 @@ class TagGetter:
         Returns:
             list[ObjectWithId]: Обьекты с ID и названием жанров
         """
-        return await self._get_items(Genre)
+        return await self.service.manager.tags.all(Genre)
 
     async def get_language(self) -> list[ObjectWithId]:
         """Получить все языки
@@ -89,8 +135,7 @@ class TagGetter:
         Returns:
             list[ObjectWithId]: Обьекты с ID и названием языков
         """
-
-        return await self._get_items(Language)
+        return await self.service.manager.tags.all(Language)
 
     async def get_authors(
         self, page: int, per_page: int | None = None
@@ -178,7 +223,7 @@ class FindService(BaseService):
 
     @logging
     async def get_pages(
-        self, page: int = 1, per_page: int | None = None
+        self, page: int = 1, per_page: int | None = None, cursor: str | None = None
     ) -> MangaFindResultSchema:
         """
         Получает список манги для указанной страницы.
@@ -186,245 +231,357 @@ class FindService(BaseService):
         Args:
             page (int): Номер страницы (начинается с 1).
             per_page (int | None): Количество манги на странице. По умолчанию — BASE_PER_PAGE.
+            cursor (str | None): Курсор следующей страницы (next_cursor прошлого ответа), если указан, page не учитывается.
 
         Raises:
             ValueError: Если номер страницы меньше 1.
             ValueError: Если количество манги на странице меньше 1.
+            ValueError: Если курсор неверный.
 
         Returns:
             list[BaseManga]: Список манги без детальной информации.
         """
         per_page = per_page if per_page is not None else self.BASE_PER_PAGE
 
-        self._number_biggest_zero(page)
-        self._number_biggest_zero(per_page)
-
-        base_query = select(Manga)
-        query = (
-            base_query.options(
-                joinedload(Manga.author),
-                joinedload(Manga.language),
-                selectinload(Manga.genres_connection).joinedload(GenreManga.genre),
-            )
-            .offset((page - 1) * (per_page))
-            .limit(per_page)
-            .order_by(desc(Manga.id))
-        )
-
-        manga, count = await asyncio.gather(
-            self._scalars_manga(query),
-            self._scalars_count(base_query),
-        )
-
-        return MangaFindResultSchema(
-            query="ALL MANGA",
-            success=True,
-            total=count,
-            response=manga,
-            page=math.ceil((count or 0) / per_page),
-            page_now=page,
+        return await self._get_page(
+            "ALL MANGA",
+            select(Manga),
+            Manga.id,
+            page,
+            per_page,
+            cursor,
+            lambda: self.manager.counts.total(),
         )
 
     @logging
     async def get_pages_by_genre(
-        self, genre_id: int, page: int = 1, per_page: int | None = None
+        self,
+        genre_id: int,
+        page: int = 1,
+        per_page: int | None = None,
+        cursor: str | None = None,
     ) -> MangaFindResultSchema:
         """
         Получает список страниц манги по жанру.
 
         Args:
             genre_id (int): ID жанра.
+            page (int): Номер страницы (начинается с 1).
+            per_page (int | None): Количество манги на странице. По умолчанию — BASE_PER_PAGE.
+            cursor (str | None): Курсор следующей страницы, если указан, page не учитывается.
 
         Returns:
-            list[BaseManga]: Список манги.
+            MangaFindResultSchema: Список манги и данные для следующей страницы.
 
         Raises:
             ValueError: Если номер страницы меньше 1.
             ValueError: Если количество манги на странице меньше 1.
+            ValueError: Если курсор неверный.
         """
         per_page = per_page if per_page is not None else self.BASE_PER_PAGE
 
-        self._number_biggest_zero(page)
-        self._number_biggest_zero(per_page)
-
         base_query = select(GenreManga).where(GenreManga.genre_id == genre_id)
-        query = (
-            base_query.options(
-                selectinload(GenreManga.manga).options(
-                    joinedload(Manga.genres_connection).joinedload(GenreManga.genre),
-                    joinedload(Manga.author),
-                    joinedload(Manga.language),
-                )
-            )
-            .offset((page - 1) * (per_page))
-            .limit(per_page)
-            .order_by(desc(GenreManga.id))
-        )
-
-        manga, count = await asyncio.gather(
-            self._scalars_manga(query),
-            self._scalars_count(base_query),
-        )
-
-        return MangaFindResultSchema(
-            query=f"FIND MANGA BY GENRE = {genre_id}",
-            success=True,
-            total=count,
-            response=manga,
-            page=math.ceil((count or 0) / per_page),
-            page_now=page,
+        return await self._get_page(
+            f"FIND MANGA BY GENRE = {genre_id}",
+            base_query,
+            GenreManga.id,
+            page,
+            per_page,
+            cursor,
+            lambda: self.manager.counts.total("genre", genre_id),
         )
 
     @logging
     async def get_pages_by_author(
-        self, author_id: int, page: int = 1, per_page: int | None = None
+        self,
+        author_id: int,
+        page: int = 1,
+        per_page: int | None = None,
+        cursor: str | None = None,
     ) -> MangaFindResultSchema:
         """
         Получает список страниц манги по автору.
 
         Args:
             author_id (int): ID автора.
+            page (int): Номер страницы (начинается с 1).
+            per_page (int | None): Количество манги на странице. По умолчанию — BASE_PER_PAGE.
+            cursor (str | None): Курсор следующей страницы, если указан, page не учитывается.
 
         Returns:
-            list[BaseManga]: Список манги.
+            MangaFindResultSchema: Список манги и данные для следующей страницы.
 
         Raises:
             ValueError: Если номер страницы меньше 1.
             ValueError: Если количество манги на странице меньше 1.
+            ValueError: Если курсор неверный.
         """
         per_page = per_page or self.BASE_PER_PAGE
 
-        self._number_biggest_zero(page)
-        self._number_biggest_zero(per_page)
-
         base_query = select(Manga).where(Manga.author_id == author_id)
-        query = (
-            base_query.options(
-                joinedload(Manga.author),
-                joinedload(Manga.language),
-                selectinload(Manga.genres_connection).joinedload(GenreManga.genre),
-            )
-            .offset((page - 1) * (per_page))
-            .limit(per_page)
-            .order_by(desc(Manga.id))
+        return await self._get_page(
+            f"FIND MANGA BY AUTHOR = {author_id}",
+            base_query,
+            Manga.id,
+            page,
+            per_page,
+            cursor,
+            lambda: self.manager.counts.total("author", author_id),
         )
 
-        manga, count = await asyncio.gather(
-            self._scalars_manga(query),
-            self._scalars_count(base_query),
-        )
+    @logging
+    async def get_pages_by_language(
+        self,
+        language_id: int,
+        page: int = 1,
+        per_page: int | None = None,
+        cursor: str | None = None,
+    ) -> MangaFindResultSchema:
+        """
+        Получает список страниц манги по языку.
 
-        return MangaFindResultSchema(
-            query=f"FIND MANGA BY AUTHOR = {author_id}",
-            success=True,
-            total=count,
-            response=manga,
-            page=math.ceil((count or 0) / per_page),
-            page_now=page,
+        Args:
+            language_id (int): ID языка.
+            page (int): Номер страницы (начинается с 1).
+            per_page (int | None): Количество манги на странице. По умолчанию — BASE_PER_PAGE.
+            cursor (str | None): Курсор следующей страницы, если указан, page не учитывается.
+
+        Returns:
+            MangaFindResultSchema: Список манги и данные для следующей страницы.
+
+        Raises:
+            ValueError: Если номер страницы меньше 1.
+            ValueError: Если количество манги на странице меньше 1.
+            ValueError: Если курсор неверный.
+        """
+        per_page = per_page or self.BASE_PER_PAGE
+
+        base_query = select(Manga).where(Manga.language_id == language_id)
+        return await self._get_page(
+            f"FIND MANGA BY LANGUAGE = {language_id}",
+            base_query,
+            Manga.id,
+            page,
+            per_page,
+            cursor,
+            lambda: self.manager.counts.total("language", language_id),
         )
 
     @logging
-    async def get_pages_by_language(
-        self, language_id: int, page: int = 1, per_page: int | None = None
+    async def get_pages_by_query(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int | None = None,
+        cursor: str | None = None,
     ) -> MangaFindResultSchema:
         """
-        Получает список страниц манги по языку.
+        Получает список страниц манги по названию.
 
         Args:
-            author_id (int): ID автора.
+            query (str): Текст запроса, ищется манга, название которой содержит все его слова.
+            page (int): Номер страницы (начинается с 1).
+            per_page (int | None): Количество манги на странице. По умолчанию — BASE_PER_PAGE.
+            cursor (str | None): Курсор следующей страницы, если указан, page не учитывается.
 
         Returns:
-            list[BaseManga]: Список манги.
+            MangaFindResultSchema: Список манги и данные для следующей страницы.
 
         Raises:
             ValueError: Если номер страницы меньше 1.
             ValueError: Если количество манги на странице меньше 1.
+            ValueError: Если курсор неверный.
+            ValueError: Если запрос пустой.
         """
         per_page = per_page or self.BASE_PER_PAGE
+        if not query or not query.split():
+            raise ValueError("Запрос не может быть пустым")
+
+        name = f"FIND MANGA BY QUERY = {query}"
+        search = self.manager.search
+        if not await search.native():
+            return await self._get_found_page(
+                name, await search.find(query), page, per_page, cursor
+            )
+
+        condition, relevance = sql_search(query)
+        base_query = select(Manga).where(condition)
+        return await self._get_page(
+            name,
+            base_query,
+            Manga.id,
+            page,
+            per_page,
+            cursor,
+            lambda: self.manager.counts.query(
+                query.lower(), lambda: self._scalars_count(base_query)
+            ),
+            relevance,
+        )
+
+    async def _get_page(
+        self,
+        name: str,
+        base_query: Select[tuple[Manga | GenreManga]],
+        key: InstrumentedAttribute[int],
+        page: int,
+        per_page: int,
+        cursor: str | None,
+        total: Callable[[], Awaitable[int]],
+        rank: ColumnElement[int] | None = None,
+    ) -> MangaFindResultSchema:
+        """Получает страницу манги, новые сначала (при поиске - сначала релевантные)
+
+        С курсором страница ищется по ключу (`WHERE key < :last ORDER BY key DESC`),
+        по индексу, и не зависит от того, насколько она далеко. Без курсора - OFFSET,
+        для совместимости.
+
+        Args:
+            name (str): Описание запроса для ответа
+            base_query (Select[tuple[Manga | GenreManga]]): Запрос без сортировки и пагинации
+            key (InstrumentedAttribute[int]): Уникальная колонка сортировки (id строки base_query)
+            page (int): Номер страницы, если нет курсора
+            per_page (int): Количество манги на странице
+            cursor (str | None): Курсор следующей страницы
+            total (Callable[[], Awaitable[int]]): Количество манги по base_query, из CountCache
+            rank (ColumnElement[int] | None, optional): Релевантность, сортировка по (rank, key). По умолчанию None.
 
+        Returns:
+            MangaFindResultSchema: Результат, next_cursor - курсор следующей страницы
+        """
         self._number_biggest_zero(page)
         self._number_biggest_zero(per_page)
 
-        base_query = select(Manga).where(Manga.language_id == language_id)
-        query = (
-            base_query.options(
+        if key is GenreManga.id:
+            options = [
+                selectinload(GenreManga.manga).options(
+                    joinedload(Manga.genres_connection).joinedload(GenreManga.genre),
+                    joinedload(Manga.author),
+                    joinedload(Manga.language),
+                )
+            ]
+        else:
+            options = [
                 joinedload(Manga.author),
                 joinedload(Manga.language),
                 selectinload(Manga.genres_connection).joinedload(GenreManga.genre),
+            ]
+
+        # Лишняя строка показывает, есть ли следующая страница
+        query = base_query.options(*options).order_by(desc(key)).limit(per_page + 1)
+        if rank is not None:
+            query = (
+                query.add_columns(rank).order_by(None).order_by(desc(rank), desc(key))
             )
-            .offset((page - 1) * (per_page))
-            .limit(per_page)
-            .order_by(desc(Manga.id))
-        )
 
-        manga, count = await asyncio.gather(
-            self._scalars_manga(query),
-            self._scalars_count(base_query),
+        if cursor is not None:
+            last_rank, last_key = decode_cursor(cursor)
+            if rank is None:
+                query = query.where(key < last_key)
+            else:
+                query = query.where(
+                    or_(rank < last_rank, and_(rank == last_rank, key < last_key))
+                )
+        else:
+            query = query.offset((page - 1) * (per_page))
+
+        (manga, last), count = await asyncio.gather(
+            self._scalars_page(query, per_page), total()
         )
 
         return MangaFindResultSchema(
-            query=f"FIND MANGA BY LANGUAGE = {language_id}",
+            query=name,
             success=True,
             total=count,
             response=manga,
             page=math.ceil((count or 0) / per_page),
-            page_now=page,
+            page_now=page if cursor is None else 0,
+            next_cursor=encode_cursor(*last) if last is not None else None,
         )
 
-    @logging
-    async def get_pages_by_query(
-        self, query: str, page: int = 1, per_page: int | None = None
+    async def _get_found_page(
+        self,
+        name: str,
+        found: list[tuple[int, int]],
+        page: int,
+        per_page: int,
+        cursor: str | None,
     ) -> MangaFindResultSchema:
-        """
-        Получает список страниц манги по названию.
+        """Получает страницу манги, найденной SearchIndex в памяти
 
         Args:
-            author_id (int): ID автора.
+            name (str): Описание запроса для ответа
+            found (list[tuple[int, int]]): (релевантность, id) манги, как возвращает SearchIndex.find
+            page (int): Номер страницы, если нет курсора
+            per_page (int): Количество манги на странице
+            cursor (str | None): Курсор следующей страницы
 
         Returns:
-            list[BaseManga]: Список манги.
-
-        Raises:
-            ValueError: Если номер страницы меньше 1.
-            ValueError: Если количество манги на странице меньше 1.
+            MangaFindResultSchema: Результат, next_cursor - курсор следующей страницы
         """
-        _find_query = query
-        per_page = per_page or self.BASE_PER_PAGE
-        if not query:
-            raise ValueError("Запрос не может быть пустым")
-
         self._number_biggest_zero(page)
         self._number_biggest_zero(per_page)
 
-        base_query = (
+        if cursor is not None:
+            last_rank, last_key = decode_cursor(cursor)
+            start = bisect.bisect_right(
+                found, (-last_rank, -last_key), key=lambda x: (-x[0], -x[1])
+            )
+        else:
+            start = (page - 1) * per_page
+
+        chunk = found[start : start + per_page]
+        ids = [id for _, id in chunk]
+        manga = await self._scalars_manga(
             select(Manga)
+            .where(Manga.id.in_(ids))
             .options(
                 joinedload(Manga.author),
                 joinedload(Manga.language),
                 selectinload(Manga.genres_connection).joinedload(GenreManga.genre),
             )
-            .where(func.lower(Manga.title).contains(query.lower()))
-        )
-        query = (
-            base_query.offset((page - 1) * (per_page))
-            .limit(per_page)
-            .order_by(desc(Manga.id))
-        )
-
-        manga, count = await asyncio.gather(
-            self._scalars_manga(query),
-            self._scalars_count(base_query),
         )
+        by_id = {x.id: x for x in manga}
 
+        last = chunk[-1] if start + per_page < len(found) else None
         return MangaFindResultSchema(
-            query=f"FIND MANGA BY QUERY = {_find_query}",
+            query=name,
             success=True,
-            total=count,
-            response=manga,
-            page=math.ceil((count or 0) / per_page),
-            page_now=page,
+            total=len(found),
+            response=[by_id[x] for x in ids if x in by_id],
+            page=math.ceil(len(found) / per_page),
+            page_now=page if cursor is None else 0,
+            next_cursor=encode_cursor(last[1], last[0]) if last is not None else None,
         )
 
+    async def _scalars_page(
+        self, selector: Select[tuple[Manga | HasManga]], per_page: int
+    ) -> tuple[list[ApiOutputBaseManga], tuple[int, int | None] | None]:
+        """Делает запрос страницы с лишней строкой
+
+        Args:
+            selector (Select[tuple[Manga | HasManga]]): Запрос с limit per_page + 1, вторая колонка - релевантность, если есть
+            per_page (int): Количество манги на странице
+
+        Returns:
+            tuple[list[ApiOutputBaseManga], tuple[int, int | None] | None]: Манга, ключ и релевантность последней строки,
+                если есть следующая страница
+        """
+        async with self.Session() as session:
+            rows = (await session.execute(selector)).all()
+
+            last = None
+            if len(rows) > per_page:
+                row = rows[per_page - 1]
+                last = (row[0].id, row[1] if len(row) > 1 else None)
+
+            return [
+                self._build_manga(row[0])
+                if isinstance(row[0], Manga)
+                else self._build_manga(row[0].manga)
+                for row in rows[:per_page]
+            ], last
+
     async def _get_by(
         self, selector: Select[tuple[Manga | HasManga]]
     ) -> MangaFindResultSchema:
@@ -0,0 +1,180 @@
+"""Воркер очереди задач.
+
+Пауки в основном процессе (queue.enabled) только находят новую мангу на страницах
+и добавляют задачи в очередь (JobManager). Воркеры, запущенные отдельно (worker.py),
+берут задачи, загружают и разбирают мангу и записывают её в базу данных.
+Воркеров может быть сколько угодно, в разных процессах и контейнерах.
+"""
+
+import asyncio
+import os
+import socket
+
+from typing import TypedDict
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+from .entities.schemas import CrawlJobSchema
+from .manager.job import JobManager
+from .manager.manga import MangaManager
+from .abstract.spider import BaseSpider
+
+
+class QueueConfig(BaseModel):
+    """Настройки очереди задач"""
+
+    enabled: bool = Field(False)
+    """True - пауки основного процесса только добавляют задачи, мангу загружают воркеры."""
+
+    concurrency: int = Field(10, ge=1)
+    """Сколько задач воркер выполняет одновременно."""
+
+    poll_interval: float = Field(5, gt=0)
+    """Пауза в секундах, когда задач нет."""
+
+    max_attempts: int = Field(3, ge=1)
+    """Сколько попыток даётся задаче."""
+
+    lock_timeout: float = Field(600, gt=0)
+    """Через сколько секунд задача в работе считается брошенной и отдаётся другому воркеру."""
+
+    spiders: list[str] = Field(default_factory=list)
+    """Воркер берёт задачи только этих пауков, пусто - всех."""
+
+    count_ttl: float = Field(30, gt=0)
+    """Через сколько секунд основной процесс перечитывает количество манги (CountCache), мангу записывают воркеры."""
+
+
+class WorkerStats(TypedDict):
+    """Статистика воркера"""
+
+    done: int
+    """Выполнено задач"""
+
+    failed: int
+    """Неудачных попыток"""
+
+
+class CrawlWorker:
+    """Воркер, который выполняет задачи из очереди."""
+
+    def __init__(
+        self,
+        jobs: JobManager,
+        manager: MangaManager,
+        spiders: list[BaseSpider],
+        config: QueueConfig | None = None,
+        name: str | None = None,
+    ):
+        """Инициализация воркера
+
+        Args:
+            jobs (JobManager): Менеджер очереди задач
+            manager (MangaManager): Менеджер манги, куда записывается загруженная манга
+            spiders (list[BaseSpider]): Пауки, которые загружают мангу
+            config (QueueConfig | None, optional): Настройки очереди. По умолчанию QueueConfig().
+            name (str | None, optional): Название воркера. По умолчанию хост и pid.
+        """
+        self.jobs = jobs
+        self.manager = manager
+        self.config = config or QueueConfig()
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.spiders = {
+            spider.__class__.__name__: spider
+            for spider in spiders
+            if not self.config.spiders
+            or spider.__class__.__name__ in self.config.spiders
+        }
+        self.stats: WorkerStats = {"done": 0, "failed": 0}
+
+    async def run(self, once: bool = False) -> None:
+        """Выполняет задачи, пока воркер не остановят
+
+        Args:
+            once (bool, optional): Остановиться, когда задачи закончатся. По умолчанию False.
+        """
+        logger.info(
+            f"Воркер запущен (worker={self.name}, spiders={list(self.spiders)}, concurrency={self.config.concurrency})"
+        )
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            while True:
+                free = self.config.concurrency - len(tasks)
+                if free > 0:
+                    for job in await self.jobs.claim(
+                        self.name,
+                        free,
+                        spiders=list(self.spiders),
+                        lock_timeout=self.config.lock_timeout,
+                        max_attempts=self.config.max_attempts,
+                    ):
+                        tasks.add(asyncio.create_task(self._process(job)))
+
+                if not tasks:
+                    if once:
+                        return
+
+                    await asyncio.sleep(self.config.poll_interval)
+                    continue
+
+                done, tasks = await asyncio.wait(
+                    tasks,
+                    timeout=self.config.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    if not task.cancelled() and (error := task.exception()) is not None:
+                        # Задача останется в работе, после lock_timeout её возьмёт другой воркер
+                        logger.error(
+                            f"Ошибка воркера (worker={self.name}, message={error!r})"
+                        )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            released = await asyncio.shield(self.jobs.release(self.name))
+            logger.info(
+                f"Воркер остановлен (worker={self.name}, done={self.stats['done']}, failed={self.stats['failed']}, released={released})"
+            )
+
+    async def _process(self, job: CrawlJobSchema) -> None:
+        """Загружает мангу задачи и записывает её в базу данных"""
+        spider = self.spiders.get(job.spider)
+        if spider is None:
+            await self._fail(job, f"Паук {job.spider} не загружен")
+            return
+
+        try:
+            manga = await spider.get(job.url)
+            if manga is None:
+                await self._fail(job, "Не удалось получить мангу")
+                return
+
+            if not manga.gallery:
+                await self._fail(job, "Манга не содержит галереи")
+                return
+
+            await self.manager.add_manga(manga)
+        except Exception as error:
+            logger.error(
+                f"Ошибка во время выполнения задачи (job={job.id}, url={job.url}, message={error})"
+            )
+            await self._fail(job, repr(error))
+            return
+
+        try:
+            if await self.jobs.complete(job.id, self.name):
+                self.stats["done"] += 1
+        except Exception as error:
+            # Манга записана, задача останется в работе до lock_timeout и выполнится повторно
+            logger.error(
+                f"Не удалось отметить задачу выполненной (job={job.id}, url={job.url}, message={error})"
+            )
+
+    async def _fail(self, job: CrawlJobSchema, error: str) -> None:
+        logger.warning(
+            f"Задача не выполнена (job={job.id}, url={job.url}, attempt={job.attempts}, message={error})"
+        )
+        await self.jobs.fail(job.id, self.name, error, self.config.max_attempts)
+        self.stats["failed"] += 1
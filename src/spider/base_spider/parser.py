@@ -1,53 +1,61 @@
 from loguru import logger
 
-from ...core.abstract.parser import BaseMangaParser, BasePageParser
+from ...core.abstract.parser import BaseMangaParser, BasePageParser, any_backend
 from ...core.entities.schemas import MangaSchema, BaseManga
 from ...core.exc import ParseSituationNotAllowed, ParserError
+from ...core.selector import first_text, get_attr, get_text
 
 
 class GlobalMangaParser(BaseMangaParser):
     TAGS = {}
-
+    SELECTORS = {
+        "title": "div#info h1",
+        "poster": "div#cover img",
+        "url": 'link[rel="canonical"]',
+        "tags": "section#tags div.tag-container",
+        "tag": "a.tag",
+        "gallery": "div#thumbnail-container img",
+    }
+
+    @any_backend
     def _parse_html(self, soup):
-        title = soup.select_one("div#info h1")
-        poster = soup.select_one("div#cover img")
-        url = soup.select_one('link[rel="canonical"]')
+        title = self.select_one(soup, "title")
+        poster = self.select_one(soup, "poster")
+        url = self.select_one(soup, "url")
 
-        _tags = soup.select("section#tags div.tag-container")
+        _tags = self.select(soup, "tags")
         tags = {}
 
         for tag in _tags:
-            if tag.next_element is None:
-                continue
-            tag_name = tag.next_element.get_text(strip=True).lower()
+            tag_name = first_text(tag).lower()
 
             if tag_name in self.TAGS:
                 if self.TAGS[tag_name] == "genres":
                     tags[self.TAGS[tag_name]] = list(
-                        set(t.get_text(strip=True) for t in tag.select("a.tag"))
+                        set(get_text(t) for t in self.select(tag, "tag"))
                     )
 
                 else:
                     tags[self.TAGS[tag_name]] = (
-                        tag.select_one("a.tag").get_text(strip=True)
-                        if tag.select_one("a.tag")
+                        get_text(first)
+                        if (first := self.select_one(tag, "tag")) is not None
                         else None
                     )
 
         gallery = [
-            self.urljoin(img.get("data-src"))
-            for img in soup.select("div#thumbnail-container img")
-            if img.get("data-src")
+            self.urljoin(get_attr(img, "data-src"))
+            for img in self.select(soup, "gallery")
+            if get_attr(img, "data-src")
         ]
 
         logger.debug(f"Название: {title}")
         logger.debug(f"Теги: {poster}")
         logger.debug(f"URL: {url}")
 
-        if all([title, poster, url]):
-            title = title.get_text(strip=True)
-            poster = self.urljoin(poster.get("data-src"))
-            url = url.get("href")
+        if all(x is not None for x in [title, poster, url]):
+            title = get_text(title)
+            poster = self.urljoin(get_attr(poster, "data-src"))
+            url = get_attr(url, "href")
         else:
             raise ParserError(
                 "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы."
@@ -71,28 +79,37 @@ class GlobalMangaParser(BaseMangaParser):
 
 class GlobalPageParser(BasePageParser):
     SELECTOR = ""
+    SELECTORS = {"poster": "img", "url": "a"}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        if cls.SELECTOR:
+            cls.SELECTORS = cls.SELECTORS | {"item": cls.SELECTOR}
 
+        super().__init_subclass__(**kwargs)
+
+    @any_backend
     def _parse_html(self, soup):
         exc = 0
         total = 0
         items: list[BaseManga] = []
 
-        for item in soup.select(self.SELECTOR):
+        for item in self.select(soup, "item"):
             total += 1
 
-            title = item.get_text(strip=True)
-            poster = item.select_one("img")
-            url = item.select_one("a")
+            title = get_text(item)
+            poster = self.select_one(item, "poster")
+            url = self.select_one(item, "url")
+
+            if title and poster is not None and url is not None:
+                poster = self.urljoin(get_attr(poster, "data-src"))
+                url = self.urljoin(get_attr(url, "href"))
 
-            if all([title, poster, url]):
-                poster = self.urljoin(poster.get("data-src"))
-                url = self.urljoin(url.get("href"))
+                if all([poster, url]):
+                    items.append(BaseManga(title=title, poster=poster, url=url))
+                    continue
 
-            if all([title, poster, url]):
-                items.append(BaseManga(title=title, poster=poster, url=url))
-            else:
-                exc += 1
-                logger.warning("Не удалось получить обязательный атрибут")
+            exc += 1
+            logger.warning("Не удалось получить обязательный атрибут")
 
         logger.debug(f"Удачно удалось получить обьектов {total - exc} из {total}")
         return items
@@ -8,7 +8,7 @@ from aiohttp.client import _RequestOptions
 from loguru import logger
 
 from ...core.entities.schemas import MangaSchema
-from ...core.abstract.spider import BaseSpider, BaseManga
+from ...core.abstract.spider import BaseSpider, BaseManga, RunContext
 from .parser import GlobalMangaParser, GlobalPageParser
 
 
@@ -17,23 +17,31 @@ class BaseMangaSpider(BaseSpider):
 
     MAX_PAGE_SELECTOR = "section.pagination a"
     PAGE_URL = "/page/{page}/"
-    START_PAGE = 1
     MANGA_PARSER: type[GlobalMangaParser]
     PAGE_PARSER: type[GlobalPageParser]
+    MANGA_PARSER_URL: Optional[str] = (
+        None  # Базовый URL парсера манги, если отличается от BASE_URL
+    )
 
-    _total_pages: Optional[int] = None
-    _processed_pages: int = 0
-    _max_page_fetched: bool = False
+    manga_parser: GlobalMangaParser
+    page_parser: GlobalPageParser
 
-    async def get(self, url: str, **kw: Unpack[_RequestOptions]) -> MangaSchema | None:
-        parser = self.MANGA_PARSER(self.BASE_URL, self.features)
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._total_pages: Optional[int] = None
+        self._max_page_fetched = False
 
+    async def get(self, url: str, **kw: Unpack[_RequestOptions]) -> MangaSchema | None:
         markup = await self.http.get(url, "read", **kw)
         if markup is None:
             logger.error(f"Не удалось получить страницу: {url}")
             return
 
-        return parser.parse(markup, features=self.features, situation="html")
+        return await self.parse(self.manga_parser, markup, situation="html")
+
+    def load_parsers(self) -> None:
+        self.manga_parser = self.get_parser(self.MANGA_PARSER, self.MANGA_PARSER_URL)
+        self.page_parser = self.get_parser(self.PAGE_PARSER)
 
     @property
     async def total_pages(self) -> int:
@@ -68,69 +76,97 @@ class BaseMangaSpider(BaseSpider):
             self._max_page_fetched = True
         return self._total_pages or 1
 
+    async def page_total(self) -> int:
+        return await self.total_pages
+
     @property
     def status(self) -> str:
         """
         Возвращает текущий статус прогресса парсинга в процентах.
 
+        Если паук проходит страницы по частям, прогресс частей суммируется.
+
         Returns:
             str: Процент выполнения в формате "XX% - X/X". Например: "67% - 67/100"
         """
-        total = self._total_pages or 1
-        percent = (self._processed_pages / total) * 100
-        return f"{int(percent)}% - {self._processed_pages}/{total}"  # Было решено что лучше добавлять страницы
+        processed = sum(x.processed for x in self.contexts)
+        total = sum(x.total for x in self.contexts) or 1
+        percent = (processed / total) * 100
+        return f"{int(percent)}% - {processed}/{total}"  # Было решено что лучше добавлять страницы
 
     async def pages(
-        self, start_page: int | None = None
+        self,
+        start_page: int | None = None,
+        stop_unchanged: bool = False,
+        end_page: int | None = None,
+        batch: int | None = None,
     ) -> AsyncGenerator[list[BaseManga], None]:
         """
         Генератор, возвращающий разметку каждой страницы пагинации.
 
         Args:
             start_page (int | None): Номер страницы, с которой начать. По умолчанию — 1.
+            stop_unchanged (bool): Остановиться на первой странице, которая ответила 304 Not Modified.
+            end_page (int | None): Последняя страница. По умолчанию — последняя страница сайта.
+            batch (int | None): Сколько страниц загружается одновременно. По умолчанию — размер пачки паука.
 
         Yields:
-            BeautifulSoup: Объект soup для каждой страницы.
+            list[BaseManga]: Манга с каждой страницы.
         """
+        context: RunContext | None = None
         try:
-            parser = self.PAGE_PARSER(self.BASE_URL, self.features)
-
             # Получаем общее количество страниц один раз
             total = await self.total_pages
             logger.info(f"Обнаружено всего страниц: {total}")
 
             start = start_page or self.START_PAGE
-            self._processed_pages = start
-            if start > total:
+            end = min(end_page or total, total)
+            if start > end:
                 logger.info("Начальная страница больше максимальной. Парсинг завершён.")
                 return
 
-            for url_batch in batched(
-                (
-                    self.urljoin(self.PAGE_URL.format(page=page))
-                    for page in range(start, total + 1)
-                ),
-                self.batch,
-            ):
+            context = RunContext(start, end)
+            self.contexts.append(context)
+
+            for page_batch in batched(range(start, end + 1), batch or self.batch):
                 tasks = [
-                    asyncio.create_task(self.http.get(url, "read")) for url in url_batch
+                    asyncio.create_task(
+                        self._get_page(self.urljoin(self.PAGE_URL.format(page=page)))
+                    )
+                    for page in page_batch
                 ]
 
-                for task in asyncio.as_completed(tasks):
-                    response = await task
-                    if response is None:
-                        continue
+                try:
+                    # Страницы загружаются одновременно, но отдаются по порядку (от новых к старым)
+                    for page, task in zip(page_batch, tasks):
+                        url, response = await task
+                        context.processed += 1
+                        if response is None:
+                            continue
+
+                        logger.debug(
+                            f"Обработана страница {page}/{total} ({self.status})"
+                        )
+
+                        if stop_unchanged and self.http.is_unchanged(url):
+                            logger.info(
+                                f"Страница не изменилась, обход остановлен (url={url})"
+                            )
+                            return
+
+                        result = await self.parse(self.page_parser, response)
+                        context.page = self.page = page
+                        yield result
+                finally:
+                    for task in tasks:
+                        task.cancel()
+        finally:
+            if context is not None:
+                self.contexts.remove(context)
 
-                    self._processed_pages += (
-                        1  # Увеличиваем счётчик обработанных страниц
-                    )
-                    logger.debug(
-                        f"Обработана страница {self._processed_pages}/{total} ({self.status})"
-                    )
+            if not self.contexts:
+                self._total_pages = None
+                self._max_page_fetched = False
 
-                    soup = parser.build_soup(response)
-                    yield parser.parse(soup)
-        finally:
-            self._total_pages = None
-            self._processed_pages = 0
-            self._max_page_fetched = False
+    async def _get_page(self, url: str) -> tuple[str, bytes | None]:
+        return url, await self.http.get(url, "read")
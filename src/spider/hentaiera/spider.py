@@ -56,15 +56,16 @@ class HentaiEraSpider(BaseMangaSpider):
             logger.error("Не удалось получить галлерею")
             return
 
-        soup = BeautifulSoup(response, self.features)
-        return self._extract_gallery(soup)
+        return await self.executor.run(self._extract_gallery, response, self.features)
 
-    def _extract_gallery(self, soup: BeautifulSoup) -> list[str]:
+    @classmethod
+    def _extract_gallery(cls, markup: bytes, features: str) -> list[str]:
+        soup = BeautifulSoup(markup, features)
         images = []
         gallery_info = None
         for x in soup.select('script[type="text/javascript"]'):
             script = x.get_text(strip=True)
-            match = re.search(self.GET_GALLERY_PATTERN, script)
+            match = re.search(cls.GET_GALLERY_PATTERN, script)
             if match:
                 gallery_info = json.loads(match.group(1))
 
@@ -85,9 +86,9 @@ class HentaiEraSpider(BaseMangaSpider):
         u_id = u_id.get("value")
 
         for page in range(1, int(pages) + 1):
-            server = self.get_random_server(u_id)
-            suffix = self._gallery_thumb(page, gallery_info)
-            images.append(self._build_url(server, image_dir, gallery_id, page, suffix))
+            server = cls.get_random_server(u_id)
+            suffix = cls._gallery_thumb(page, gallery_info)
+            images.append(cls._build_url(server, image_dir, gallery_id, page, suffix))
 
         return images
 
@@ -1,31 +1,42 @@
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+from typing import Any
+
 from loguru import logger
 
-from ...core.abstract.parser import BaseMangaParser, BasePageParser
+from ...core.abstract.parser import BaseMangaParser, BasePageParser, any_backend
 from ...core.entities.schemas import MangaSchema, BaseManga
+from ...core.selector import get_attr, get_text
 
 
 class HitomiMangaParser(BaseMangaParser):
     GENRES_TAG = "标签"
     AUTHOR_TAG = "作者"
     LANGUAGE_TAG = "语言"
-
+    SELECTORS = {
+        "title": "h1",
+        "url": 'link[rel="canonical"]',
+        "poster": "div.img-holder img",
+        "tags": "div.manga-detail ul li.br",
+        "tag_title": "div.md-title",
+        "tag_content": "div.md-content a",
+    }
+
+    @any_backend
     def _parse_html(self, soup):
         logger.debug("Парсинг данных тип (HTML)")
-        title = soup.select_one("h1")
-        url = soup.select_one('link[rel="canonical"]')
-        poster = soup.select_one("div.img-holder img")
+        title = self.select_one(soup, "title")
+        url = self.select_one(soup, "url")
+        poster = self.select_one(soup, "poster")
 
         genres = self.extract_tags(soup, self.GENRES_TAG)
         author = self.extract_tags(soup, self.AUTHOR_TAG)
         language = self.extract_tags(soup, self.LANGUAGE_TAG)
 
-        if all([title, poster, url]):
-            title = title.get_text(strip=True)
-            poster = self.urljoin(poster.get("src"))
-            url = url.get("href")
+        if all(x is not None for x in [title, poster, url]):
+            title = get_text(title)
+            poster = self.urljoin(get_attr(poster, "src"))
+            url = get_attr(url, "href")
         else:
             raise ValueError(
                 "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы."
@@ -53,48 +64,58 @@ class HitomiMangaParser(BaseMangaParser):
             if img.get("data-url")
         ]
 
-    def extract_tags(self, soup: BeautifulSoup, tag_name: str) -> list[str]:
-        for br in soup.select("div.manga-detail ul li.br"):
-            if (title := br.select_one("div.md-title")) is None:
+    def extract_tags(self, soup: Any, tag_name: str) -> list[str]:
+        for br in self.select(soup, "tags"):
+            if (title := self.select_one(br, "tag_title")) is None:
                 continue
 
-            elif title.get_text(strip=True) != tag_name + ":":
+            elif get_text(title) != tag_name + ":":
                 continue
 
             return [
-                x.get("title") for x in br.select("div.md-content a") if x.get("title")
+                get_attr(x, "title")
+                for x in self.select(br, "tag_content")
+                if get_attr(x, "title")
             ]
 
         return []
 
 
 class HitomiPageParser(BasePageParser):
+    SELECTORS = {
+        "item": "div.m-item",
+        "read_more": "a.__link.read-more",
+        "link": 'div[class$="img"] a.__link',
+        "poster": "img",
+    }
+
+    @any_backend
     def _parse_html(self, soup):
         result = []
         mangas = [
             x
-            for x in soup.select("div.m-item")
-            if not x.select_one("a.__link.read-more")
+            for x in self.select(soup, "item")
+            if self.select_one(x, "read_more") is None
         ]
 
         for manga in mangas:
-            if not (manga := manga.select_one('div[class$="img"] a.__link')):
+            if (manga := self.select_one(manga, "link")) is None:
                 raise ValueError(
                     "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы. (Не найден manga)"
                 )
 
-            if not (url := manga.get("href")):
+            if not (url := get_attr(manga, "href")):
                 raise ValueError(
                     "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы. (Не найден href)"
                 )
 
-            if not (title := manga.get("title")):
+            if not (title := get_attr(manga, "title")):
                 raise ValueError(
                     "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы. (Не найден title)"
                 )
 
-            if not (poster_box := manga.select_one("img")) or not (
-                poster := poster_box.get("data-src")
+            if (poster_box := self.select_one(manga, "poster")) is None or not (
+                poster := get_attr(poster_box, "data-src")
             ):
                 raise ValueError(
                     "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы. (Не найден poster)"
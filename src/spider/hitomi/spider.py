@@ -75,14 +75,12 @@ class HitomiSpider(BaseMangaSpider):
             return self._total_pages or 1
 
     async def get(self, url: str, **kwargs):
-        parser = self.MANGA_PARSER(self.BASE_URL, self.features)
-
         markup = await self.http.get(url, "read")
         if markup is None:
             logger.error(f"Не удалось получить страницу: {url}")
             return
 
-        base_manga = parser.parse(markup, features=self.features, situation="html")
+        base_manga = await self.parse(self.manga_parser, markup, situation="html")
 
         id = url.split("/")[-1].replace(self.SUFFIX, "")
         gallery = await self.http.get(self.urljoin(self.MANGA.format(id=id)), "json")
@@ -91,7 +89,10 @@ class HitomiSpider(BaseMangaSpider):
             return
 
         base_manga.gallery.extend(
-            [HttpUrl(x) for x in parser.parse(gallery, situation="json")]
+            [
+                HttpUrl(x)
+                for x in await self.parse(self.manga_parser, gallery, situation="json")
+            ]
         )
 
         return base_manga
@@ -1,62 +1,67 @@
 import json
 from urllib.parse import urljoin
 
-from ...core.abstract.parser import BaseMangaParser
+from ...core.abstract.parser import BaseMangaParser, any_backend
 from ...core.entities.schemas import MangaSchema
 from ...core.exc import ParserError, ParseSituationNotAllowed
+from ...core.selector import first_text, get_attr, get_text
 from ..base_spider.parser import GlobalPageParser
 
 
 class NhentaiMangaParser(BaseMangaParser):
     TAGS = {"tags": "genres", "artists": "author", "languages": "language"}
-
+    SELECTORS = {
+        "title": "div#info h1",
+        "poster": "div#cover img",
+        "url": "#gallery_id",
+        "tags": "section#tags div.tag-container",
+        "tag": "a.tag span.name",
+        "gallery": "div#thumbnail-container img",
+    }
+
+    @any_backend
     def _parse_html(self, soup):
-        title = soup.select_one("div#info h1")
-        poster = soup.select_one("div#cover img")
-        url = soup.select_one("#gallery_id")
+        title = self.select_one(soup, "title")
+        poster = self.select_one(soup, "poster")
+        url = self.select_one(soup, "url")
 
-        if all([title, poster, url]):
-            title = title.get_text(strip=True)
+        if all(x is not None for x in [title, poster, url]):
+            title = get_text(title)
             try:
-                if fallbacks := json.loads(poster.get("data-fallbacks", "[]")):
+                if fallbacks := json.loads(get_attr(poster, "data-fallbacks") or "[]"):
                     poster = fallbacks[0]
                 else:
-                    poster = poster.get("src")
+                    poster = get_attr(poster, "src")
             except (json.JSONDecodeError, AttributeError):
-                poster = poster.get("src")
+                poster = get_attr(poster, "src")
 
-            url = self.urljoin(
-                "/g/" + "".join(x for x in url.get_text(strip=True) if x.isdigit())
-            )
+            url = self.urljoin("/g/" + "".join(x for x in get_text(url) if x.isdigit()))
         else:
             raise ParserError(
                 "Не удалось извлечь данные из HTML. Пожалуйста, проверьте исходный код страницы."
             )
-        _tags = soup.select("section#tags div.tag-container")
+        _tags = self.select(soup, "tags")
         tags = {}
 
         for tag in _tags:
-            if tag.next_element is None:
-                continue
-
-            tag_name = tag.next_element.get_text(strip=True).lower()
+            tag_name = first_text(tag).lower()
             if tag_name in self.TAGS:
                 if self.TAGS[tag_name] == "genres":
                     tags[self.TAGS[tag_name]] = list(
-                        set(t.get_text() for t in tag.select("a.tag span.name"))
+                        set(get_text(t, strip=False) for t in self.select(tag, "tag"))
                     )
 
                 else:
                     tags[self.TAGS[tag_name]] = (
-                        tag.select_one("a.tag span.name").get_text(strip=True)
-                        if tag.select_one("a.tag span.name")
+                        get_text(first)
+                        if (first := self.select_one(tag, "tag")) is not None
                         else None
                     )
 
         gallery = [
-            self._fix_gallery_url(self.urljoin(img.get("data-src")))
-            for img in soup.select("div#thumbnail-container img")
-            if img.get("data-src")
+            self._fix_gallery_url(self.urljoin(get_attr(img, "data-src")))
+            for img in self.select(soup, "gallery")
+            if get_attr(img, "data-src")
         ]
 
         if all([title, poster, url]):
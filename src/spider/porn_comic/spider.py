@@ -15,11 +15,14 @@ class PornComicSpider(BaseMangaSpider):
     BASE_URL = "https://www.porn-comic.com/h/"
     PAGE_URL = "/index-{page}.html"
     MAX_PAGE_SELECTOR = "div.page.bigpage a"
+    MANGA_PARSER = PornComicParser
     PAGE_PARSER = PornComicPageParser
 
     CUSTOM_SLEEP_TIME = 4.5
     CUSTOM_BATCH = 4
 
+    HOST_RPS = 1 / CUSTOM_SLEEP_TIME
+
     PAGINATOR_URL = "/h/index-{page}.html"
 
     def __init__(self, session, manager=None, features=None, batch=None, **kwargs):
@@ -29,16 +32,13 @@ class PornComicSpider(BaseMangaSpider):
         batch = self.CUSTOM_BATCH  # NOTE: Специально для этого сайта, так как он имеет очень строгий RATE LIMIT, и требуется меньшн запросов одновременно.
 
         super().__init__(session, manager, features, batch, **kwargs)
-        self.manga_parser = PornComicParser(
-            base_url=self.BASE_URL, features=self.features
-        )
 
     async def get(self, url, **kwargs):
         response = await self.http.get(url, "read", **kwargs)
         if response is None:
             return None
 
-        manga = self.manga_parser.parse(response, situation="html")
+        manga = await self.parse(self.manga_parser, response, situation="html")
         try:
             manga.gallery = [HttpUrl(x) for x in await self.get_images(url)]
         except ParserError:
@@ -77,7 +77,9 @@ class PornComicSpider(BaseMangaSpider):
         if response is None:
             return None
 
-        return self.manga_parser._parse_json(json.loads(response))
+        return await self.parse(
+            self.manga_parser, json.loads(response), situation="json"
+        )
 
     @property
     def paginator(self):
@@ -1,6 +1,7 @@
 # tests/unit/test_manga_manager.py
 import os
 import sys
+import asyncio
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
@@ -9,8 +10,10 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from src.core.manager.manga import MangaManager
+from src.core.manager.tag import TagCache
+from src.core.manager.count import CountCache
 from src.core.entities.schemas import MangaSchema
-from src.core.entities.models import Manga
+from src.core.entities.models import Manga, Genre, Language
 
 
 db_path = "test_templates/test-manga-manager.db"
@@ -206,6 +209,173 @@ class TestMangaManager:
         await database.add_manga(manga_data)
         assert await database.in_database(manga_data)
 
+    @pytest.mark.asyncio
+    async def test_known_skus(self, database, manga_data, manga_data_1):
+        """Тест проверки пачки манги одним запросом и обновления постера"""
+        assert await database.known_skus([]) == set()
+        assert await database.known_skus([manga_data, manga_data_1]) == set()
+
+        await database.add_manga(manga_data)
+        moved = manga_data.model_copy(
+            update={"poster": "https://example.com/new-poster.jpg"}
+        )
+        assert await database.known_skus([moved, manga_data_1]) == {manga_data.sku}
+
+        result = await database.get_manga_by_sku(manga_data.sku)
+        assert str(result.poster) == "https://example.com/new-poster.jpg"
+
+    @pytest.mark.asyncio
+    async def test_fingerprints(self, database, manga_data, manga_data_1):
+        """Тест отпечатков содержимого: сохраняются при добавлении и обновлении"""
+        assert await database.fingerprints([manga_data]) == {}
+
+        await database.add_manga(manga_data)
+        assert await database.fingerprints([manga_data, manga_data_1]) == {
+            manga_data.sku: manga_data.fingerprint
+        }
+
+        changed = manga_data.model_copy(update={"genres": ["Другой жанр"]})
+        assert changed.fingerprint != manga_data.fingerprint
+
+        await database.update_manga(
+            **changed.as_dict(), fingerprint=changed.fingerprint
+        )
+        result = await database.fingerprints([manga_data])
+        assert result[manga_data.sku] == changed.fingerprint
+
+    @pytest.mark.asyncio
+    async def test_add_many_manga(
+        self, database, manga_data, manga_data_1, manga_without_genres
+    ):
+        """Тест массового добавления: результат по каждой манге, общие теги создаются один раз"""
+        assert await database.add_many_manga([]) == []
+
+        existing = await database.add_manga(manga_data)
+        result = await database.add_many_manga(
+            [manga_data, manga_data_1, manga_without_genres, manga_data_1]
+        )
+
+        assert [x.status for x in result] == ["exists", "added", "added", "exists"]
+        assert result[0].id == existing.id
+        assert result[1].id == result[3].id
+
+        added = await database.get_manga(result[1].id)
+        assert added.title == manga_data_1.title
+        assert added.author.id == existing.author.id
+        assert sorted(x.id for x in added.genres) == sorted(
+            x.id for x in existing.genres
+        )
+        assert [str(x) for x in added.gallery] == [str(x) for x in manga_data_1.gallery]
+
+        other = await database.get_manga(result[2].id)
+        assert other.genres == []
+        assert other.language.name == "Russian"
+
+        fingerprints = await database.fingerprints([manga_data_1])
+        assert fingerprints[manga_data_1.sku] == manga_data_1.fingerprint
+        assert await database.get_total() == 3
+
+    @pytest.mark.asyncio
+    async def test_tag_cache(self, engine, database, manga_data, manga_data_1):
+        """Тест кэша тегов: теги не дублируются, повторные имена берутся из памяти"""
+        await database.add_manga(manga_data)
+        await database.add_manga(manga_data_1)
+        assert database.tags.stats["hit_ratio"] > 0
+
+        # Другой процесс со своим кэшем создаёт те же теги
+        other = TagCache(engine)
+        first, second = await asyncio.gather(
+            other.get_ids(Genre, ["ahegao", "new"]),
+            TagCache(engine).get_ids(Genre, ["new"]),
+        )
+        assert first["new"] == second["new"]
+
+        genres = await database.tags.all(Genre)
+        assert sorted(x.name for x in genres) == ["ahegao", "simple sex"]
+        database.tags.invalidate(Genre)
+        genres = await database.tags.all(Genre)
+        assert [x.name for x in genres] == ["new", "simple sex", "ahegao"]
+
+        # Новый тег этого процесса сразу виден в списке
+        await database.tags.get_id(Language, "Japanese")
+        languages = await database.tags.all(Language)
+        assert [x.name for x in languages] == ["Japanese", "English"]
+
+    @pytest.mark.asyncio
+    async def test_counts(
+        self, engine, database, manga_data, manga_data_1, manga_without_genres
+    ):
+        """Тест счётчиков: меняются при записи так же, как количество в базе данных"""
+        assert await database.counts.total() == 0
+
+        added = await database.add_manga(manga_data)
+        await database.add_many_manga([manga_data_1, manga_without_genres])
+        await database.update_manga(
+            manga_data.sku, genres=["comedy"], language="Russian"
+        )
+
+        fresh = CountCache(engine)
+        for kind, key in [
+            ("all", None),
+            ("author", added.author.id),
+            ("language", added.language.id),
+            *(("genre", x.id) for x in added.genres),
+            ("genre", await database.tags.get_id(Genre, "comedy")),
+            ("language", await database.tags.get_id(Language, "Russian")),
+        ]:
+            assert await database.counts.total(kind, key) == await fresh.total(
+                kind, key
+            )
+
+        calls = 0
+
+        async def count():
+            nonlocal calls
+            calls += 1
+            return 7
+
+        assert await database.counts.query("test", count) == 7
+        assert await database.counts.query("test", count) == 7
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_counts_duplicates_and_errors(self, database, manga_data):
+        """Повтор жанра считается один раз, прерванная запись сбрасывает счётчики"""
+        await database.counts.load()
+        manga_data.genres = ["ahegao", "ahegao"]
+        added = await database.add_manga(manga_data)
+
+        genre = added.genres[0].id
+        assert len(added.genres) == 1
+        assert await database.counts.total("genre", genre) == 1
+
+        with pytest.raises(asyncio.CancelledError):
+            with database.counts.transaction():
+                database.counts.add([genre])
+                raise asyncio.CancelledError
+
+        assert await database.counts.total("genre", genre) == 1
+
+    @pytest.mark.asyncio
+    async def test_search_index(self, database, manga_data, manga_data_1):
+        """Тест поиска в памяти: регистр, полноширинные символы, дополнение при записи"""
+        added = await database.add_manga(manga_data)
+        assert await database.search.find("ｔｅｓｔ MANGA") == [(2, added.id)]
+
+        other = await database.add_many_manga(
+            [manga_data_1.model_copy(update={"title": "Другая Манга"})]
+        )
+        assert await database.search.find("манга") == [(0, other[0].id)]
+        assert await database.search.find("test") == [(1, added.id)]
+        assert await database.search.find("нет такой") == []
+
+        await database.update_manga(manga_data.sku, title="Манга переименована")
+        assert await database.search.find("манга") == [
+            (1, added.id),
+            (0, other[0].id),
+        ]
+        assert await database.search.find("test") == []
+
     @pytest.mark.asyncio
     async def test_get_total(self, database, manga_data):
         """Тест подсчёта общего количества манги"""
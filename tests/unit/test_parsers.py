@@ -4,9 +4,22 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 import pytest
+import pytest_asyncio
+
+from aiohttp import ClientSession
+from bs4 import FeatureNotFound
 from src.spider.hmanga.parser import MangaParser as HmangaParser
+from src.spider.hmanga.parser import PageParser as HmangaPageParser
 from src.spider.multi_manga.parser import MangaParser as MultiMangaParser
+from src.spider.hitomi.parser import HitomiMangaParser, HitomiPageParser
+from src.spider.nhentai.parser import NhentaiMangaParser
+from src.core.abstract.parser import ParserRegistry, check_features, parsers
 from src.core.exc import ParserError
+from src.core.manager.spider import load_spiders
+from src.spider.hmanga import HmangaSpider
+from src.spider.nhentai import NhentaiSpider
+from src.core.executor import ExecutorConfig, ParseExecutor
+from src.core.selector import css_to_xpath
 
 
 class TestHmangaParser:
@@ -222,3 +235,194 @@ class TestMultiMangaParser:
     async def test_parse_real_html_author(self, parser, real_html):
         result = parser.parse(real_html)
         assert result.author == "Jovejun"
+
+
+class TestParseExecutor:
+    @pytest.fixture
+    def parser(self):
+        return HmangaParser("https://hmanga.my/", situation="html")
+
+    @pytest.fixture
+    def sample_html(self):
+        return b"""
+        <html>
+            <link rel="canonical" href="https://hmanga.my/manga/1">
+            <div id="info"><h1>Test Manga</h1></div>
+            <div id="cover"><img data-src="/poster.jpg"></div>
+        </html>
+        """
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("kind", ["inline", "thread", "process"])
+    async def test_parse(self, parser, sample_html, kind):
+        """Байты на вход, готовая схема на выход, в любом пуле"""
+        executor = ParseExecutor(ExecutorConfig(kind=kind, workers=1))
+        try:
+            result = await executor.run(parser.parse, sample_html)
+        finally:
+            executor.shutdown()
+
+        assert result.title == "Test Manga"
+        assert str(result.poster) == "https://hmanga.my/poster.jpg"
+
+    @pytest.mark.asyncio
+    async def test_parse_error(self, parser):
+        """Ошибка парсера пробрасывается из процесса"""
+        executor = ParseExecutor(ExecutorConfig(kind="process", workers=1))
+        try:
+            with pytest.raises(ParserError):
+                await executor.run(parser.parse, b"<html></html>")
+        finally:
+            executor.shutdown()
+
+
+class TestSelector:
+    @pytest.mark.parametrize(
+        "css, xpath",
+        [
+            ("h1", ".//h1"),
+            ("#cover img", './/*[@id="cover"]//img'),
+            ("div > a[href]", ".//div/a[@href]"),
+            ('link[rel="canonical"]', './/link[@rel="canonical"]'),
+            ("a[href^='/tag/']", './/a[starts-with(@href, "/tag/")]'),
+        ],
+    )
+    def test_css_to_xpath(self, css, xpath):
+        assert css_to_xpath(css) == xpath
+
+    @pytest.mark.parametrize("css", ["a:not(.tag)", "h1, h2", "div + p", "a::text"])
+    def test_css_to_xpath_unsupported(self, css):
+        """Неподдерживаемый селектор не переводится, парсер остаётся на bs4"""
+        assert css_to_xpath(css) is None
+
+    def test_lxml_ready(self):
+        for parser in (
+            HmangaParser,
+            HmangaPageParser,
+            MultiMangaParser,
+            NhentaiMangaParser,
+            HitomiMangaParser,
+            HitomiPageParser,
+        ):
+            assert parser.lxml_ready, parser.__name__
+
+
+class TestBackend:
+    """Движки bs4 и lxml дают одинаковый результат"""
+
+    @staticmethod
+    def dump(manga):
+        result = manga.model_dump()
+        result["genres"] = sorted(result["genres"])
+        return result
+
+    @pytest.mark.parametrize(
+        "parser, base_url, path",
+        [
+            (HmangaParser, "https://hmanga.my/", "test_templates/hamnga-1.html"),
+            (
+                MultiMangaParser,
+                "https://hmanga.my/",
+                "test_templates/multi-manga-1.html",
+            ),
+            (
+                NhentaiMangaParser,
+                "https://nhentai.net/",
+                "test_templates/nhentai-1.html",
+            ),
+            (HitomiMangaParser, "https://hitomi.si/", "test_templates/hitomi-1.html"),
+        ],
+    )
+    def test_manga(self, parser, base_url, path):
+        with open(path, "rb") as f:
+            markup = f.read()
+
+        soup = parser(base_url).parse(markup)
+        tree = parser(base_url, backend="lxml").parse(markup)
+
+        assert tree.genres
+        assert self.dump(soup) == self.dump(tree)
+
+    def test_page(self):
+        markup = """
+        <div class="container index-container">
+            <div class="gallery">
+                <a href="/manga/1"><img data-src="/1.jpg"><div class="caption">First</div></a>
+            </div>
+            <div class="gallery">
+                <a href="/manga/2"><img data-src="/2.jpg"><div class="caption">Second</div></a>
+            </div>
+            <div class="gallery"><span>Без ссылки</span></div>
+        </div>
+        """
+        soup = HmangaPageParser("https://hmanga.my/").parse(markup)
+        tree = HmangaPageParser("https://hmanga.my/", backend="lxml").parse(markup)
+
+        assert [x.title for x in tree] == ["First", "Second"]
+        assert soup == tree
+
+    def test_hitomi_page(self):
+        with open("test_templates/hitomi-page-1.html", "rb") as f:
+            markup = f.read()
+
+        soup = HitomiPageParser("https://hitomi.si/").parse(markup)
+        tree = HitomiPageParser("https://hitomi.si/", backend="lxml").parse(markup)
+
+        assert [x.title for x in tree] == ["夏日假期", "冬季假期", "秋叶"]
+        assert soup == tree
+
+    def test_invalid_backend(self):
+        with pytest.raises(AttributeError):
+            HmangaParser("https://hmanga.my/", backend="regex")
+
+    def test_invalid_html(self):
+        with pytest.raises(ParserError):
+            HmangaParser("https://hmanga.my/", backend="lxml").parse(
+                "<html><body>Invalid</body></html>"
+            )
+
+
+class TestParserRegistry:
+    @pytest_asyncio.fixture
+    async def session(self):
+        async with ClientSession() as session:
+            yield session
+
+    def test_shared(self):
+        """Один экземпляр на (класс, base_url, features, backend)"""
+        registry = ParserRegistry()
+        parser = registry.get(HmangaParser, "https://hmanga.my/", "html.parser")
+
+        assert registry.get(HmangaParser, "https://hmanga.my/", "html.parser") is parser
+        assert registry.get(HmangaParser, "https://hmanga.my/", "lxml") is not parser
+        assert (
+            registry.get(HmangaParser, "https://other.my/", "html.parser") is not parser
+        )
+        assert len(registry) == 3
+
+    def test_features_checked_once(self):
+        """Страница-пример разбирается один раз на движок"""
+        check_features.cache_clear()
+        for _ in range(5):
+            HmangaParser("https://hmanga.my/", "html.parser")
+
+        assert check_features.cache_info().misses == 1
+
+    @pytest.mark.asyncio
+    async def test_spider_parsers(self, session):
+        """Пауки с одинаковыми настройками используют одни и те же парсеры"""
+        first = HmangaSpider(session)
+        second = HmangaSpider(session)
+        nhentai = NhentaiSpider(session)
+
+        assert first.manga_parser is second.manga_parser
+        assert first.page_parser is parsers.get(
+            HmangaPageParser, HmangaSpider.BASE_URL, first.features
+        )
+        assert nhentai.manga_parser.base_url == NhentaiSpider.REAL_URL
+
+    @pytest.mark.asyncio
+    async def test_load_spiders_fails_fast(self, session):
+        """Неустановленный движок обнаруживается при загрузке пауков"""
+        with pytest.raises(FeatureNotFound):
+            load_spiders(session, features="not-installed")
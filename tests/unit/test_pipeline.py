@@ -0,0 +1,767 @@
+import sys
+import os
+import asyncio
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+import pytest_asyncio
+
+from aiohttp import ClientSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.abstract.alert import BaseAlert
+from src.core.abstract.spider import BaseSpider, RunContext, split_pages
+from src.core.entities.models import CrawlJob, Manga
+from src.core.entities.schemas import BaseManga, CheckpointSchema, MangaSchema
+from src.core.manager.checkpoint import CheckpointManager
+from src.core.manager.job import JobManager
+from src.core.manager.manga import MangaManager
+from src.core.manager.alert import AlertManager
+from src.core.manager.spider import SpiderManager, SpiderStarter
+from src.core.pipeline import Pipeline
+from src.core.worker import CrawlWorker, QueueConfig
+from src.spider.hmanga import HmangaSpider
+
+
+db_path = "test_templates/test-pipeline.db"
+
+
+async def source(items):
+    for item in items:
+        yield item
+
+
+class TestPipeline:
+    @pytest.mark.asyncio
+    async def test_stages(self):
+        """Элементы проходят все стадии, одна стадия может выдать несколько элементов"""
+        result = []
+
+        async def split(batch, emit):
+            for item in batch:
+                await emit(item)
+
+        async def double(item, emit):
+            await emit(item * 2)
+
+        async def collect(item, emit):
+            result.append(item)
+
+        stats = await (
+            Pipeline("test")
+            .stage("split", split)
+            .stage("double", double, workers=3)
+            .stage("collect", collect)
+            .run(source([[1, 2], [3], [], [4, 5]]))
+        )
+
+        assert sorted(result) == [2, 4, 6, 8, 10]
+        assert [x["processed"] for x in stats] == [4, 5, 5]
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self):
+        """Источник не читается дальше, пока очередь заполнена"""
+        produced = 0
+        release = asyncio.Event()
+
+        async def counting():
+            nonlocal produced
+            for item in range(100):
+                produced += 1
+                yield item
+
+        async def slow(item, emit):
+            await release.wait()
+
+        pipeline = Pipeline("test", maxsize=2).stage("slow", slow)
+        task = asyncio.create_task(pipeline.run(counting()))
+        await asyncio.sleep(0.05)
+
+        # 1 элемент у обработчика, 2 в очереди, 1 ждёт места в очереди
+        assert produced <= 4
+
+        release.set()
+        await task
+        assert produced == 100
+
+    @pytest.mark.asyncio
+    async def test_slow_item_does_not_block(self):
+        """Медленный элемент не останавливает остальные"""
+        done = []
+
+        async def work(item, emit):
+            await asyncio.sleep(0.2 if item == 0 else 0)
+            await emit(item)
+
+        async def collect(item, emit):
+            done.append(item)
+
+        await (
+            Pipeline("test")
+            .stage("work", work, workers=2)
+            .stage("collect", collect)
+            .run(source(range(5)))
+        )
+
+        assert done[-1] == 0
+        assert sorted(done) == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_errors(self):
+        """Ошибка обработчика считается, но не останавливает конвейер"""
+        result = []
+
+        async def work(item, emit):
+            if item == 2:
+                raise RuntimeError("ошибка")
+
+            result.append(item)
+
+        done = []
+
+        async def on_done(index):
+            done.append(index)
+
+        pipeline = Pipeline("test").stage("work", work)
+        stats = await pipeline.run(source(range(4)), on_done=on_done)
+
+        assert result == [0, 1, 3]
+        # Элемент с ошибкой и следующие за ним не отмечаются обработанными
+        assert done == [0, 1]
+        assert pipeline.failed
+        assert stats[0]["errors"] == 1
+        assert stats[0]["processed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_fatal(self):
+        """Fatal ошибка останавливает весь конвейер"""
+
+        async def work(item, emit):
+            raise KeyError(item)
+
+        async def never(item, emit):
+            raise AssertionError
+
+        pipeline = (
+            Pipeline("test", fatal=(KeyError,))
+            .stage("work", work)
+            .stage("never", never)
+        )
+        with pytest.raises(KeyError):
+            await asyncio.wait_for(pipeline.run(source(range(10))), 1)
+
+    @pytest.mark.asyncio
+    async def test_on_done_order(self):
+        """Элемент источника отмечается, когда обработаны все его потомки, по порядку"""
+        done = []
+
+        async def split(batch, emit):
+            for item in batch:
+                await emit(item)
+
+        async def work(item, emit):
+            await asyncio.sleep(item / 100)
+
+        async def on_done(index):
+            done.append(index)
+
+        await (
+            Pipeline("test")
+            .stage("split", split)
+            .stage("work", work, workers=4)
+            .run(source([[5, 1], [0], [], [2, 3]]), on_done=on_done)
+        )
+
+        assert done == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_batch(self):
+        """Стадия с batch получает элементы, которые уже ждут в очереди, списком"""
+        batches = []
+        done = []
+
+        async def split(batch, emit):
+            for item in batch:
+                await emit(item)
+
+        async def write(items, emit):
+            batches.append(items)
+
+        async def on_done(index):
+            done.append(index)
+
+        stats = await (
+            Pipeline("test")
+            .stage("split", split)
+            .stage("write", write, batch=3)
+            .run(source([[1, 2, 3, 4], [5]]), on_done=on_done)
+        )
+
+        assert sorted(x for batch in batches for x in batch) == [1, 2, 3, 4, 5]
+        assert all(1 <= len(batch) <= 3 for batch in batches)
+        assert stats[1]["processed"] == 5
+        assert done == [0, 1]
+
+        with pytest.raises(ValueError):
+            Pipeline("test").stage("write", write, batch=3).stage("split", split)
+
+    @pytest.mark.asyncio
+    async def test_source_error(self):
+        """Ошибка источника пробрасывается"""
+
+        async def broken():
+            yield 1
+            raise ValueError("источник")
+
+        async def work(item, emit):
+            pass
+
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(
+                Pipeline("test").stage("work", work).run(broken()), 1
+            )
+
+
+class FakeSpider(BaseSpider):
+    BASE_URL = "https://example.com"
+    HEAD_STOP_AFTER = 3
+
+    def __init__(
+        self, *args, total_pages: int = 10, hang_on: int | None = None, **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self.total_pages = total_pages
+        self.hang_on = hang_on
+        self.fetched_pages: list[int] = []
+        self.genres: dict[str, list[str]] = {}
+        self.max_contexts = 0
+
+    async def get(self, url: str, **kwargs) -> MangaSchema | None:
+        number = url.rsplit("/", 1)[-1]
+        if number == str(self.hang_on):
+            # Имитация зависшей загрузки, паук будет остановлен
+            await asyncio.Event().wait()
+
+        return MangaSchema(
+            title=f"Manga {number}",
+            url=url,
+            poster="https://example.com/poster.jpg",
+            gallery=["https://example.com/gallery/1.jpg"],
+            genres=self.genres.get(number, []),
+        )
+
+    async def page_total(self):
+        return self.total_pages
+
+    async def pages(
+        self, start_page=None, stop_unchanged=False, end_page=None, batch=None
+    ):
+        context = RunContext(start_page or 1, end_page or self.total_pages)
+        self.contexts.append(context)
+        self.max_contexts = max(self.max_contexts, len(self.contexts))
+        try:
+            async for manga_batch in self._pages(context, batch or self.batch):
+                yield manga_batch
+        finally:
+            self.contexts.remove(context)
+
+    async def _pages(self, context, batch):
+        # 2 манги на странице, на первой странице самая новая.
+        # Как и BaseMangaSpider, страницы загружаются пачками по batch
+        for page in range(context.start, context.end + 1):
+            await asyncio.sleep(0)
+            if (page - context.start) % batch == 0:
+                self.fetched_pages.extend(
+                    range(page, min(page + batch, context.end + 1))
+                )
+
+            self.page = page
+            context.processed += 1
+            yield [
+                BaseManga(
+                    title=f"Manga {number}",
+                    url=f"https://example.com/manga/{number}",
+                    poster="https://example.com/poster.jpg",
+                )
+                for number in (page * 2, page * 2 + 1)
+            ]
+
+
+@pytest_asyncio.fixture
+async def engine():
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Manga.metadata.create_all)
+
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+@pytest_asyncio.fixture
+async def manager(engine):
+    return MangaManager(engine)
+
+
+@pytest_asyncio.fixture
+async def checkpoint(engine):
+    return CheckpointManager(engine)
+
+
+@pytest_asyncio.fixture
+async def jobs(engine):
+    return JobManager(engine)
+
+
+@pytest_asyncio.fixture
+async def session():
+    async with ClientSession() as session:
+        yield session
+
+
+class TestHeadScan:
+    @pytest.mark.asyncio
+    async def test_head_stops_at_known(self, manager, session):
+        """Head-сканирование добавляет новую мангу и останавливается на известной"""
+        spider = FakeSpider(session, manager)
+        for number in range(6, 22):
+            await manager.add_manga(await spider.get(f"https://example.com/{number}"))
+
+        await spider.head()
+
+        assert await manager.get_total() == 16 + 4
+        assert await manager.in_database(await spider.get("https://example.com/2"))
+        # Манга 6, 7 (страница 3) и 8 (страница 4) известна, дальше страницы не загружаются
+        assert spider.batch == FakeSpider.BASE_BATCH
+        assert spider.fetched_pages == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_head_stop_after_override(self, manager, session):
+        """Порог остановки задаётся для каждого паука отдельно"""
+        spider = FakeSpider(session, manager, head_stop_after={"FakeSpider": 100})
+        other = FakeSpider(session, manager, head_stop_after={"OtherSpider": 100})
+
+        assert spider.head_stop_after == 100
+        assert other.head_stop_after == FakeSpider.HEAD_STOP_AFTER
+
+
+class TestUpdate:
+    @pytest.mark.asyncio
+    async def test_skip_unchanged(self, manager, session):
+        """Обновление записывает только мангу, содержимое которой изменилось"""
+        spider = FakeSpider(session, manager, total_pages=3)
+        await spider.run()
+        assert await manager.get_total() == 6
+
+        spider.genres = {"3": ["Новый жанр"], "6": ["Новый жанр"]}
+        spider.total_pages = 4
+        stats = await spider.update()
+
+        assert stats == {"new": 2, "changed": 2, "unchanged": 4}
+        manga = await manager.get_manga_by_url("https://example.com/manga/3")
+        assert [x.name for x in manga.genres] == ["Новый жанр"]
+
+        assert await spider.update() == {"new": 0, "changed": 0, "unchanged": 8}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_sku(self, manager, session):
+        """Манга, которая повторилась в листинге, не записывается второй раз"""
+
+        class ShiftedSpider(FakeSpider):
+            async def _pages(self, context, batch):
+                async for manga_batch in super()._pages(context, batch):
+                    yield manga_batch
+                    # Страницы сдвинулись: последняя манга повторяется на следующей
+                    yield manga_batch[-1:]
+
+        await FakeSpider(session, manager, total_pages=3).run()
+
+        spider = ShiftedSpider(session, manager, total_pages=4)
+        spider.genres = {"3": ["Новый жанр"]}
+        stats = await spider.update()
+
+        assert stats == {"new": 2, "changed": 1, "unchanged": 9}
+        assert not spider.pipeline.failed
+        assert await manager.get_total() == 8
+
+
+class TestShards:
+    def test_split_pages(self):
+        """Диапазон делится на непрерывные части, остаток уходит в первые части"""
+        assert split_pages(1, 10, 3) == [(1, 4), (5, 7), (8, 10)]
+        assert split_pages(5, 6, 4) == [(5, 5), (6, 6)]
+        assert split_pages(3, 2, 2) == []
+
+    @pytest.mark.asyncio
+    async def test_run_sharded(self, manager, checkpoint, session):
+        """Части проходятся одновременно и вместе покрывают все страницы"""
+        spider = FakeSpider(session, manager, checkpoint=checkpoint, total_pages=9)
+        await spider.run_sharded(3)
+
+        assert sorted(spider.fetched_pages) == list(range(1, 10))
+        assert spider.max_contexts == 3
+        assert spider.contexts == []
+        assert await manager.get_total() == 18
+        # Прогресс частей не сохраняется
+        assert await checkpoint.get("FakeSpider") is None
+
+    @pytest.mark.asyncio
+    async def test_status(self, session):
+        """Прогресс частей суммируется в status"""
+        spider = HmangaSpider(session)
+        first, second = RunContext(1, 10), RunContext(11, 20)
+        first.processed, second.processed = 5, 10
+        spider.contexts.extend([first, second])
+
+        assert spider.status == "75% - 15/20"
+
+
+class FakeAlert(BaseAlert):
+    def __init__(self):
+        self.messages: list[str] = []
+
+    async def alert(self, message, level):
+        self.messages.append(message)
+        return True
+
+
+async def wait_method(starter, spider, method):
+    while starter.methods.get(spider) != method:
+        await asyncio.sleep(0.01)
+
+
+class TestStarter:
+    @pytest.mark.asyncio
+    async def test_full_crawl_stops_head(self, manager, session):
+        """Полное сканирование останавливает head-сканирование, а не пропускается"""
+        alert = FakeAlert()
+        spider = FakeSpider(session, manager, total_pages=1, hang_on=3)
+        starter = SpiderStarter([spider], AlertManager(alert))
+        await manager.add_manga(await spider.get("https://example.com/2"))
+
+        # Head-сканирование зависает на загрузке манги 3, записывать ему нечего
+        head = asyncio.create_task(starter.head_spider(spider, alert=False))
+        await asyncio.wait_for(wait_method(starter, spider, "head"), 1)
+
+        spider.hang_on = None
+        spider.total_pages = 3
+        await asyncio.wait_for(starter.start_spider(spider, resume=False), 5)
+
+        assert head.done()
+        assert await manager.get_total() == 6
+        assert starter.spiders[spider] is None
+        assert starter.methods == {}
+        # О head-сканировании не оповещаем, только о полном
+        assert sum("начал свою работу" in x for x in alert.messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_head_parsing_keeps_other_runs(self, manager, session):
+        """Head-сканирование не трогает пауков, запущенных не им"""
+        spider_manager = SpiderManager(session, manager=manager)
+        free = FakeSpider(session, manager, total_pages=1, hang_on=3)
+        busy = FakeSpider(session, manager)
+        spider_manager.spiders = [free, busy]
+        spider_manager._starter = starter = SpiderStarter([free, busy])
+        await manager.add_manga(await free.get("https://example.com/2"))
+
+        # Другой запуск паука (например полное сканирование)
+        starter.spiders[busy] = run = asyncio.create_task(asyncio.Event().wait())
+
+        # Отмена head-сканирования останавливает только его пауков
+        head = asyncio.create_task(spider_manager.start_head_parsing())
+        await asyncio.wait_for(wait_method(starter, free, "head"), 1)
+        head.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await head
+
+        assert starter.spiders[free] is None
+        assert not run.done()
+
+        # Head-сканирование закончилось само
+        free.hang_on = None
+        await asyncio.wait_for(spider_manager.start_head_parsing(), 5)
+        assert await manager.get_total() == 2
+        assert starter.spiders[free] is None
+        assert starter.spiders[busy] is run and not run.done()
+
+        run.cancel()
+
+
+class TestCheckpoint:
+    @pytest.mark.asyncio
+    async def test_save(self, checkpoint):
+        """Прогресс сохраняется, перезаписывается и удаляется"""
+        assert await checkpoint.get("FakeSpider") is None
+
+        await checkpoint.save(CheckpointSchema(spider="FakeSpider", run_id="a", page=1))
+        await checkpoint.save(CheckpointSchema(spider="FakeSpider", run_id="b", page=2))
+        result = await checkpoint.get("FakeSpider")
+        assert result.page == 2
+        assert result.run_id == "b"
+
+        await checkpoint.clear("FakeSpider")
+        assert await checkpoint.get("FakeSpider") is None
+
+    @pytest.mark.asyncio
+    async def test_resume(self, manager, checkpoint, session):
+        """После остановки парсинг продолжается с последней записанной страницы"""
+        spider = FakeSpider(
+            session, manager, batch=1, checkpoint=checkpoint, total_pages=6, hang_on=9
+        )
+        saved_page = asyncio.Event()
+        written_all = asyncio.Event()
+        save = checkpoint.save
+        add_many_manga = manager.add_many_manga
+        written = 0
+
+        async def on_save(schema):
+            await save(schema)
+            if schema.page == 3:
+                saved_page.set()
+
+        async def on_write(mangas):
+            nonlocal written
+            result = await add_many_manga(mangas)
+            written += len(mangas)
+            # Манга 2-8 записана, дальше загрузка стоит на манге 9: отмена не прервёт запись
+            if written == 7:
+                written_all.set()
+
+            return result
+
+        checkpoint.save = on_save
+        manager.add_many_manga = on_write
+        task = asyncio.create_task(spider.run())
+        await asyncio.wait_for(saved_page.wait(), 10)
+        await asyncio.wait_for(written_all.wait(), 10)
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Манга 9 на 4 странице зависла, записаны только страницы 1-3
+        saved = await checkpoint.get("FakeSpider")
+        assert saved.page == 3
+
+        manager.add_many_manga = add_many_manga
+        spider.hang_on = None
+        spider.fetched_pages.clear()
+        await spider.run(resume=True)
+
+        assert spider.fetched_pages[0] == saved.page + 1
+        assert await manager.get_total() == 12
+        assert await checkpoint.get("FakeSpider") is None
+
+    @pytest.mark.asyncio
+    async def test_write_error(self, manager, checkpoint, session):
+        """Ошибка записи не сдвигает прогресс дальше страницы, манга которой не записана"""
+        spider = FakeSpider(
+            session, manager, batch=1, checkpoint=checkpoint, total_pages=6
+        )
+        add_many_manga = manager.add_many_manga
+
+        async def broken(mangas):
+            if any(str(x.url).endswith("/7") for x in mangas):
+                raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+            return await add_many_manga(mangas)
+
+        manager.add_many_manga = broken
+        await spider.run()
+
+        # Манга 7 на 3 странице не записана
+        saved = await checkpoint.get("FakeSpider")
+        assert saved is not None and saved.page < 3
+        assert spider.pipeline.failed
+
+        manager.add_many_manga = add_many_manga
+        spider.fetched_pages.clear()
+        await spider.run(resume=True)
+
+        assert spider.fetched_pages[0] == saved.page + 1
+        assert await manager.get_total() == 12
+        assert await checkpoint.get("FakeSpider") is None
+
+    @pytest.mark.asyncio
+    async def test_integrity_error(self, manager, checkpoint, session):
+        """Ошибка данных одной манги не теряет остальную мангу пачки"""
+        spider = FakeSpider(session, manager, checkpoint=checkpoint, total_pages=3)
+        add_many_manga, add_manga = manager.add_many_manga, manager.add_manga
+
+        async def broken_many(mangas):
+            if any(str(x.url).endswith("/5") for x in mangas):
+                raise IntegrityError("INSERT", {}, Exception("constraint failed"))
+
+            return await add_many_manga(mangas)
+
+        async def broken(manga):
+            if str(manga.url).endswith("/5"):
+                raise IntegrityError("INSERT", {}, Exception("constraint failed"))
+
+            return await add_manga(manga)
+
+        manager.add_many_manga, manager.add_manga = broken_many, broken
+        await spider.run()
+
+        # Не записана только манга 5
+        assert await manager.get_total() == 5
+        assert spider.pipeline.failed
+        saved = await checkpoint.get("FakeSpider")
+        assert saved is None or saved.page < 2
+
+        manager.add_many_manga, manager.add_manga = add_many_manga, add_manga
+        await spider.run(resume=True)
+        assert await manager.get_total() == 6
+
+
+class TestQueue:
+    @pytest.mark.asyncio
+    async def test_jobs(self, jobs):
+        """Задача не дублируется, выдаётся одному воркеру и возвращается в очередь при ошибке"""
+        batch = [
+            BaseManga(
+                title=f"Manga {number}",
+                url=f"https://example.com/manga/{number}",
+                poster="https://example.com/poster.jpg",
+            )
+            for number in range(3)
+        ]
+
+        assert await jobs.enqueue("FakeSpider", batch) == 3
+        assert await jobs.enqueue("FakeSpider", batch) == 0
+
+        first = await jobs.claim("first", limit=2)
+        second = await jobs.claim("second", limit=2)
+        assert [x.url for x in first] == [str(x.url) for x in batch[:2]]
+        assert [x.url for x in second] == [str(batch[2].url)]
+        assert await jobs.claim("third") == []
+
+        assert await jobs.complete(first[0].id, "first")
+        assert await jobs.fail(first[1].id, "first", "ошибка", max_attempts=1)
+        assert await jobs.release("second") == 1
+        assert await jobs.stats() == {"done": 1, "failed": 1, "pending": 1}
+
+        # Выполненная задача возвращается в очередь при повторном добавлении
+        assert await jobs.enqueue("FakeSpider", batch[:1]) == 1
+
+    @pytest.mark.asyncio
+    async def test_lock_timeout(self, jobs):
+        """Задача упавшего воркера отдаётся снова после lock_timeout"""
+        manga = BaseManga(
+            title="Manga",
+            url="https://example.com/manga/1",
+            poster="https://example.com/poster.jpg",
+        )
+        await jobs.enqueue("FakeSpider", [manga])
+        assert len(await jobs.claim("dead")) == 1
+
+        assert await jobs.claim("alive", lock_timeout=60) == []
+        retry = await jobs.claim("alive", lock_timeout=0)
+        assert retry[0].attempts == 2
+
+        # Упавший воркер не может отметить задачу, которую уже выполняет другой
+        assert not await jobs.complete(retry[0].id, "dead")
+        assert not await jobs.fail(retry[0].id, "dead", "ошибка")
+        assert await jobs.stats() == {"running": 1}
+
+        # Брошенная задача без попыток не отдаётся снова, а проваливается
+        assert await jobs.claim("third", lock_timeout=0, max_attempts=2) == []
+        assert await jobs.stats() == {"failed": 1}
+
+    @pytest.mark.asyncio
+    async def test_updated_at(self, jobs, engine):
+        """updated_at меняется при взятии и завершении задачи"""
+        manga = BaseManga(
+            title="Manga",
+            url="https://example.com/manga/1",
+            poster="https://example.com/poster.jpg",
+        )
+        await jobs.enqueue("FakeSpider", [manga])
+
+        async def updated_at():
+            async with jobs.Session() as session:
+                return await session.scalar(select(CrawlJob.updated_at))
+
+        created = await updated_at()
+        job = (await jobs.claim("worker"))[0]
+        claimed = await updated_at()
+        assert claimed > created
+
+        await jobs.complete(job.id, "worker")
+        assert await updated_at() > claimed
+
+    @pytest.mark.asyncio
+    async def test_enqueue_and_work(self, jobs, manager, session):
+        """Паук только добавляет задачи, мангу загружает и записывает воркер"""
+        spider = FakeSpider(session, manager, jobs=jobs, total_pages=3)
+        await manager.add_manga(await spider.get("https://example.com/manga/2"))
+
+        await spider.run()
+        assert await manager.get_total() == 1
+        assert await jobs.stats() == {"pending": 5}
+
+        worker = CrawlWorker(
+            jobs, manager, [FakeSpider(session, manager)], QueueConfig(concurrency=2)
+        )
+        await worker.run(once=True)
+
+        assert worker.stats == {"done": 5, "failed": 0}
+        assert await manager.get_total() == 6
+        assert await jobs.stats() == {"done": 5}
+
+    @pytest.mark.asyncio
+    async def test_head_enqueue(self, jobs, manager, session):
+        """Head-сканирование с очередью тоже только добавляет задачи"""
+        spider = FakeSpider(session, manager, jobs=jobs)
+        for number in range(6, 22):
+            await manager.add_manga(await spider.get(f"https://example.com/{number}"))
+
+        spider.hang_on = 2
+        await asyncio.wait_for(spider.head(), 5)
+
+        assert await manager.get_total() == 16
+        assert await jobs.stats() == {"pending": 4}
+        assert spider.fetched_pages == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_complete_error(self, jobs, manager, session):
+        """Ошибка при завершении задачи не останавливает воркер, задача остаётся в работе"""
+        spider = FakeSpider(session, manager)
+        await jobs.enqueue(
+            "FakeSpider",
+            [
+                BaseManga(
+                    title=f"Manga {number}",
+                    url=f"https://example.com/manga/{number}",
+                    poster="https://example.com/poster.jpg",
+                )
+                for number in range(2)
+            ],
+        )
+
+        complete = jobs.complete
+
+        async def broken(job_id, worker):
+            if job_id == 1:
+                raise OperationalError("UPDATE", {}, Exception("database is locked"))
+
+            return await complete(job_id, worker)
+
+        jobs.complete = broken
+        worker = CrawlWorker(jobs, manager, [spider], QueueConfig(concurrency=1))
+        await worker.run(once=True)
+
+        assert worker.stats == {"done": 1, "failed": 0}
+        assert await manager.get_total() == 2
+        # Воркер остановлен, незавершённая задача возвращена в очередь
+        assert await jobs.stats() == {"done": 1, "pending": 1}
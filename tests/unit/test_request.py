@@ -0,0 +1,636 @@
+import sys
+import os
+import asyncio
+import time
+
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import pytest
+import pytest_asyncio
+
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from loguru import logger
+
+from src.core.manager.request import RequestManager
+from src.core.network import (
+    ConnectionPool,
+    HostLimit,
+    HostLimiter,
+    HostScheduler,
+    FixedPacing,
+    JitterPacing,
+    AdaptivePacing,
+    create_pacing,
+    get_host,
+    parse_retry_after,
+    ResponseCache,
+    ProxyPool,
+    HeaderPool,
+)
+from src.core.entities.schemas import ProxySchema
+
+
+class TestHostScheduler:
+    @pytest.fixture
+    def scheduler(self):
+        return HostScheduler(
+            2, limits={"slow.example.com": HostLimit(max_concurrent=1, rps=20)}
+        )
+
+    def test_get_host(self):
+        assert get_host("https://Example.com/page/1/") == "example.com"
+        assert get_host("example.com") == "example.com"
+
+    def test_config_has_priority(self, scheduler):
+        """Лимиты из конфигурации не перезаписываются пауком"""
+        scheduler.set_limit("https://slow.example.com/h/", HostLimit(max_concurrent=8))
+        assert scheduler.get("slow.example.com").max_concurrent == 1
+
+    @pytest.mark.asyncio
+    async def test_hosts_do_not_share_slots(self, scheduler):
+        """Медленный хост не занимает слоты остальных"""
+        async with scheduler.slot("https://slow.example.com/1"):
+            start = time.monotonic()
+            async with scheduler.slot("https://fast.example.com/1"):
+                pass
+            assert time.monotonic() - start < 0.05
+
+            stats = {x["host"]: x for x in scheduler.stats}
+            assert stats["slow.example.com"]["active"] == 1
+            assert stats["fast.example.com"]["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent(self, scheduler):
+        """Количество одновременных запросов к хосту не превышает лимит"""
+        active = 0
+        peak = 0
+
+        async def request():
+            nonlocal active, peak
+            async with scheduler.slot("https://fast.example.com/"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+        assert peak == 2
+        assert scheduler.get("fast.example.com").stats["total"] == 6
+
+    @pytest.mark.asyncio
+    async def test_rps(self, scheduler):
+        """Бюджет запросов в секунду соблюдается"""
+        start = time.monotonic()
+        for _ in range(3):
+            async with scheduler.slot("https://slow.example.com/"):
+                pass
+
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter(self, scheduler):
+        """Отменённый запрос не занимает слот"""
+        async with scheduler.slot("https://slow.example.com/"):
+            task = asyncio.create_task(
+                scheduler.get("slow.example.com").acquire(), name="waiter"
+            )
+            await asyncio.sleep(0)
+            assert scheduler.get("slow.example.com").stats["queue"] == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert scheduler.get("slow.example.com").stats["active"] == 0
+
+
+class TestAdaptiveLimit:
+    def test_parse_retry_after(self):
+        assert parse_retry_after("120") == 120
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+        assert parse_retry_after("garbage") is None
+        assert parse_retry_after(None) is None
+
+    def test_aimd(self):
+        """Лимит растёт на единицу за окно удачных ответов и падает вдвое при ограничении"""
+        limiter = HostLimiter("example.com", 2, max_limit=4)
+        for _ in range(3):
+            limiter.success()
+        assert limiter.max_concurrent == 3
+
+        for _ in range(100):
+            limiter.success()
+        assert limiter.max_concurrent == 4
+
+        limiter.throttle()
+        limiter.throttle()
+        assert limiter.max_concurrent == 2
+        assert limiter.stats["throttled"] == 2
+
+    def test_not_adaptive(self):
+        limiter = HostLimiter("example.com", 2)
+        limiter.success()
+        limiter.throttle()
+        assert limiter.max_concurrent == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after(self):
+        """Ответ 429 с Retry-After приостанавливает запросы к хосту"""
+        responses = iter(
+            [
+                FakeResponse(b"", status=429, headers={"Retry-After": "1"}),
+                FakeResponse(b"page"),
+            ]
+        )
+        session = FakeSession(handler=lambda url, kw: next(responses))
+        http = RequestManager(
+            session, max_concurrent=4, sleep_time=0.01, use_random=False
+        )
+
+        start = time.monotonic()
+        assert await http.get("https://example.com/", "read") == b"page"
+        assert time.monotonic() - start >= 1
+
+        stats = http.host_stats[0]
+        assert stats["max_concurrent"] == 2
+        assert stats["throttled"] == 1
+
+
+class TestPacing:
+    def test_create_pacing(self):
+        assert isinstance(create_pacing("fixed", 1), FixedPacing)
+        assert isinstance(create_pacing("jitter", 1), JitterPacing)
+        assert isinstance(create_pacing("adaptive", 1), AdaptivePacing)
+        with pytest.raises(KeyError):
+            create_pacing("unknown", 1)
+
+    def test_backoff(self):
+        """Откат растёт экспоненциально, но не больше максимума"""
+        pacing = FixedPacing(1, max_delay=5)
+        assert [pacing.backoff(x) for x in range(1, 5)] == [1, 2, 4, 5]
+
+    def test_adaptive(self):
+        """Адаптивная задержка растёт при ошибках и возвращается к базовой"""
+        pacing = AdaptivePacing(1, max_delay=10)
+        pacing.failure()
+        pacing.failure()
+        assert pacing.interval() == 4
+        for _ in range(50):
+            pacing.success()
+        assert pacing.interval() == 1
+
+    @pytest.mark.asyncio
+    async def test_pace_does_not_hold_slot(self):
+        """Пока запрос ждёт задержку, слот хоста свободен"""
+        scheduler = HostScheduler(1, pacing=FixedPacing(0.1))
+        limiter = scheduler.get("example.com")
+
+        await limiter.pace()
+        waiting = asyncio.create_task(limiter.pace())
+        await asyncio.sleep(0.01)
+
+        assert not waiting.done()
+        start = time.monotonic()
+        async with scheduler.slot("example.com"):
+            assert time.monotonic() - start < 0.05
+
+        await waiting
+
+    @pytest.mark.asyncio
+    async def test_pace_ignores_adaptive_limit(self):
+        """Рост адаптивного лимита не сокращает задержку между запросами"""
+        limiter = HostLimiter("example.com", 1, pacing=FixedPacing(0.2), max_limit=4)
+        for _ in range(100):
+            limiter.success()
+        assert limiter.max_concurrent == 4
+
+        await limiter.pace()
+        start = time.monotonic()
+        await limiter.pace()
+        assert time.monotonic() - start >= 0.15
+
+
+class TestProxyPool:
+    @pytest.fixture
+    def proxies(self):
+        return [ProxySchema(proxy=f"http://10.0.0.{x}:8080") for x in range(3)]
+
+    def test_weighted_choice(self, proxies):
+        """Быстрый прокси выбирается чаще медленного"""
+        pool = ProxyPool(proxies[:2])
+        for _ in range(5):
+            pool.success(proxies[0], 0.1, 1000)
+            pool.success(proxies[1], 2.0, 1000)
+
+        chosen = [pool.choose() for _ in range(500)]
+        assert chosen.count(proxies[0]) > chosen.count(proxies[1]) * 5
+
+    def test_quarantine_and_probe(self, proxies):
+        """После карантина прокси проверяется пробным запросом"""
+        pool = ProxyPool(proxies[:1], max_chance=2, quarantine=0.01)
+        pool.failure(proxies[0])
+        assert pool.is_available(proxies[0])
+
+        pool.failure(proxies[0])
+        assert not pool.is_available(proxies[0])
+        assert pool.choose() is None
+
+        time.sleep(0.02)
+        assert pool.choose() == proxies[0]
+        pool.failure(proxies[0])
+        assert pool.stats[0]["bans"] == 2
+        assert pool.stats[0]["quarantine"] > 0
+
+        time.sleep(0.03)
+        assert pool.choose() == proxies[0]
+        pool.success(proxies[0], 0.1)
+        assert pool.is_available(proxies[0])
+
+    def test_ban_disabled(self, proxies):
+        pool = ProxyPool(proxies[:1], max_chance=1, ban=False)
+        pool.failure(proxies[0])
+        assert pool.choose() == proxies[0]
+
+    def test_pin_host(self, proxies):
+        """За хостом закрепляется прокси, после ошибки закрепление снимается"""
+        pool = ProxyPool(proxies)
+        pool.success(proxies[1], 0.5, host="example.com")
+
+        assert all(pool.choose("example.com") == proxies[1] for _ in range(20))
+        assert pool.stats[1]["hosts"] == ["example.com"]
+
+        pool.failure(proxies[1], "example.com")
+        assert pool.stats[1]["hosts"] == []
+
+
+class TestHeaderPool:
+    def test_sticky(self):
+        """Профиль закреплён за парой (прокси, хост)"""
+        pool = HeaderPool(8)
+        first = pool.get("http://10.0.0.1:8080", "example.com")
+        assert all(
+            pool.get("http://10.0.0.1:8080", "example.com") is first for _ in range(20)
+        )
+        assert {"User-Agent", "Accept-Language", "Accept-Encoding"} <= set(first)
+
+    def test_rotate(self):
+        """После бана профиль меняется"""
+        pool = HeaderPool(8)
+        first = pool.get(None, "example.com")
+        pool.rotate(None, "example.com")
+        assert pool.get(None, "example.com") is not first
+
+    def test_single_profile(self):
+        pool = HeaderPool(1)
+        pool.rotate(None, "example.com")
+        assert pool.get(None, "example.com") is pool.profiles[0]
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        body: bytes,
+        status: int = 200,
+        headers: dict | None = None,
+        delay: float = 0,
+    ):
+        self.body = body
+        self.status = status
+        self.headers = headers or {}
+        self.delay = delay
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise ClientResponseError(
+                None, (), status=self.status, message="error", headers=self.headers
+            )
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self) -> str:
+        return self.body.decode()
+
+
+class FakeSession:
+    """Сессия без сети, ответ формирует handler"""
+
+    def __init__(self, delay: float = 0, handler=None):
+        self.delay = delay
+        self.handler = handler or (lambda url, kw: FakeResponse(url.encode()))
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        response = self.handler(url, kwargs)
+        response.delay = self.delay
+        return response
+
+
+class TestRequestManager:
+    @pytest.fixture
+    def session(self):
+        return FakeSession(delay=0.05)
+
+    @pytest.fixture
+    def http(self, session):
+        return RequestManager(session, sleep_time=0.01, use_random=False)
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self, http, session):
+        """Одинаковые одновременные запросы идут в сеть один раз"""
+        results = await asyncio.gather(
+            *(http.get("https://example.com/", "read") for _ in range(5))
+        )
+
+        assert len(session.calls) == 1
+        assert len(set(results)) == 1
+        assert http.flight.coalesced == 4
+        assert http.flight.inflight == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_key_by_type(self, http, session):
+        """text и read не делят одну запись кэша"""
+        text = await http.get("https://example.com/", "text")
+        data = await http.get("https://example.com/", "read")
+
+        assert isinstance(text, str)
+        assert isinstance(data, bytes)
+        assert len(session.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_one_waiter(self, http, session):
+        """Отмена одного ожидающего не отменяет общий запрос"""
+        first = asyncio.create_task(http.get("https://example.com/", "read"))
+        second = asyncio.create_task(http.get("https://example.com/", "read"))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        assert await second is not None
+        assert len(session.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_conditional_get(self):
+        """Ответ 304 отдаёт тело из кэша и помечает страницу неизменённой"""
+
+        def handler(url, kw):
+            if kw["headers"].get("If-None-Match") == '"v1"':
+                return FakeResponse(b"", status=304)
+            return FakeResponse(b"page", headers={"ETag": '"v1"'})
+
+        session = FakeSession(handler=handler)
+        http = RequestManager(session, sleep_time=0.01, use_random=False, ttl=0.01)
+
+        assert await http.get("https://example.com/", "read") == b"page"
+        assert not http.is_unchanged("https://example.com/")
+        await asyncio.sleep(0.02)
+
+        assert await http.get("https://example.com/", "read") == b"page"
+        assert http.is_unchanged("https://example.com/")
+        assert session.calls[1][2]["headers"]["If-None-Match"] == '"v1"'
+        assert http.cache_stats["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_probe_non_200(self):
+        """Пробный запрос с ответом 404 или 5xx не оставляет прокси без следующей проверки"""
+        proxy = ProxySchema(proxy="http://10.0.0.1:8080")
+        session = FakeSession(handler=lambda url, kw: FakeResponse(b"", status=500))
+        http = RequestManager(
+            session,
+            sleep_time=0.01,
+            use_random=False,
+            max_retries=1,
+            proxy=[proxy],
+            ban_proxy=True,
+            proxy_quarantine=0.01,
+        )
+        http.ban_proxy(http.get_proxy())
+        await asyncio.sleep(0.02)
+
+        assert await http.get("https://example.com/1", "read") is None
+        assert session.calls[-1][2]["proxy"] == proxy.proxy
+        assert not http.proxy.stats[0]["available"]
+
+        session.handler = lambda url, kw: FakeResponse(b"", status=404)
+        assert await http.get("https://example.com/2", "read") is None
+        assert session.calls[-1][2]["proxy"] == proxy.proxy
+
+        session.handler = lambda url, kw: FakeResponse(b"page")
+        assert await http.get("https://example.com/3", "read") == b"page"
+        assert http.proxy.stats[0]["available"]
+
+    def test_unchanged_bounded(self, http):
+        """Менеджер помнит только последние UNCHANGED_SIZE страниц, ответивших 304"""
+        http.UNCHANGED_SIZE = 2
+        for page in range(3):
+            http.set_unchanged(f"https://example.com/{page}", True)
+
+        assert not http.is_unchanged("https://example.com/0")
+        assert http.is_unchanged("https://example.com/2")
+        assert len(http.unchanged) == 2
+
+        http.set_unchanged("https://example.com/2", False)
+        assert not http.is_unchanged("https://example.com/2")
+
+    @pytest.mark.asyncio
+    async def test_headers_profile(self, http, session):
+        """Запросы к одному хосту идут с одним User-Agent, 403 меняет профиль"""
+        await http.get("https://example.com/1", "read")
+        await http.get("https://example.com/2", "read")
+        agents = {x[2]["headers"]["User-Agent"] for x in session.calls}
+        assert len(agents) == 1
+
+        session.handler = lambda url, kw: FakeResponse(b"", status=403)
+        before = session.calls[-1][2]["headers"]
+        await http.get("https://example.com/3", "read")
+        await http.get("https://example.com/4", "read")
+        assert session.calls[-1][2]["headers"] is not before
+
+
+class TestResponseCache:
+    @pytest.mark.asyncio
+    async def test_bytes_bound(self):
+        """Кэш ограничен по байтам, а не по количеству записей"""
+        cache = ResponseCache(maxsize=100, ttl=60)
+        for i in range(5):
+            await cache.set(str(i), b"x" * 30)
+
+        assert cache.stats["memory_bytes"] <= 100
+        assert cache.stats["memory_items"] == 3
+        assert cache.stats["evictions"] == 2
+        assert await cache.get("0") is None
+        assert await cache.get("4") == b"x" * 30
+
+    @pytest.mark.asyncio
+    async def test_lru(self):
+        """Недавно использованная запись не вытесняется"""
+        cache = ResponseCache(maxsize=60, ttl=60)
+        await cache.set("a", b"x" * 30)
+        await cache.set("b", b"x" * 30)
+        await cache.get("a")
+        await cache.set("c", b"x" * 30)
+
+        assert await cache.get("a") is not None
+        assert await cache.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_ttl(self):
+        cache = ResponseCache(maxsize=100, ttl=60)
+        await cache.set("a", b"data", ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        assert await cache.get("a") is None
+        assert cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_survives_restart(self, tmp_path):
+        """Кэш на диске доступен после перезапуска"""
+        cache = ResponseCache(maxsize=100, ttl=60, directory=str(tmp_path))
+        await cache.set("a", b"page")
+        await cache.set("b", {"json": True})
+
+        restarted = ResponseCache(maxsize=100, ttl=60, directory=str(tmp_path))
+        assert await restarted.get("a") == b"page"
+        assert await restarted.get("b") == {"json": True}
+        assert restarted.stats["disk_hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_disk_bound(self, tmp_path):
+        cache = ResponseCache(
+            maxsize=100, ttl=60, directory=str(tmp_path), disk_maxsize=200
+        )
+        for i in range(10):
+            await cache.set(str(i), b"x" * 50)
+
+        assert cache.stats["disk_bytes"] <= 200
+        assert len(list(tmp_path.iterdir())) == cache.stats["disk_items"]
+
+    @pytest.mark.asyncio
+    async def test_stale_with_validators(self, tmp_path):
+        """Устаревшая запись с валидаторами остаётся для условного запроса"""
+        cache = ResponseCache(maxsize=100, ttl=60, directory=str(tmp_path))
+        await cache.set("a", b"page", ttl=0.01, validators={"ETag": '"v1"'})
+        await cache.set("b", b"page", ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        restarted = ResponseCache(maxsize=100, ttl=60, directory=str(tmp_path))
+        assert await restarted.get("a") is None
+        assert await restarted.get("b") is None
+
+        stale = await restarted.get_stale("a")
+        assert stale is not None and stale.validators == {"ETag": '"v1"'}
+        assert await restarted.get_stale("b") is None
+
+        await restarted.refresh("a", stale)
+        assert await restarted.get("a") == b"page"
+
+
+class TestCassette:
+    @pytest.mark.asyncio
+    async def test_record_replay(self, tmp_path):
+        """Записанные ответы отдаются без обращения к сети"""
+        path = str(tmp_path / "cassette.sqlite3")
+        session = FakeSession()
+        http = RequestManager(
+            session, sleep_time=0.01, record_mode="record", cassette=path
+        )
+        assert (
+            await http.get("https://example.com/1", "read") == b"https://example.com/1"
+        )
+        assert (
+            await http.get("https://example.com/2", "text") == "https://example.com/2"
+        )
+        assert len(http.cassette) == 2
+        await http.close()
+
+        offline = FakeSession(handler=lambda url, kw: pytest.fail("запрос в сеть"))
+        http = RequestManager(
+            offline,
+            sleep_time=0.01,
+            record_mode="replay",
+            cassette=path,
+            replay_latency=0.01,
+        )
+        assert (
+            await http.get("https://example.com/1", "read") == b"https://example.com/1"
+        )
+        assert (
+            await http.get("https://example.com/2", "text") == "https://example.com/2"
+        )
+        assert await http.get("https://example.com/3", "read") is None
+        assert (http.cassette.hits, http.cassette.misses) == (2, 1)
+        assert offline.calls == []
+        await http.close()
+
+
+class TestConnectionPool:
+    @pytest_asyncio.fixture
+    async def server(self):
+        async def page(request):
+            return web.Response(text="page")
+
+        app = web.Application()
+        app.router.add_get("/{page}", page)
+        async with TestServer(app) as server:
+            yield server
+
+    @pytest.mark.asyncio
+    async def test_reuse(self, server):
+        """Соединение переиспользуется, а не открывается заново"""
+        http = RequestManager.create(
+            sleep_time=0.01, use_random=False, connector={"limit": 10}
+        )
+        try:
+            for page in range(3):
+                assert await http.get(str(server.make_url(f"/{page}")), "text")
+
+            stats = http.pool_stats[0]
+            assert (stats["created"], stats["reused"]) == (1, 2)
+            assert stats["idle"] == 1 and stats["acquiring"] == 0
+        finally:
+            await http.close()
+
+    def test_unreadable_connector(self):
+        """Если у коннектора нет внутренних полей, статистика нулевая и об этом пишется в лог один раз"""
+        messages = []
+        sink = logger.add(messages.append, level="WARNING")
+        try:
+            pool = ConnectionPool("default")
+            pool._connector = SimpleNamespace()
+            for _ in range(2):
+                stats = pool.stats
+                assert (stats["open"], stats["idle"], stats["acquiring"]) == (0, 0, 0)
+        finally:
+            logger.remove(sink)
+
+        assert len(messages) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_spider(self):
+        """Каждый паук получает свой пул, лимиты хостов остаются общими"""
+        http = RequestManager.create(connector={"per_spider": True})
+        try:
+            spider = http.for_spider("Spider")
+            assert spider.session is not http.session
+            assert spider.hosts is http.hosts
+            assert spider.root is http
+            assert [x["name"] for x in http.pool_stats] == ["default", "Spider"]
+        finally:
+            await http.close()
+
+    @pytest.mark.asyncio
+    async def test_shared(self):
+        http = RequestManager.create()
+        try:
+            assert http.for_spider("Spider") is http
+        finally:
+            await http.close()
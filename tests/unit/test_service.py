@@ -87,7 +87,9 @@ class TestService:
             1,  # Page
         )
 
-        assert len(mangas.response) == 6
+        # Без учёта регистра и в кириллице, "Секс с ..." совпадает с началом запроса
+        assert len(mangas.response) == 7
+        assert mangas.response[0].title.startswith("Секс")
         assert mangas.page == 1
 
     @pytest.mark.asyncio
@@ -120,6 +122,54 @@ class TestService:
         assert len(mangas.response) == 30
         assert mangas.page == 4
 
+    @pytest.mark.asyncio
+    async def test_cursor(self, service):
+        """Страницы по курсору совпадают со страницами по номеру"""
+        for method, args in [
+            (service.get_pages, ()),
+            (service.get_pages_by_genre, (1,)),
+            (service.get_pages_by_language, (1,)),
+        ]:
+            first = await method(*args, 1, 30)
+            pages = [first.response]
+            cursor = first.next_cursor
+            while cursor is not None:
+                result = await method(*args, per_page=30, cursor=cursor)
+                pages.append(result.response)
+                cursor = result.next_cursor
+
+            assert len(pages) == first.page
+            for number, response in enumerate(pages, 1):
+                by_page = await method(*args, number, 30)
+                assert [x.id for x in response] == [x.id for x in by_page.response]
+
+        with pytest.raises(ValueError, match="Неверный курсор"):
+            await service.get_pages(cursor="не курсор")
+
+    @pytest.mark.asyncio
+    async def test_search(self, service):
+        """Поиск в памяти и в базе данных дают одни и те же страницы"""
+        found = await service.get_pages_by_query("motto HAMETARA", 1, 30)
+        assert len(found.response) > 2
+        assert all("Hametara Motto" in x.title for x in found.response)
+
+        pages = []
+        for native in (False, True):
+            service.manager.search._native = native
+            result = await service.get_pages_by_query("hametara", per_page=2)
+            total = result.total
+            response = list(result.response)
+            while result.next_cursor is not None:
+                result = await service.get_pages_by_query(
+                    "hametara", per_page=2, cursor=result.next_cursor
+                )
+                response.extend(result.response)
+
+            assert len(response) == total
+            pages.append([x.id for x in response])
+
+        assert pages[0] == pages[1]
+
     @pytest.mark.asyncio
     async def test_check_error(self, service):
         with pytest.raises(ValueError):
@@ -0,0 +1,53 @@
+"""Воркер очереди задач: загружает мангу, которую нашли пауки основного процесса.
+
+Запуск: python worker.py. Воркеров можно запустить сколько угодно, например
+`docker compose --profile queue up -d --scale worker=4`. Настройки в разделе queue файла config.yaml.
+"""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from loguru import logger
+
+from src.core import config
+from src.core.entities.schemas import ProxySchema
+from src.core.executor import ParseExecutor
+from src.core.manager import MangaManager, RequestManager, JobManager
+from src.core.manager.spider import load_spiders
+from src.core.worker import CrawlWorker
+
+
+async def main():
+    engine = create_async_engine(config.database.db)
+
+    manager = MangaManager(engine)
+    await manager.tags.load()
+    jobs = JobManager(engine)
+    executor = ParseExecutor(config.parsing.executor, log_level=config.logging.level)
+
+    proxy = [ProxySchema.create(x) for x in config.parsing.proxy]
+    http = RequestManager.create(proxy=proxy, **config.request.model_dump())
+    spiders = load_spiders(
+        http,
+        manager=manager,
+        features=config.parsing.features,
+        executor=executor,
+        backend=config.parsing.backend,
+    )
+    worker = CrawlWorker(jobs, manager, spiders, config.queue)
+
+    try:
+        await worker.run()
+
+    finally:
+        await http.close()
+        executor.shutdown()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+
+    except KeyboardInterrupt:
+        logger.info("Воркер остановлен пользователем.")